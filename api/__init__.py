@@ -1,8 +1,18 @@
 
 # Pacote de integrações com APIs externas.
 
+from utils.lazy_exports import lazy_exports
 
-from .gemini_client import GeminiClient, GeminiCache
+# Classes exportadas e o módulo de cada uma; carregadas no primeiro acesso
+_EXPORTS = {
+    'GeminiClient': '.gemini_client',
+    'GeminiCache': '.gemini_client',
+    'CacheBackend': '.cache_backends',
+    'SQLiteCacheBackend': '.cache_backends',
+    'AppendLogCacheBackend': '.cache_backends',
+}
 
 # Exportando as classes.
-__all__ = ['GeminiClient', 'GeminiCache']
\ No newline at end of file
+__all__ = ['GeminiClient', 'GeminiCache', 'CacheBackend', 'SQLiteCacheBackend', 'AppendLogCacheBackend']
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
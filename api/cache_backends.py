@@ -0,0 +1,304 @@
+# Backends de armazenamento persistente para o cache do Gemini.
+
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from .cache_keys import make_key, normalize_title
+
+
+# Interface comum dos backends de cache
+class CacheBackend(ABC):
+
+    # Obtém um valor pela chave (None se não existir)
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    # Grava um valor; title alimenta o índice secundário por título
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], title: str = None):
+        ...
+
+    # Procura uma entrada de qualquer plataforma pelo título normalizado completo
+    @abstractmethod
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    # Remove uma chave
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    # Remove todas as chaves
+    @abstractmethod
+    def clear(self):
+        ...
+
+    # Quantidade de entradas armazenadas
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    # Libera os recursos abertos
+    def close(self):
+        pass
+
+
+# Backend SQLite: escrita O(1) por entrada, transação atômica e leitura sob demanda
+class SQLiteCacheBackend(CacheBackend):
+
+    def __init__(self, path: str, legacy_json: str = None):
+        self.path = path
+        self.legacy_json = legacy_json
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # Abre o banco no primeiro uso
+    def _connection(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+            is_new = not os.path.exists(self.path)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " chave TEXT PRIMARY KEY,"
+                " valor TEXT NOT NULL,"
+                " titulo TEXT)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+            if "titulo" not in columns:
+                conn.execute("ALTER TABLE cache ADD COLUMN titulo TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_titulo ON cache (titulo)")
+            # Índice por título sem subtítulo de versões anteriores (a coluna base não é mais usada)
+            conn.execute("DROP INDEX IF EXISTS ix_cache_base")
+            self._conn = conn
+
+            if is_new and self.legacy_json:
+                self._import_legacy_json(self.legacy_json)
+
+        return self._conn
+
+    # Importa o antigo gemini_cache.json (um único dicionário) em uma transação
+    # As chaves antigas ("nome_plataforma") são recalculadas com a normalização atual
+    def _import_legacy_json(self, path: str):
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return
+
+        if not isinstance(data, dict):
+            return
+
+        rows = []
+        for old_key, value in data.items():
+            if not isinstance(value, dict):
+                continue
+            name, _, platform = old_key.rpartition("_")
+            name = value.get("consulta") or name
+            platform = None if platform == "any" else platform
+            rows.append((make_key(name, platform), json.dumps(value, ensure_ascii=False), normalize_title(name)))
+
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO cache (chave, valor, titulo) VALUES (?, ?, ?)", rows)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT valor FROM cache WHERE chave = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Dict[str, Any], title: str = None):
+
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (chave, valor, titulo) VALUES (?, ?, ?)", (key, payload, title)
+            )
+
+    # Entrada mais recente com o título
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT valor FROM cache WHERE titulo = ? ORDER BY rowid DESC LIMIT 1", (title,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, key: str):
+
+        with self._lock:
+            self._connection().execute("DELETE FROM cache WHERE chave = ?", (key,))
+
+    def clear(self):
+
+        with self._lock:
+            self._connection().execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self):
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Backend de log append-only (JSON Lines) com compactação periódica
+class AppendLogCacheBackend(CacheBackend):
+
+    def __init__(self, path: str, compact_ratio: float = 2.0, compact_min_lines: int = 1000, fsync: bool = False):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.compact_min_lines = compact_min_lines
+        self.fsync = fsync
+        self._data = None
+        self._titles = {}
+        self._lines = 0
+        self._file = None
+        self._torn_tail = False
+        self._lock = threading.Lock()
+
+    # Reconstrói o estado relendo o log no primeiro uso
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+
+        if self._data is None:
+            data, lines = {}, 0
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._torn_tail = not line.endswith("\n")
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Linha incompleta de uma escrita interrompida
+                            continue
+                        lines += 1
+                        if record.get("d"):
+                            data.pop(record["k"], None)
+                        else:
+                            data[record["k"]] = record["v"]
+                            self._index(record["k"], record.get("t"))
+            except IOError:
+                pass
+            self._data, self._lines = data, lines
+        return self._data
+
+    # Atualiza o índice secundário título -> chave
+    def _index(self, key: str, title: Optional[str]):
+
+        if title:
+            self._titles[title] = key
+
+    # Acrescenta um registro ao final do log
+    def _append(self, record: Dict[str, Any]):
+
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self._torn_tail:
+                # Isola o registro incompleto deixado por uma escrita interrompida
+                self._file.write("\n")
+                self._torn_tail = False
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._lines += 1
+
+        if self._lines >= self.compact_min_lines and self._lines > self.compact_ratio * max(1, len(self._data)):
+            self._compact()
+
+    # Reescreve o log apenas com as entradas vivas (troca atômica do arquivo)
+    def _compact(self):
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            titles = {key: title for title, key in self._titles.items()}
+            for key, value in self._data.items():
+                record = {"k": key, "v": value, "t": titles.get(key)}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._data)
+        self._torn_tail = False
+
+    def compact(self):
+
+        with self._lock:
+            self._load()
+            self._compact()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key: str, value: Dict[str, Any], title: str = None):
+
+        with self._lock:
+            self._load()[key] = value
+            self._index(key, title)
+            self._append({"k": key, "v": value, "t": title})
+
+    # Entrada mais recente com o título (ignora chaves já removidas)
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            data = self._load()
+            key = self._titles.get(title)
+            return data.get(key) if key else None
+
+    def delete(self, key: str):
+
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._append({"k": key, "d": True})
+
+    def clear(self):
+
+        with self._lock:
+            self._data = {}
+            self._titles = {}
+            self._compact()
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return len(self._load())
+
+    def close(self):
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# Escolhe o backend pela extensão do arquivo (.jsonl = log append-only, demais = SQLite)
+def create_backend(path: str) -> CacheBackend:
+
+    if os.path.splitext(path)[1].lower() in (".jsonl", ".log"):
+        return AppendLogCacheBackend(path)
+
+    legacy_json = os.path.join(os.path.dirname(path), "gemini_cache.json")
+    return SQLiteCacheBackend(path, legacy_json=legacy_json)
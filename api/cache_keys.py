@@ -0,0 +1,31 @@
+# Normalização de títulos e plataformas para as chaves do cache do Gemini.
+
+
+import re
+import unicodedata
+from typing import Optional
+
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# Remove acentos, caixa, pontuação e espaços extras ("Pokémon: Red " -> "pokemon red")
+def normalize_title(name: str) -> str:
+
+    folded = unicodedata.normalize("NFKD", name or "")
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).casefold()
+    folded = folded.replace("&", " and ")
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+# Plataforma normalizada ("any" quando não informada)
+def normalize_platform(platform: Optional[str]) -> str:
+
+    normalized = normalize_title(platform) if platform else ""
+    return normalized or "any"
+
+
+# Chave canônica de cache de um jogo
+def make_key(game_name: str, platform: Optional[str] = None) -> str:
+
+    return f"{normalize_title(game_name)}_{normalize_platform(platform)}"
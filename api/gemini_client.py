@@ -3,38 +3,264 @@
 
 
 import os
+import gzip
 import json
-import requests
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterable, List, Optional, Tuple, Union
+
+from .cache_backends import CacheBackend, create_backend
+from .cache_keys import make_key, normalize_title
+from .memory_cache import LRUCache
+from .resilience import CircuitBreaker, CircuitOpenError, HealthCheck, RetryPolicy, TokenBucket, parse_retry_after
+from .singleflight import SingleFlight
+from .stream_parser import IncrementalJSONObjectParser
+
+# requests e dotenv são importados no primeiro uso para não pesar na inicialização do programa
+if TYPE_CHECKING:
+    import requests
+
+# Fonte registrada nas respostas padrão (API indisponível ou resposta inválida)
+FONTE_INDISPONIVEL = "Sistema (API indisponível)"
+
+# Limite de tokens de saída reservado por jogo em uma consulta em lote
+BATCH_TOKENS_PER_GAME = 700
+
+# Esquema da resposta estruturada de um jogo (responseSchema); a ordem das propriedades
+# é a ordem de geração, a mesma de exibição, para o streaming mostrar os campos na sequência
+GAME_INFO_PROPERTIES = {
+    "nome": {"type": "STRING"},
+    "desenvolvedor": {"type": "STRING"},
+    "publicador": {"type": "STRING"},
+    "ano_lancamento": {"type": "INTEGER", "nullable": True},
+    "genero": {"type": "STRING"},
+    "metacritic_score": {"type": "INTEGER", "nullable": True},
+    "tempo_medio_conclusao": {"type": "NUMBER", "nullable": True},
+    "plataformas": {"type": "ARRAY", "items": {"type": "STRING"}},
+    "descricao": {"type": "STRING"},
+    "curiosidade": {"type": "STRING"},
+}
+
+GAME_INFO_SCHEMA = {
+    "type": "OBJECT",
+    "properties": GAME_INFO_PROPERTIES,
+    "required": list(GAME_INFO_PROPERTIES),
+    "propertyOrdering": list(GAME_INFO_PROPERTIES),
+}
+
+BATCH_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"indice": {"type": "INTEGER"}, **GAME_INFO_PROPERTIES},
+        "required": ["indice", *GAME_INFO_PROPERTIES],
+        "propertyOrdering": ["indice", *GAME_INFO_PROPERTIES],
+    },
+}
+
+# Callback de campo recebido durante o streaming: (chave, valor)
+FieldCallback = Callable[[str, Any], None]
+
+# Callback de progresso: (concluídos, total, nome do jogo, informações, veio do cache)
+ProgressCallback = Callable[[int, int, str, Dict[str, Any], bool], None]
 
 # Cliente para consumir a API do Google Gemini AI
 class GeminiClient:
      
     # Inicializa o cliente Gemini
-    def __init__(self, api_key: str = None):
+    # A sessão HTTP é criada no primeiro uso e mantém as conexões abertas (keep-alive)
+    def __init__(self, api_key: str = None, base_url: str = None, compress_requests: bool = None):
     
+        from dotenv import load_dotenv
         load_dotenv()
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+        self.base_url = base_url or "https://generativelanguage.googleapis.com/v1beta/models"
         self.model = "gemini-2.5-flash" 
+        self.max_workers = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+        self.batch_size = int(os.getenv("GEMINI_BATCH_SIZE", "8"))
+        self.timeout = float(os.getenv("GEMINI_TIMEOUT", "30"))
+        # Conexões mantidas pela sessão: as threads de get_games_info_many mais as requisições
+        # simultâneas do servidor HTTP (WEB_WORKERS), que usam o mesmo cliente
+        self.pool_maxsize = int(os.getenv(
+            "GEMINI_POOL_MAXSIZE", str(self.max_workers + int(os.getenv("WEB_WORKERS", "16")))
+        ))
+        
+        if compress_requests is None:
+            compress_requests = os.getenv("GEMINI_GZIP", "false").lower() in ("1", "true", "sim")
+        self.compress_requests = compress_requests
+        
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._flight = SingleFlight()
+        
+        # Vazão limitada à cota da API (requisições por minuto)
+        self.connect_timeout = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+        self.rate_limiter = TokenBucket(
+            rate=float(os.getenv("GEMINI_RPM", "60")) / 60,
+            capacity=max(1, self.max_workers),
+        )
+        self.retry_policy = RetryPolicy(max_attempts=int(os.getenv("GEMINI_MAX_RETRIES", "3")))
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "30")),
+        )
+        # Saúde da API: verificada em segundo plano e atualizada pelas próprias consultas
+        self.health = HealthCheck(self.test_connection, ttl=float(os.getenv("GEMINI_HEALTH_TTL", "300")))
+        self.metrics = {
+            "requests": 0, "throttled": 0, "retried": 0, "short_circuited": 0, "failures": 0, "batch_fallbacks": 0,
+        }
+        self._metrics_lock = threading.Lock()
         
         if not self.api_key:
             raise ValueError(" Chave da API Gemini não encontrada. Configure GEMINI_API_KEY no .env")
     
+    # Retorna a sessão HTTP persistente, com pool de pool_maxsize conexões
+    def _get_session(self) -> "requests.Session":
+        
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.pool_maxsize))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Content-Type": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "Connection": "keep-alive",
+                })
+                self._session = session
+            return self._session
+    
+    # Fecha a sessão HTTP e as conexões mantidas abertas
+    def close(self):
+        
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     # Obtém informações sobre um jogo específico
+    # Chamadas simultâneas para o mesmo jogo (mesma chave normalizada) compartilham uma única requisição
     def get_game_info(self, game_name: str, platform: str = None) -> Dict[str, Any]:
         
+        return self._flight.do(make_key(game_name, platform), self._fetch_game_info, game_name, platform)
+    
+    # Consulta a API para um jogo
+    def _fetch_game_info(self, game_name: str, platform: str = None) -> Dict[str, Any]:
+        
         prompt = self._create_game_prompt(game_name, platform)
         
         try:
             response = self._make_request(prompt)
             return self._parse_response(response, game_name)
             
+        except CircuitOpenError:
+            return self._get_default_response(game_name)
         except Exception as e:
             print(f" Erro ao consultar Gemini API: {e}")
             return self._get_default_response(game_name)
     
+    # Obtém informações de vários jogos, resolvendo o cache primeiro e paralelizando as consultas restantes
+    def get_games_info_many(
+        self,
+        games: Iterable[Union[str, Tuple[str, Optional[str]]]],
+        cache: "GeminiCache" = None,
+        max_workers: int = None,
+        progress: ProgressCallback = None,
+        batch_size: int = None,
+    ) -> List[Dict[str, Any]]:
+        
+        queries = [(game, None) if isinstance(game, str) else tuple(game) for game in games]
+        total = len(queries)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        done = 0
+        
+        # Acertos de cache primeiro; faltas com a mesma chave viram uma única consulta
+        pending: Dict[str, List[int]] = {}
+        for index, (game_name, platform) in enumerate(queries):
+            cached_info = cache.get(game_name, platform) if cache else None
+            if cached_info:
+                results[index] = cached_info
+                done += 1
+                if progress:
+                    progress(done, total, game_name, cached_info, True)
+            else:
+                pending.setdefault(make_key(game_name, platform), []).append(index)
+        
+        if not pending:
+            return results
+        
+        # Até batch_size jogos por requisição (um prompt com vários títulos)
+        batch_size = max(1, batch_size or self.batch_size)
+        groups = list(pending.values())
+        chunks = [groups[i:i + batch_size] for i in range(0, len(groups), batch_size)]
+        
+        workers = max(1, min(max_workers or self.max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini") as executor:
+            futures = {
+                executor.submit(self._fetch_batch, [queries[indexes[0]] for indexes in chunk]): chunk
+                for chunk in chunks
+            }
+            
+            # O cache é atualizado apenas nesta thread
+            for future in as_completed(futures):
+                for indexes, game_info in zip(futures[future], future.result()):
+                    game_name, platform = queries[indexes[0]]
+                    
+                    if cache:
+                        cache.set(game_name, platform, game_info)
+                    
+                    for index in indexes:
+                        results[index] = game_info
+                        done += 1
+                        if progress:
+                            progress(done, total, queries[index][0], game_info, False)
+        
+        return results
+    
+    # Consulta um lote de jogos; jogos já em consulta (mesma chave normalizada) esperam a consulta em andamento
+    def _fetch_batch(self, batch: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        
+        keys = [make_key(game_name, platform) for game_name, platform in batch]
+        return self._flight.do_many(keys, lambda owned: self._request_batch([batch[i] for i in owned]))
+    
+    # Consulta vários jogos em uma única requisição; os ausentes na resposta são consultados individualmente
+    def _request_batch(self, batch: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        
+        if len(batch) == 1:
+            return [self._fetch_game_info(*batch[0])]
+        
+        try:
+            prompt = self._create_batch_prompt(batch)
+            response = self._make_request(
+                prompt, max_output_tokens=BATCH_TOKENS_PER_GAME * len(batch), schema=BATCH_SCHEMA
+            )
+            found = self._parse_batch_response(response, batch)
+        except CircuitOpenError:
+            found = {}
+        except Exception as e:
+            print(f" Erro ao consultar Gemini API em lote: {e}")
+            found = {}
+        
+        results = []
+        for index, (game_name, platform) in enumerate(batch):
+            game_info = found.get(index)
+            if game_info is None:
+                self._count("batch_fallbacks")
+                game_info = self._fetch_game_info(game_name, platform)
+            results.append(game_info)
+        return results
+    
     # Cria o prompt para a API
     def _create_game_prompt(self, game_name: str, platform: str = None) -> str:
        
@@ -50,13 +276,13 @@ class GeminiClient:
         - "publicador": publicador
         - "ano_lancamento": ano de lançamento (apenas ano)
         - "descricao": descrição breve (máximo 200 caracteres)
-        - "metacritic_score": pontuação no Metacritic (0-100) ou "N/A"
+        - "metacritic_score": pontuação no Metacritic (0-100)
         - "tempo_medio_conclusao": tempo médio para conclusão em horas
         - "plataformas": lista das plataformas disponíveis
         - "curiosidade": uma curiosidade interessante sobre o jogo
         
         IMPORTANTE:
-        1. Se não encontrar informações suficientes, use "N/A" para campos desconhecidos
+        1. Se não encontrar informações suficientes, use "N/A" para textos e null para números desconhecidos
         2. Mantenha o texto em português do Brasil
         3. Formate "tempo_medio_conclusao" como número (ex: 25.5)
         4. Para "plataformas", retorne uma lista de strings
@@ -78,14 +304,74 @@ class GeminiClient:
         
         return prompt
     
+    # Cria o prompt de vários jogos, com o bloco de instruções uma única vez
+    def _create_batch_prompt(self, games: List[Tuple[str, Optional[str]]]) -> str:
+        
+        lista = "\n".join(
+            f'        {i}. "{game_name}"' + (f" (plataforma {platform})" if platform else "")
+            for i, (game_name, platform) in enumerate(games)
+        )
+        
+        prompt = f"""
+        Por favor, forneça informações sobre cada um dos jogos abaixo:
+{lista}
+        
+        Responda APENAS com um array JSON válido, com um objeto por jogo, contendo as seguintes chaves:
+        - "indice": o número do jogo na lista acima
+        - "nome": nome do jogo
+        - "genero": gênero principal
+        - "desenvolvedor": desenvolvedor principal
+        - "publicador": publicador
+        - "ano_lancamento": ano de lançamento (apenas ano)
+        - "descricao": descrição breve (máximo 200 caracteres)
+        - "metacritic_score": pontuação no Metacritic (0-100)
+        - "tempo_medio_conclusao": tempo médio para conclusão em horas
+        - "plataformas": lista das plataformas disponíveis
+        - "curiosidade": uma curiosidade interessante sobre o jogo
+        
+        IMPORTANTE:
+        1. Se não encontrar informações suficientes, use "N/A" para textos e null para números desconhecidos
+        2. Mantenha o texto em português do Brasil
+        3. Formate "tempo_medio_conclusao" como número (ex: 25.5)
+        4. Para "plataformas", retorne uma lista de strings
+        5. Mantenha a ordem da lista e não omita nenhum jogo
+        """
+        
+        return prompt
+    
+    # Associa cada elemento do array de resposta ao jogo consultado (pelo índice ou pelo título)
+    def _parse_batch_response(self, api_response: Dict[str, Any], games: List[Tuple[str, Optional[str]]]) -> Dict[int, Dict[str, Any]]:
+        
+        items = extract_json(self._response_text(api_response), list)
+        titles = {normalize_title(game_name): i for i, (game_name, _) in enumerate(games)}
+        
+        found: Dict[int, Dict[str, Any]] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            
+            index = item.pop("indice", None)
+            if not isinstance(index, int) or not 0 <= index < len(games) or index in found:
+                index = titles.get(normalize_title(str(item.get("nome", ""))))
+            if index is None or index in found:
+                continue
+            
+            found[index] = self._finalize(item, games[index][0])
+        
+        return found
+    
     # Faz a requisição para a API
-    def _make_request(self, prompt: str) -> Dict[str, Any]:
+    # Com um esquema, a resposta vem como JSON estruturado (responseMimeType application/json)
+    def _make_request(self, prompt: str, max_output_tokens: int = 1024,
+                      schema: Optional[Dict[str, Any]] = GAME_INFO_SCHEMA) -> Dict[str, Any]:
        
         url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
+        body, headers = self._build_request(prompt, max_output_tokens, schema)
+        return self._post_with_retries(url, body, headers).json()
+    
+    # Monta o corpo (opcionalmente comprimido) e os cabeçalhos da requisição
+    def _build_request(self, prompt: str, max_output_tokens: int,
+                       schema: Optional[Dict[str, Any]]) -> Tuple[bytes, Dict[str, str]]:
         
         payload = {
             "contents": [{
@@ -97,43 +383,172 @@ class GeminiClient:
                 "temperature": 0.7,
                 "topK": 1,
                 "topP": 0.8,
-                "maxOutputTokens": 1024,
+                "maxOutputTokens": max_output_tokens,
+                # No gemini-2.5-flash os tokens de raciocínio contam no maxOutputTokens e cortariam o JSON
+                "thinkingConfig": {"thinkingBudget": 0},
             }
         }
+        if schema is not None:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = schema
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {}
+        if self.compress_requests:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
         
-        return response.json()
+        return body, headers
     
-    # Processa a resposta da API
-    def _parse_response(self, api_response: Dict[str, Any], game_name: str) -> Dict[str, Any]:
+    # Envia a requisição respeitando o rate limit, com novas tentativas e circuit breaker
+    # Com stream=True as novas tentativas só acontecem antes de o corpo começar a ser lido
+    def _post_with_retries(self, url: str, body: bytes, headers: Dict[str, str],
+                           stream: bool = False) -> "requests.Response":
         
+        import requests
+        
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError("Gemini API temporariamente indisponível (circuit breaker aberto)")
+        
+        # Qualquer exceção sem resultado registrado (ex.: ChunkedEncodingError) conta como falha,
+        # para o circuito não ficar meio-aberto indefinidamente
+        registrado = False
         try:
-            # Extrai o texto da resposta
-            text_response = api_response["candidates"][0]["content"]["parts"][0]["text"]
-            
-            # Tenta encontrar JSON na resposta
-            start_idx = text_response.find('{')
-            end_idx = text_response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != 0:
-                json_str = text_response[start_idx:end_idx]
-                game_info = json.loads(json_str)
+            for attempt in range(1, self.retry_policy.max_attempts + 1):
+                if self.rate_limiter.acquire() > 0:
+                    self._count("throttled")
+                self._count("requests")
                 
-                # Adiciona informações de fonte
-                game_info["fonte"] = "Google Gemini AI"
-                game_info["consulta"] = game_name
+                retry_after = None
+                try:
+                    response = self._get_session().post(
+                        url, data=body, headers=headers, timeout=(self.connect_timeout, self.timeout), stream=stream
+                    )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                else:
+                    if response.status_code not in RetryPolicy.RETRYABLE_STATUS:
+                        # Erros 4xx (exceto 429) não abrem o circuito; chave recusada (401/403) torna a API
+                        # indisponível para este cliente e os demais 4xx não mudam a saúde
+                        registrado = True
+                        self.breaker.record_success()
+                        if response.status_code in (401, 403):
+                            self.health.record(False)
+                        elif response.status_code < 400:
+                            self.health.record(True)
+                        response.raise_for_status()
+                        return response
+                    error = requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    response.close()
                 
-                return game_info
-            else:
-                raise ValueError("Resposta não contém JSON válido")
+                if attempt == self.retry_policy.max_attempts:
+                    raise error
                 
-        except (KeyError, json.JSONDecodeError, ValueError) as e:
+                self._count("retried")
+                time.sleep(self.retry_policy.delay(attempt, retry_after))
+        finally:
+            if not registrado:
+                self._count("failures")
+                self.breaker.record_failure()
+                self.health.record(False)
+    
+    # Incrementa um contador de métricas
+    def _count(self, name: str):
+        
+        with self._metrics_lock:
+            self.metrics[name] += 1
+    
+    # Retorna uma cópia das métricas de requisições (throttled, retried, short_circuited...)
+    def get_metrics(self) -> Dict[str, Any]:
+        
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["circuit"] = self.breaker.state
+        return metrics
+    
+    # Processa a resposta da API
+    def _parse_response(self, api_response: Dict[str, Any], game_name: str) -> Dict[str, Any]:
+        
+        text_response = ""
+        try:
+            text_response = self._response_text(api_response)
+            return self._finalize(extract_json(text_response, dict), game_name)
+                
+        except (KeyError, IndexError, TypeError, ValueError) as e:
             print(f"  Erro ao processar resposta da API: {e}")
             print(f" Resposta recebida: {text_response[:200]}...")
             return self._get_default_response(game_name)
     
+    # Texto gerado pelo modelo (concatena as partes da primeira candidata)
+    @staticmethod
+    def _response_text(api_response: Dict[str, Any]) -> str:
+        
+        parts = api_response["candidates"][0]["content"]["parts"]
+        return "".join(part.get("text", "") for part in parts)
+    
+    # Completa as informações de um jogo: null vira "N/A" e são adicionadas a fonte e a consulta
+    @staticmethod
+    def _finalize(game_info: Dict[str, Any], game_name: str) -> Dict[str, Any]:
+        
+        for key, value in game_info.items():
+            game_info[key] = normalize_field(value)
+        game_info["fonte"] = "Google Gemini AI"
+        game_info["consulta"] = game_name
+        return game_info
+    
+    # Consulta a API pelo endpoint de streaming (streamGenerateContent) e chama on_field
+    # para cada campo assim que o valor dele estiver completo.
+    # Com uma consulta do mesmo jogo em andamento, apenas espera a resposta completa (sem on_field).
+    def stream_game_info(self, game_name: str, platform: str = None,
+                         on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
+        
+        return self._flight.do(make_key(game_name, platform), self._stream_game_info, game_name, platform, on_field)
+    
+    # Consulta em streaming de um jogo
+    def _stream_game_info(self, game_name: str, platform: str = None,
+                          on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
+        
+        url = f"{self.base_url}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        body, headers = self._build_request(self._create_game_prompt(game_name, platform), 1024, GAME_INFO_SCHEMA)
+        parser = IncrementalJSONObjectParser()
+        
+        try:
+            response = self._post_with_retries(url, body, headers, stream=True)
+            try:
+                for text in self._iter_stream_text(response):
+                    for key, value in parser.feed(text):
+                        if on_field:
+                            on_field(key, normalize_field(value))
+            finally:
+                response.close()
+            
+            # Resposta cortada ou com valor inválido não vira uma entrada positiva no cache
+            if not parser.done or any(key not in parser.result for key in GAME_INFO_SCHEMA["required"]):
+                raise ValueError("Resposta em streaming incompleta")
+            return self._finalize(parser.result, game_name)
+            
+        except CircuitOpenError:
+            return self._get_default_response(game_name)
+        except Exception as e:
+            print(f" Erro ao consultar Gemini API: {e}")
+            return self._get_default_response(game_name)
+    
+    # Extrai os pedaços de texto dos eventos SSE ("data: {...}") da resposta em streaming
+    def _iter_stream_text(self, response: "requests.Response") -> Iterable[str]:
+        
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            event = json.loads(line[len("data:"):])
+            try:
+                yield self._response_text(event)
+            except (KeyError, IndexError):
+                # Eventos sem texto (ex.: só metadados de uso)
+                continue
+    
     # Retorna uma resposta padrão em caso de erro
     def _get_default_response(self, game_name: str) -> Dict[str, Any]:
      
@@ -148,63 +563,175 @@ class GeminiClient:
             "tempo_medio_conclusao": "N/A",
             "plataformas": ["N/A"],
             "curiosidade": "N/A",
-            "fonte": "Sistema (API indisponível)",
+            "fonte": FONTE_INDISPONIVEL,
             "consulta": game_name
         }
     
     # Testa a conexão com a API
+    # Consulta apenas os metadados do modelo (sem gerar conteúdo nem consumir cota de geração)
     def test_connection(self) -> bool:
       
         try:
-            test_prompt = "Responda apenas com a palavra 'OK'"
-            response = self._make_request(test_prompt)
-            return "OK" in response.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
+            response = self._get_session().get(
+                f"{self.base_url}/{self.model}?key={self.api_key}",
+                timeout=(self.connect_timeout, self.connect_timeout),
+            )
+            return response.status_code == 200
         except Exception:
             return False
+    
+    # Inicia a verificação de disponibilidade em segundo plano (não bloqueia)
+    def check_health_async(self) -> bool:
+        
+        return self.health.refresh_async()
+    
+    # Disponibilidade conhecida da API: True, False ou None (ainda não verificada ou expirada)
+    def is_available(self) -> Optional[bool]:
+        
+        return self.health.status
+
+# Converte null (campo desconhecido na resposta estruturada) em "N/A"
+def normalize_field(value: Any) -> Any:
+    
+    return "N/A" if value is None else value
+
+
+# Decodifica o JSON da resposta: com saída estruturada o texto é o próprio JSON;
+# em texto livre, procura o primeiro valor do tipo esperado que decodifique por inteiro
+def extract_json(text: str, expected: type) -> Any:
+    
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(value, expected):
+            return value
+    
+    decoder = json.JSONDecoder()
+    opening = "{" if expected is dict else "["
+    start = text.find(opening)
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(value, expected):
+                return value
+        start = text.find(opening, start + 1)
+    
+    raise ValueError("Resposta não contém JSON válido")
+
 
 # Classe para gerenciamento do cache
 class GeminiCache:
     
     # Inicia o cache
-    def __init__(self, cache_file: str = "gemini_cache.json"):
+    # Camada 1: LRU em memória com TTL; camada 2: backend persistente aberto sob demanda.
+    # Respostas padrão (API indisponível) ficam só na memória, com TTL curto, para a API ser tentada de novo.
+    def __init__(
+        self,
+        cache_file: str = "gemini_cache.db",
+        backend: CacheBackend = None,
+        memory: LRUCache = None,
+        ttl: float = None,
+        negative_ttl: float = None,
+    ):
+        from dotenv import load_dotenv
+        load_dotenv()
         self.cache_file = cache_file
-        self.cache = self._load_cache()
+        self.backend = backend or create_backend(cache_file)
+        self.memory = memory or LRUCache(
+            max_entries=int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("GEMINI_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+        )
+        self.ttl = ttl if ttl is not None else float(os.getenv("GEMINI_CACHE_TTL", "3600"))
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv("GEMINI_CACHE_NEGATIVE_TTL", "300"))
+        self.backend_hits = 0
+        self.backend_misses = 0
     
-    # Carrega o cache
-    def _load_cache(self) -> Dict[str, Dict]:
-       
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-        return {}
+    # Indica se a informação é uma resposta padrão de falha
+    @staticmethod
+    def is_negative(game_info: Dict) -> bool:
+        
+        return game_info.get("fonte") == FONTE_INDISPONIVEL
     
-    # Salva o cache
-    def _save_cache(self):
+    # Monta a chave de cache de um jogo (título e plataforma normalizados)
+    @staticmethod
+    def make_key(game_name: str, platform: str = None) -> str:
         
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except IOError:
-            pass
+        return make_key(game_name, platform)
+    
+    # Busca no backend: chave exata, depois o mesmo título em qualquer plataforma.
+    # Títulos com e sem subtítulo são jogos diferentes ("God of War" x "God of War Ragnarök"): sem fallback.
+    def _lookup(self, cache_key: str, game_name: str, platform: str = None) -> Optional[Dict]:
+        
+        lookups = [lambda: self.backend.get(cache_key)]
+        if platform:
+            lookups.append(lambda: self.backend.get(make_key(game_name)))
+        lookups.append(lambda: self.backend.find_by_title(normalize_title(game_name)))
+        
+        for lookup in lookups:
+            game_info = lookup()
+            if game_info is not None and not self.is_negative(game_info):
+                return game_info
+        return None
     
     # Obtem informações do cache
     def get(self, game_name: str, platform: str = None) -> Optional[Dict]:
         
-        cache_key = f"{game_name.lower()}_{platform.lower() if platform else 'any'}"
-        return self.cache.get(cache_key)
+        cache_key = self.make_key(game_name, platform)
+        
+        game_info = self.memory.get(cache_key)
+        if game_info is not None:
+            return game_info
+        
+        try:
+            # Respostas padrão antigas no disco não impedem uma nova consulta à API
+            game_info = self._lookup(cache_key, game_name, platform)
+        except Exception as e:
+            print(f" Erro ao ler cache do Gemini: {e}")
+            return None
+        
+        if game_info is None:
+            self.backend_misses += 1
+            return None
+        
+        self.backend_hits += 1
+        self.memory.set(cache_key, game_info, self.ttl)
+        return game_info
     
     # Define infos no cache
     def set(self, game_name: str, platform: str, game_info: Dict):
         
-        cache_key = f"{game_name.lower()}_{platform.lower() if platform else 'any'}"
-        self.cache[cache_key] = game_info
-        self._save_cache()
+        cache_key = self.make_key(game_name, platform)
+        
+        if self.is_negative(game_info):
+            self.memory.set(cache_key, game_info, self.negative_ttl)
+            return
+        
+        self.memory.set(cache_key, game_info, self.ttl)
+        try:
+            self.backend.set(cache_key, game_info, normalize_title(game_name))
+        except Exception as e:
+            print(f" Erro ao gravar cache do Gemini: {e}")
    
     # Limpa o cache
     def clear(self):
        
-        self.cache = {}
-        self._save_cache()
\ No newline at end of file
+        self.memory.clear()
+        self.backend.clear()
+    
+    # Contadores de acertos, faltas e despejos das duas camadas
+    def stats(self) -> Dict[str, int]:
+        
+        stats = self.memory.stats()
+        stats["backend_hits"] = self.backend_hits
+        stats["backend_misses"] = self.backend_misses
+        return stats
+    
+    # Fecha o backend de armazenamento
+    def close(self):
+        
+        self.backend.close()
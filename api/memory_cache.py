@@ -0,0 +1,111 @@
+# Cache em memória limitado (LRU) com expiração por entrada (TTL).
+
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+# Cache LRU com limite de entradas, orçamento de bytes e TTL por entrada
+class LRUCache:
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 8 * 1024 * 1024, default_ttl: float = 3600.0):
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser maior que zero")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Tamanho aproximado de um valor serializado
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+
+        try:
+            return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        except (TypeError, ValueError):
+            return 1024
+
+    # Obtém um valor, renovando sua posição na fila LRU
+    def get(self, key: str) -> Optional[Any]:
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # Grava um valor com TTL próprio (None = TTL padrão, 0 = sem expiração) e despeja os menos usados
+    def set(self, key: str, value: Any, ttl: float = None):
+
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl and ttl > 0 else None
+        size = self._sizeof(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    # Remove uma chave
+    def delete(self, key: str):
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    # Remove todas as entradas
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Contadores de uso do cache
+    def stats(self) -> Dict[str, int]:
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
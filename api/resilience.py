@@ -0,0 +1,187 @@
+# Controle de vazão, novas tentativas e circuit breaker para chamadas à API.
+
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+
+# Erro lançado quando o circuit breaker está aberto e a chamada nem é tentada
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+# Token bucket: libera até `rate` requisições por segundo com rajadas de até `capacity`
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate deve ser maior que zero")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Espera até haver um token disponível; retorna quantos segundos esperou
+    def acquire(self) -> float:
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+# Circuit breaker: após `failure_threshold` falhas seguidas, rejeita chamadas por `reset_timeout`
+# segundos; depois libera uma chamada de teste (meio-aberto) antes de fechar novamente.
+class CircuitBreaker:
+
+    CLOSED = "fechado"
+    OPEN = "aberto"
+    HALF_OPEN = "meio-aberto"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    # Indica se a chamada pode ser feita
+    def allow(self) -> bool:
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            # Aberto há reset_timeout, ou meio-aberto com a chamada de teste sem resultado há reset_timeout
+            # (ex.: exceção não registrada): libera uma nova chamada de teste
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Apenas uma chamada de teste passa enquanto o circuito está meio-aberto
+                self._state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+# Política de novas tentativas com backoff exponencial e jitter ("full jitter")
+class RetryPolicy:
+
+    RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    # Espera antes da próxima tentativa; Retry-After do servidor tem precedência
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+
+        if retry_after is not None:
+            return min(max(0.0, retry_after), self.max_delay * 4)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+# Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Estado de saúde de um serviço com validade (TTL), verificado em segundo plano.
+# status é None enquanto não houver verificação válida; a verificação nunca bloqueia quem consulta.
+class HealthCheck:
+
+    def __init__(self, probe: Callable[[], bool], ttl: float = 300.0):
+        self.probe = probe
+        self.ttl = ttl
+        self._healthy = None
+        self._checked_at = 0.0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # True/False conforme a última verificação ainda válida; None se desconhecido ou expirado
+    @property
+    def status(self) -> Optional[bool]:
+        with self._lock:
+            if self._healthy is None or time.monotonic() - self._checked_at > self.ttl:
+                return None
+            return self._healthy
+
+    # Registra o resultado de uma verificação (ou de uma chamada real ao serviço)
+    def record(self, healthy: bool):
+
+        with self._lock:
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+
+    # Inicia a verificação em uma thread daemon se o estado estiver expirado e nenhuma estiver em andamento;
+    # retorna se uma nova verificação foi iniciada
+    def refresh_async(self) -> bool:
+
+        with self._lock:
+            fresh = self._healthy is not None and time.monotonic() - self._checked_at <= self.ttl
+            if fresh or (self._thread is not None and self._thread.is_alive()):
+                return False
+            self._thread = threading.Thread(target=self._run, name="health-check", daemon=True)
+            self._thread.start()
+            return True
+
+    # Espera a verificação em andamento terminar
+    def wait(self, timeout: Optional[float] = None):
+
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+
+        try:
+            healthy = bool(self.probe())
+        except Exception:
+            healthy = False
+        self.record(healthy)
@@ -0,0 +1,105 @@
+# Deduplicação de chamadas simultâneas (single-flight).
+
+
+import threading
+from typing import Any, Callable, Dict, List
+
+
+# Chamada em andamento compartilhada pelos chamadores da mesma chave
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+# Garante que apenas uma execução por chave esteja em andamento;
+# chamadores concorrentes da mesma chave esperam e recebem o mesmo resultado.
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    # Executa fn(*args) uma única vez para chamadas simultâneas com a mesma chave
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    # Como do, para várias chaves de uma vez (ex.: um lote de jogos): fn recebe as posições das
+    # chaves sem execução em andamento e devolve um resultado para cada uma, na mesma ordem;
+    # as demais esperam as execuções já em andamento. Retorna um resultado por chave.
+    def do_many(self, keys: List[str], fn: Callable[[List[int]], List[Any]]) -> List[Any]:
+
+        calls: List[_Call] = []
+        owned: List[int] = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    self.shared += 1
+                else:
+                    call = self._calls[key] = _Call()
+                    self.executed += 1
+                    owned.append(index)
+                calls.append(call)
+
+        try:
+            if owned:
+                for index, result in zip(owned, fn(owned)):
+                    calls[index].result = result
+        except BaseException as e:
+            for index in owned:
+                calls[index].error = e
+            raise
+        finally:
+            with self._lock:
+                for index in owned:
+                    del self._calls[keys[index]]
+            for index in owned:
+                calls[index].done.set()
+
+        results = []
+        for call in calls:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results.append(call.result)
+        return results
+
+    # Quantidade de chaves com execução em andamento
+    def in_flight(self) -> int:
+
+        with self._lock:
+            return len(self._calls)
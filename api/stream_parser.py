@@ -0,0 +1,111 @@
+# Parser incremental de objetos JSON recebidos em partes (streaming).
+
+
+import json
+from typing import Any, Dict, List, Tuple
+
+
+_WHITESPACE = " \t\r\n"
+
+# Marcador de valor ainda incompleto (diferente de um null já decodificado)
+_INCOMPLETE = object()
+
+
+# Recebe pedaços de texto de um objeto JSON e devolve cada campo de primeiro nível
+# assim que o seu valor está completo, sem esperar o fechamento do objeto.
+class IncrementalJSONObjectParser:
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "inicio"
+        self._key = None
+        self.result: Dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        return self._state == "fim"
+
+    # Acrescenta um pedaço de texto e retorna os campos (chave, valor) concluídos nele
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+
+        self._buffer += chunk
+        fields = []
+
+        while not self.done:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                break
+
+            char = self._buffer[self._pos]
+
+            if self._state == "inicio":
+                # Ignora texto antes do objeto (ex.: cercas de código)
+                start = self._buffer.find("{", self._pos)
+                if start == -1:
+                    self._pos = len(self._buffer)
+                    break
+                self._pos = start + 1
+                self._state = "chave"
+
+            elif self._state == "chave":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "fim"
+                    continue
+                if char != '"':
+                    raise ValueError(f"Esperado nome de campo na posição {self._pos}")
+                key = self._decode()
+                if key is _INCOMPLETE:
+                    break
+                self._key = key
+                self._state = "dois_pontos"
+
+            elif self._state == "dois_pontos":
+                if char != ":":
+                    raise ValueError(f"Esperado ':' na posição {self._pos}")
+                self._pos += 1
+                self._state = "valor"
+
+            elif self._state == "valor":
+                value = self._decode(needs_delimiter=char not in '"{[')
+                if value is _INCOMPLETE:
+                    break
+                self.result[self._key] = value
+                fields.append((self._key, value))
+                self._state = "separador"
+
+            elif self._state == "separador":
+                self._pos += 1
+                if char == ",":
+                    self._state = "chave"
+                elif char == "}":
+                    self._state = "fim"
+                else:
+                    raise ValueError(f"Esperado ',' ou '}}' na posição {self._pos - 1}")
+
+        # Descarta o que já foi consumido
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        return fields
+
+    def _skip_whitespace(self):
+
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    # Decodifica um valor a partir da posição atual; _INCOMPLETE se ainda faltar texto.
+    # Números e literais só são aceitos quando seguidos de um delimitador ("12" pode virar "12.5").
+    def _decode(self, needs_delimiter: bool = False):
+
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return _INCOMPLETE
+
+        if needs_delimiter and self._buffer[end:].lstrip(_WHITESPACE)[:1] not in (",", "}", "]"):
+            return _INCOMPLETE
+
+        self._pos = end
+        return value
@@ -0,0 +1,123 @@
+"""
+Benchmark: latencia por requisicao do GeminiClient com e sem reutilizacao de conexao.
+
+Sobe um servidor HTTP local que imita o endpoint generateContent e compara:
+  - requests.post a cada chamada (nova conexao TCP por requisicao)
+  - GeminiClient com sessao persistente (keep-alive)
+
+Uso:
+    python benchmarks/bench_gemini_session.py [--requisicoes N] [--atraso-conexao MS]
+
+O atraso de conexao simula o custo do handshake TCP+TLS de um servidor remoto;
+ele e aplicado apenas na primeira requisicao de cada conexao.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.gemini_client import GeminiClient
+from api.resilience import TokenBucket
+
+
+RESPONSE = json.dumps({
+    "candidates": [{
+        "content": {"parts": [{"text": json.dumps({"nome": "Stub", "genero": "RPG"})}]}
+    }]
+}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Evita o atraso de Nagle + ACK atrasado entre cabecalho e corpo
+    disable_nagle_algorithm = True
+    connect_delay = 0.0
+
+    def setup(self):
+        super().setup()
+        # Simula o handshake de uma nova conexao
+        time.sleep(self.connect_delay)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(label, func, requests_count):
+    latencies = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"{label:<28} media {statistics.mean(latencies):7.2f} ms | "
+          f"p50 {percentile(latencies, 50):7.2f} ms | p99 {percentile(latencies, 99):7.2f} ms")
+    return statistics.mean(latencies)
+
+
+def make_client(base_url, **kwargs):
+    # Sem o limite de GEMINI_RPM: o benchmark mede a reutilizacao de conexao, nao o rate limiter
+    client = GeminiClient(api_key="benchmark", base_url=base_url, **kwargs)
+    client.rate_limiter = TokenBucket(rate=1e9, capacity=1e9)
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--atraso-conexao", type=float, default=20.0, metavar="MS")
+    args = parser.parse_args()
+
+    StubHandler.connect_delay = args.atraso_conexao / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models"
+
+    client = make_client(base_url)
+    prompt = client._create_game_prompt("The Witcher 3", "PC")
+    url = f"{base_url}/{client.model}:generateContent?key=benchmark"
+    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+
+    print(f"\n{args.requisicoes} requisicoes, atraso de conexao {args.atraso_conexao:.0f} ms\n")
+
+    sem_reuso = measure(
+        "Sem reutilizacao (post)",
+        lambda: requests.post(url, json=payload, timeout=30).json(),
+        args.requisicoes,
+    )
+    with client:
+        com_reuso = measure("Sessao persistente", lambda: client._make_request(prompt), args.requisicoes)
+
+    client_gzip = make_client(base_url, compress_requests=True)
+    with client_gzip:
+        measure("Sessao persistente + gzip", lambda: client_gzip._make_request(prompt), args.requisicoes)
+
+    print(f"\nGanho da reutilizacao: {sem_reuso / com_reuso:.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark: latencia das consultas mais frequentes com e sem os indices da migracao 2.
+
+Cria (ou reutiliza) um banco separado, popula com jogos gerados no proprio
+servidor e mede p50/p99 de:
+  - jogos por jogador (select_games_by_player e "Apenas nomes")
+  - pagina de jogos por chave (menus de consulta)
+
+Uso:
+    python benchmarks/bench_indexes.py [--jogos N] [--jogadores N] [--consultas N] [--plano]
+
+Usa DB_SERVER, DB_USER e DB_PASSWORD do .env; o banco de teste e
+BENCH_DB_NAME (padrao Biblioteca_jogos_bench) e nunca o banco da aplicacao.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import pyodbc
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.migrations import INDEXES, apply_migrations, create_index_sql
+from database.scripts import SQLScripts
+
+
+def connect(database):
+    connection_string = (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={os.getenv('DB_SERVER')};"
+        f"DATABASE={database};"
+        f"UID={os.getenv('DB_USER')};"
+        f"PWD={os.getenv('DB_PASSWORD')}"
+    )
+    return pyodbc.connect(connection_string, autocommit=database == "master")
+
+
+def prepare_database(name):
+    with connect("master") as conn:
+        conn.cursor().execute(f"IF DB_ID('{name}') IS NULL CREATE DATABASE {name}")
+
+    conn = connect(name)
+    apply_migrations(conn)
+    return conn
+
+
+def seed(conn, games, players):
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Jogos")
+    existing = cursor.fetchone()[0]
+    if existing >= games:
+        print(f"Usando {existing} jogos ja existentes")
+        return
+
+    print(f"Gerando {players} jogadores e {games} jogos no servidor...")
+    start = time.perf_counter()
+
+    cursor.execute("DELETE FROM Jogos")
+    cursor.execute("DELETE FROM Jogadores")
+    # Linhas geradas no servidor (sem trafegar 1M linhas pela rede)
+    numbers = """
+        WITH n AS (
+            SELECT TOP (?) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS i
+            FROM sys.all_objects a CROSS JOIN sys.all_objects b CROSS JOIN sys.all_objects c
+        )
+    """
+    cursor.execute(numbers + """
+        INSERT INTO Jogadores (Nome, Idade, NickName, Palavra_chave)
+        SELECT CONCAT('Jogador ', i), 18 + i % 40, CONCAT('nick', i), CONCAT('senha', i) FROM n
+    """, players)
+    cursor.execute("SELECT MIN(JogadorID) FROM Jogadores")
+    first_player = cursor.fetchone()[0]
+    cursor.execute(numbers + """
+        INSERT INTO Jogos (Nome, Data_lancamento, Tempo_jogado, Concluido, Tipo, JogadorID, PlataformaID)
+        SELECT CONCAT('Jogo ', i), DATEADD(DAY, -(i % 9000), '2024-01-01'), '10:00',
+               CASE WHEN i % 2 = 0 THEN 'Sim' ELSE 'Nao' END, 'Acao', ? + i % ?, 1 + i % 9
+        FROM n
+    """, (games, first_player, players))
+    conn.commit()
+    print(f"Dados gerados em {time.perf_counter() - start:.1f} s")
+
+
+def set_indexes(conn, enabled):
+    cursor = conn.cursor()
+    for name, table, columns, include in INDEXES:
+        if enabled:
+            cursor.execute(create_index_sql(name, table, columns, include))
+        else:
+            cursor.execute(f"DROP INDEX IF EXISTS {name} ON {table}")
+    conn.commit()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(label, cursor, sql, params_list):
+    latencies = []
+    for params in params_list:
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"{label:<32} media {statistics.mean(latencies):8.2f} ms | "
+          f"p50 {percentile(latencies, 50):8.2f} ms | p99 {percentile(latencies, 99):8.2f} ms")
+
+
+def show_plan(conn, sql, params):
+    # SHOWPLAN_TEXT devolve o plano estimado sem executar a consulta
+    cursor = conn.cursor()
+    cursor.execute("SET SHOWPLAN_TEXT ON")
+    try:
+        cursor.execute(sql.replace("?", "{}").format(*(repr(p) for p in params)))
+        while True:
+            for row in cursor.fetchall():
+                print(f"    {row[0].strip()}")
+            if not cursor.nextset():
+                break
+    finally:
+        cursor.execute("SET SHOWPLAN_TEXT OFF")
+
+
+def run_queries(conn, players, first_player, count, plan):
+    cursor = conn.cursor()
+    ids = [(first_player + random.randrange(players),) for _ in range(count)]
+
+    queries = [
+        ("Jogos por jogador (*)", SQLScripts.select_games_by_player(), ids),
+        ("Jogos por jogador (nomes)", SQLScripts.select("Jogos", ["Nome"], "JogadorID = ?"), ids),
+        ("Pagina de jogos por chave",
+         SQLScripts.select_page("Jogos", ["Nome"], "JogoID", "JogadorID = ?", after_key=False),
+         [(50,) + p for p in ids]),
+    ]
+
+    for label, sql, params_list in queries:
+        measure(label, cursor, sql, params_list)
+        if plan:
+            show_plan(conn, sql, params_list[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jogos", type=int, default=1_000_000)
+    parser.add_argument("--jogadores", type=int, default=10_000)
+    parser.add_argument("--consultas", type=int, default=500)
+    parser.add_argument("--plano", action="store_true", help="Mostra o plano estimado de cada consulta")
+    args = parser.parse_args()
+
+    load_dotenv()
+    conn = prepare_database(os.getenv("BENCH_DB_NAME", "Biblioteca_jogos_bench"))
+    seed(conn, args.jogos, args.jogadores)
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT MIN(JogadorID), COUNT(*) FROM Jogadores")
+    first_player, players = cursor.fetchone()
+
+    for enabled in (False, True):
+        set_indexes(conn, enabled)
+        print(f"\n{'Com' if enabled else 'Sem'} indices ({args.consultas} consultas cada)\n")
+        run_queries(conn, players, first_player, args.consultas, args.plano)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: snapshot colunar da tabela Jogos (database/snapshot.py).
+
+Mede o tempo de montagem do GamesSnapshot e dos agrupamentos
+(horas por plataforma, taxa de conclusao por tipo, jogos por ano)
+comparando com os mesmos agrupamentos em Python sobre as tuplas.
+
+Uso:
+    python benchmarks/bench_snapshot.py [--linhas N] [--repeticoes N]
+    python benchmarks/bench_snapshot.py --banco
+
+Sem --banco, usa linhas geradas em memoria. Com --banco, le a tabela Jogos de
+BENCH_DB_NAME (padrao Biblioteca_jogos_bench) usando DB_SERVER, DB_USER e
+DB_PASSWORD do .env (popule antes com benchmarks/bench_indexes.py).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.snapshot import GamesSnapshot
+from models.records import parse_play_time
+
+
+TIPOS = ["Acao", "RPG", "Plataforma", "Estrategia", "Corrida", "Esporte"]
+
+
+def generate_rows(count, players, seed=1):
+    rng = random.Random(seed)
+    datas = [date(ano, mes, 1) for ano in range(1990, 2025) for mes in range(1, 13)]
+    for jogo_id in range(1, count + 1):
+        yield (
+            jogo_id,
+            rng.randint(1, players),
+            rng.randint(1, 9),
+            rng.choice(["Sim", "Não"]),
+            rng.choice(TIPOS),
+            f"{rng.randint(0, 200):02d}:{rng.randint(0, 59):02d}",
+            rng.choice(datas),
+        )
+
+
+def load_rows_from_database():
+    import pyodbc
+    from dotenv import load_dotenv
+
+    from database.functions import DatabaseFunctions
+    from database.pool import ConnectionPool
+
+    load_dotenv()
+    connection_string = (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={os.getenv('DB_SERVER')};"
+        f"DATABASE={os.getenv('BENCH_DB_NAME', 'Biblioteca_jogos_bench')};"
+        f"UID={os.getenv('DB_USER')};"
+        f"PWD={os.getenv('DB_PASSWORD')}"
+    )
+    db = DatabaseFunctions(pool=ConnectionPool(lambda: pyodbc.connect(connection_string), max_size=1))
+
+    start = time.perf_counter()
+    snapshot = GamesSnapshot.load(db)
+    print(f"Leitura do banco + snapshot: {len(snapshot)} linhas em {time.perf_counter() - start:.2f} s")
+    return snapshot
+
+
+# Mesmos agrupamentos sobre as tuplas (referencia sem NumPy)
+def python_group_bys(rows):
+    minutos = defaultdict(int)
+    tipos = defaultdict(lambda: [0, 0])
+    anos = defaultdict(int)
+    for _, _, plataforma, concluido, tipo, tempo, data in rows:
+        minutos[plataforma] += parse_play_time(tempo)
+        tipos[tipo][0] += 1
+        tipos[tipo][1] += concluido == "Sim"
+        anos[data.year] += 1
+    horas = {plataforma: round(total / 60, 1) for plataforma, total in minutos.items()}
+    return horas, {tipo: feitos / total for tipo, (total, feitos) in tipos.items()}, dict(anos)
+
+
+def snapshot_group_bys(snapshot):
+    return snapshot.hours_per_platform(), snapshot.completion_rate_per_genre(), snapshot.games_per_year()
+
+
+def measure(function, repetitions):
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--jogadores", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--banco", action="store_true", help="Le a tabela Jogos do banco de teste")
+    args = parser.parse_args()
+
+    if args.banco:
+        snapshot = load_rows_from_database()
+        rows = None
+    else:
+        print(f"Gerando {args.linhas} linhas...")
+        rows = list(generate_rows(args.linhas, args.jogadores))
+        start = time.perf_counter()
+        snapshot = GamesSnapshot.from_rows(rows)
+        print(f"Montagem do snapshot: {time.perf_counter() - start:.2f} s")
+
+    resultado, mediana = measure(lambda: snapshot_group_bys(snapshot), args.repeticoes)
+    print(f"Agrupamentos (snapshot): {mediana:8.1f} ms")
+
+    jogador = int(snapshot.jogador.categories[0]) if len(snapshot) else None
+    _, mediana = measure(lambda: snapshot.hours_per_platform(jogador), args.repeticoes)
+    print(f"Horas por plataforma de um jogador: {mediana:8.1f} ms")
+
+    if rows is not None:
+        referencia, mediana = measure(lambda: python_group_bys(rows), 1)
+        print(f"Agrupamentos (Python):   {mediana:8.1f} ms")
+        if referencia[0] != resultado[0] or referencia[2] != resultado[2]:
+            raise SystemExit("Resultados diferentes entre snapshot e Python")
+
+
+if __name__ == "__main__":
+    main()
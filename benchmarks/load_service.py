@@ -0,0 +1,175 @@
+"""
+Gerador de carga: exercita o LibraryService (mesmo codigo do menu e do servidor HTTP)
+com varias threads, sem input(), e mede operacoes/s e p50/p99 por operacao.
+
+Mistura padrao de operacoes por jogador:
+  - listar uma pagina de jogos (list_games)
+  - cadastrar jogo (add_game) e remover jogo (remove_game)
+  - estatisticas da biblioteca (stats, em cache ate os jogos mudarem)
+  - enriquecimento pelo cache do Gemini (enrich, sem chamadas a API)
+
+Uso:
+    python benchmarks/load_service.py [--threads N] [--segundos S] [--jogadores N] [--login]
+
+Usa DB_SERVER, DB_USER e DB_PASSWORD do .env; o banco de teste e
+BENCH_DB_NAME (padrao Biblioteca_jogos_bench) e nunca o banco da aplicacao.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import pyodbc
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.gemini_client import GeminiCache
+from database.functions import DatabaseFunctions
+from database.pool import ConnectionPool
+from services.library_service import LibraryService
+
+
+# Peso de cada operacao na mistura
+OPERACOES = {"list_games": 40, "add_game": 25, "stats": 20, "remove_game": 10, "enrich": 5}
+TITULOS = ["Celeste", "Hades", "Halo Infinite", "God of War", "Stardew Valley", "Elden Ring"]
+
+
+def connection_string(database):
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={os.getenv('DB_SERVER')};"
+        f"DATABASE={database};"
+        f"UID={os.getenv('DB_USER')};"
+        f"PWD={os.getenv('DB_PASSWORD')}"
+    )
+
+
+def create_service(database, threads):
+    with pyodbc.connect(connection_string("master"), autocommit=True) as conn:
+        conn.cursor().execute(f"IF DB_ID('{database}') IS NULL CREATE DATABASE {database}")
+
+    conn_str = connection_string(database)
+    pool = ConnectionPool(lambda: pyodbc.connect(conn_str), max_size=threads)
+    cache_file = os.path.join(tempfile.mkdtemp(prefix="bench_cache_"), "gemini_cache.db")
+    return LibraryService(db=DatabaseFunctions(pool=pool), gemini_cache=GeminiCache(cache_file), use_gemini=False)
+
+
+def create_players(service, count):
+    senha = "bench"
+    players = []
+    for i in range(count):
+        player_id = service.register_player(
+            {"Nome": f"Carga {i}", "Idade": 20 + i % 40, "NickName": f"carga{i}", "Palavra_chave": senha}
+        )
+        if player_id is None:
+            raise SystemExit("Falha ao cadastrar jogadores de teste")
+        players.append(player_id)
+    return players, senha
+
+
+def new_game(rng):
+    return {
+        "Nome": rng.choice(TITULOS),
+        "Data_lancamento": f"{rng.randint(1995, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "Tempo_jogado": f"{rng.randint(0, 200):02d}:{rng.randint(0, 59):02d}",
+        "Concluido": rng.choice(["Sim", "Nao"]),
+        "Tipo": rng.choice(["Acao", "RPG", "Plataforma", "Estrategia"]),
+        "PlataformaID": rng.randint(1, 9),
+    }
+
+
+def worker(service, players, senha, mix, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    operations, weights = list(mix), list(mix.values())
+    added = defaultdict(list)
+
+    while time.perf_counter() < deadline:
+        player_id = rng.choice(players)
+        operation = rng.choices(operations, weights)[0]
+
+        start = time.perf_counter()
+        if operation == "list_games":
+            result = service.list_games(player_id, limit=50)
+        elif operation == "add_game":
+            result = service.add_game(player_id, new_game(rng))
+            if result is not None:
+                added[player_id].append(result)
+        elif operation == "remove_game":
+            if not added[player_id]:
+                continue
+            result = service.remove_game(player_id, added[player_id].pop())
+        elif operation == "stats":
+            result = service.stats(player_id)
+        elif operation == "enrich":
+            result = service.enrich(rng.sample(TITULOS, 3))
+        else:
+            result = service.authenticate(player_id, senha)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if result is None or result is False:
+            errors[operation] += 1
+        latencies[operation].append(elapsed)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=20)
+    parser.add_argument("--jogadores", type=int, default=50)
+    parser.add_argument("--login", action="store_true", help="Inclui login (PBKDF2) na mistura")
+    args = parser.parse_args()
+
+    load_dotenv()
+    service = create_service(os.getenv("BENCH_DB_NAME", "Biblioteca_jogos_bench"), args.threads)
+    print(f"Cadastrando {args.jogadores} jogadores de teste...")
+    players, senha = create_players(service, args.jogadores)
+
+    mix = dict(OPERACOES, login=2) if args.login else OPERACOES
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    shards = [(defaultdict(list), defaultdict(int)) for _ in range(args.threads)]
+
+    print(f"Executando {args.threads} threads por {args.segundos:.0f} s...")
+    start = time.perf_counter()
+    deadline = start + args.segundos
+    threads = [
+        threading.Thread(target=worker, args=(service, players, senha, mix, deadline, seed, lat, err))
+        for seed, (lat, err) in enumerate(shards)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    for lat, err in shards:
+        for operation, values in lat.items():
+            latencies[operation].extend(values)
+        for operation, count in err.items():
+            errors[operation] += count
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{total} operacoes em {elapsed:.1f} s: {total / elapsed:,.0f} ops/s\n")
+    for operation, values in sorted(latencies.items()):
+        print(f"{operation:<12} {len(values):8} ops | media {statistics.mean(values):7.2f} ms | "
+              f"p50 {percentile(values, 50):7.2f} ms | p99 {percentile(values, 99):7.2f} ms | "
+              f"falhas {errors[operation]}")
+
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
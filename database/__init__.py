@@ -1,11 +1,21 @@
 
-
 # Pacote de banco de dados.
 
+from utils.lazy_exports import lazy_exports
 
-from .connection import DatabaseConnection
-from .functions import DatabaseFunctions
-from .scripts import SQLScripts
+# Nomes exportados e o módulo de cada um; carregados no primeiro acesso
+_EXPORTS = {
+    'DatabaseConnection': '.connection',
+    'get_pool': '.connection',
+    'close_pool': '.connection',
+    'DatabaseFunctions': '.functions',
+    'ConnectionPool': '.pool',
+    'SQLScripts': '.scripts',
+    'GamesSnapshot': '.snapshot',
+}
 
 # Exporta as classes
-__all__ = ['DatabaseConnection', 'DatabaseFunctions', 'SQLScripts']
\ No newline at end of file
+__all__ = ['DatabaseConnection', 'DatabaseFunctions', 'SQLScripts',
+           'ConnectionPool', 'get_pool', 'close_pool', 'GamesSnapshot']
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,197 @@
+"""
+Modulo de importacao em lote de jogos.
+
+Le arquivos CSV ou JSON Lines de forma incremental, valida cada linha com
+Jogo.validar_dados e grava os registros validos em lotes via executemany
+(fast_executemany), com um commit por lote.
+"""
+
+import csv
+import json
+import os
+import time
+
+from models.jogo import Jogo
+
+from .connection import get_pool
+from .migrations import ensure_schema
+from .scripts import SQLScripts
+
+
+# Numero maximo de rejeicoes guardadas com detalhes no relatorio
+MAX_REJECTION_DETAILS = 1000
+
+
+class ImportReport:
+    """
+    Resultado de uma importacao em lote.
+
+    Atributos:
+        read: Linhas lidas do arquivo
+        inserted: Linhas gravadas no banco
+        rejected: Linhas rejeitadas (validacao ou erro no lote)
+        batches: Lotes confirmados
+        elapsed: Tempo total em segundos
+        rejections: Lista de (linha, motivo) com ate MAX_REJECTION_DETAILS itens
+    """
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.rejections = []
+
+    @property
+    def rows_per_sec(self):
+        """Linhas gravadas por segundo."""
+        return self.inserted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def reject(self, line, reason):
+        """Registra uma linha rejeitada."""
+        self.rejected += 1
+        if len(self.rejections) < MAX_REJECTION_DETAILS:
+            self.rejections.append((line, reason))
+
+    def summary(self):
+        """Retorna um resumo em texto do relatorio."""
+        return (
+            f"Lidas: {self.read} | Inseridas: {self.inserted} | "
+            f"Rejeitadas: {self.rejected} | Lotes: {self.batches} | "
+            f"Tempo: {self.elapsed:.2f}s | {self.rows_per_sec:,.0f} linhas/s"
+        )
+
+
+def read_rows(path, fmt=None):
+    """
+    Le um arquivo CSV ou JSON Lines linha a linha.
+
+    Args:
+        path: Caminho do arquivo
+        fmt: "csv" ou "jsonl" (deduzido pela extensao se omitido)
+
+    Yields:
+        Tuplas (numero da linha, dicionario ou None se a linha for invalida)
+    """
+    fmt = fmt or ("jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson") else "csv")
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        elif fmt == "jsonl":
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                yield line_num, row if isinstance(row, dict) else None
+        else:
+            raise ValueError(f"Formato de importacao desconhecido: {fmt}")
+
+
+class BulkGameImporter:
+    """
+    Importador de jogos em lote.
+
+    Atributos:
+        pool: Pool de conexoes usado na gravacao
+        batch_size: Quantidade de linhas por executemany/commit
+        jogador_id: Se informado, substitui o JogadorID de todas as linhas
+    """
+
+    def __init__(self, pool=None, batch_size=1000, jogador_id=None):
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser maior que zero")
+
+        self.pool = pool or get_pool()
+        self.batch_size = batch_size
+        self.jogador_id = jogador_id
+        self.sql = SQLScripts.insert("Jogos", Jogo.get_columns())
+
+    def import_file(self, path, fmt=None, progress=None):
+        """
+        Importa um arquivo CSV ou JSON Lines.
+
+        Args:
+            path: Caminho do arquivo
+            fmt: "csv" ou "jsonl" (opcional)
+            progress: Funcao chamada apos cada lote com o ImportReport parcial
+
+        Returns:
+            ImportReport com os totais da importacao
+        """
+        return self.import_rows(read_rows(path, fmt), progress)
+
+    def import_rows(self, rows, progress=None):
+        """
+        Valida e grava registros em lotes.
+
+        Args:
+            rows: Iteravel de (numero da linha, dicionario)
+            progress: Funcao chamada apos cada lote com o ImportReport parcial
+
+        Returns:
+            ImportReport com os totais da importacao
+        """
+        report = ImportReport()
+        start = time.perf_counter()
+        ensure_schema(self.pool)
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.fast_executemany = True
+
+            batch, lines = [], []
+            for line, row in rows:
+                report.read += 1
+
+                if row is None:
+                    report.reject(line, "Linha mal formada")
+                    continue
+
+                if self.jogador_id is not None:
+                    row = dict(row, JogadorID=self.jogador_id)
+
+                values, reason = Jogo.validar_dados(row)
+                if reason:
+                    report.reject(line, reason)
+                    continue
+
+                batch.append(values)
+                lines.append(line)
+
+                if len(batch) >= self.batch_size:
+                    self._write_batch(conn, cursor, batch, lines, report)
+                    batch, lines = [], []
+                    report.elapsed = time.perf_counter() - start
+                    if progress:
+                        progress(report)
+
+            if batch:
+                self._write_batch(conn, cursor, batch, lines, report)
+
+            cursor.close()
+
+        report.elapsed = time.perf_counter() - start
+        if progress:
+            progress(report)
+
+        return report
+
+    def _write_batch(self, conn, cursor, batch, lines, report):
+        """Grava um lote com executemany e confirma; em caso de erro o lote inteiro e rejeitado."""
+        try:
+            cursor.executemany(self.sql, batch)
+            conn.commit()
+            report.inserted += len(batch)
+            report.batches += 1
+        except Exception as e:
+            conn.rollback()
+            print(f" Erro ao gravar lote (linhas {lines[0]}-{lines[-1]}): {e}")
+            for line in lines:
+                report.reject(line, f"Erro no lote: {e}")
@@ -1,223 +1,157 @@
 """
 Modulo de conexao com o banco de dados SQL Server.
-Gerencia a conexao, execucao de queries e criacao automatica de tabelas.
+Gerencia a conexao e a execucao de queries. A criacao das tabelas fica
+no modulo de migracoes.
 """
 
 import os
-import pyodbc
-from dotenv import load_dotenv
+import threading
+
+from .migrations import ensure_schema
+from .pool import ConnectionPool
+from .scripts import SQLScripts
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pyodbc():
+    """
+    Importa o pyodbc sob demanda: carregar o driver ODBC so e necessario
+    ao abrir a primeira conexao, nao na inicializacao do programa.
+    """
+    import pyodbc
+    return pyodbc
+
+
+def driver_errors():
+    """
+    Excecoes do driver ODBC (pyodbc.Error) para uso em except, sem importar
+    o driver antes da primeira falha. Vazio se o pyodbc nao estiver instalado.
+    """
+    try:
+        return (_pyodbc().Error,)
+    except ImportError:
+        return ()
+
+
+def build_connection_string():
+    """
+    Monta a string de conexao a partir do arquivo .env.
+    
+    Returns:
+        String de conexao ODBC
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    server = os.getenv("DB_SERVER")
+    database = os.getenv("DB_NAME")
+    username = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    
+    if not all([server, database, username, password]):
+        raise ValueError("Configuracoes de banco de dados incompletas no arquivo .env")
+    
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={server};"
+        f"DATABASE={database};"
+        f"UID={username};"
+        f"PWD={password}"
+    )
+
+
+def _open_connection(connection_string):
+    """
+    Abre uma nova conexao pyodbc (usada pelo pool).
+    """
+    try:
+        return _pyodbc().connect(connection_string)
+    except _pyodbc().Error as e:
+        print(f"Erro de conexao ODBC: {e}")
+        raise
+    except Exception as e:
+        print(f"Erro na conexao: {e}")
+        raise
+
+
+def get_pool():
+    """
+    Retorna o pool de conexoes compartilhado pelo processo.
+    
+    O pool e criado na primeira chamada (ou recriado se tiver sido fechado)
+    e configurado pelas variaveis DB_POOL_* do arquivo .env.
+    
+    Returns:
+        Instancia de ConnectionPool
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            connection_string = build_connection_string()
+            _pool = ConnectionPool(
+                lambda: _open_connection(connection_string),
+                max_size=int(os.getenv("DB_POOL_MAX_SIZE", "5")),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+                max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            )
+        return _pool
+
+
+def close_pool():
+    """
+    Fecha o pool compartilhado e todas as conexoes ociosas.
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 
 class DatabaseConnection:
     """
     Classe para gerenciar a conexao com o banco de dados SQL Server.
     
+    A conexao e emprestada do pool compartilhado e devolvida em close().
+    
     Atributos:
-        conn: Objeto de conexao pyodbc
+        pool: Pool de onde a conexao foi emprestada
+        conn: Conexao emprestada do pool
         cursor: Cursor para execucao de queries
     """
     
-    def __init__(self):
+    def __init__(self, pool=None):
         """
         Inicializa a conexao com o banco de dados.
         
-        Carrega as variaveis de ambiente e estabelece conexao com o SQL Server.
-        Cria as tabelas automaticamente se nao existirem.
+        Empresta uma conexao do pool (criando o pool a partir do .env se
+        necessario). Aplica as migracoes pendentes apenas se a marca local
+        do esquema estiver desatualizada.
+        
+        Args:
+            pool: Pool de conexoes a usar (opcional, usa o compartilhado)
         """
+        self.pool = pool
         self.conn = None
         self.cursor = None
         self._connect()
-        self._create_tables_if_not_exist()
     
     def _connect(self):
         """
-        Estabelece conexao com o banco de dados.
-        
-        Carrega as configuracoes do arquivo .env e cria a string de conexao.
+        Empresta uma conexao do pool.
         """
-        load_dotenv()
+        if self.pool is None:
+            self.pool = get_pool()
         
-        server = os.getenv("DB_SERVER")
-        database = os.getenv("DB_NAME")
-        username = os.getenv("DB_USER")
-        password = os.getenv("DB_PASSWORD")
-        
-        if not all([server, database, username, password]):
-            raise ValueError("Configuracoes de banco de dados incompletas no arquivo .env")
-        
-        try:
-            connection_string = (
-                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                f"SERVER={server};"
-                f"DATABASE={database};"
-                f"UID={username};"
-                f"PWD={password}"
-            )
-            
-            self.conn = pyodbc.connect(connection_string)
-            self.cursor = self.conn.cursor()
-            print("Conexao com banco de dados estabelecida.")
-            
-        except pyodbc.Error as e:
-            print(f"Erro de conexao ODBC: {e}")
-            raise
-        except Exception as e:
-            print(f"Erro na conexao: {e}")
-            raise
-    
-    def _create_tables_if_not_exist(self):
-        """
-        Cria as tabelas necessarias se nao existirem.
-        Adapta-se a estrutura existente sem causar erros.
-        """
-        try:
-            print("Verificando estrutura do banco de dados...")
-            
-            # Criar tabela Jogadores se nao existir
-            self.cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Jogadores' AND xtype='U')
-                CREATE TABLE Jogadores (
-                    JogadorID INT IDENTITY(1,1) PRIMARY KEY,
-                    Nome NVARCHAR(100) NOT NULL,
-                    Idade INT NOT NULL,
-                    NickName NVARCHAR(50),
-                    Palavra_chave NVARCHAR(50) NOT NULL
-                )
-            """)
-            
-            # Criar tabela Jogos se nao existir
-            self.cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Jogos' AND xtype='U')
-                CREATE TABLE Jogos (
-                    JogoID INT IDENTITY(1,1) PRIMARY KEY,
-                    Nome NVARCHAR(200) NOT NULL,
-                    Data_lancamento DATE NOT NULL,
-                    Tempo_jogado NVARCHAR(20),
-                    Concluido CHAR(3) NOT NULL,
-                    Tipo NVARCHAR(50) NOT NULL,
-                    JogadorID INT,
-                    PlataformaID INT
-                )
-            """)
-            
-            # Verificar se tabela Plataformas existe e sua estrutura
-            self.cursor.execute("""
-                SELECT COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_NAME = 'Plataformas'
-            """)
-            
-            existing_columns = [row[0] for row in self.cursor.fetchall()]
-            
-            if not existing_columns:
-                # Tabela nao existe, criar com estrutura padrao
-                self.cursor.execute("""
-                    CREATE TABLE Plataformas (
-                        PlataformaID INT PRIMARY KEY,
-                        Nome NVARCHAR(50) NOT NULL,
-                        Descricao NVARCHAR(200)
-                    )
-                """)
-                print("  Tabela Plataformas criada com coluna 'Descricao'")
-            else:
-                # Tabela existe, verificar se tem coluna Descricao ou Console
-                if 'Descricao' in existing_columns:
-                    print("  Tabela Plataformas ja existe com coluna 'Descricao'")
-                elif 'Console' in existing_columns:
-                    print("  Tabela Plataformas existe com coluna 'Console' (estrutura atual)")
-                else:
-                    print(f"  Tabela Plataformas existe com colunas: {existing_columns}")
-            
-            # Verificar e inserir plataformas padrao se necessario
-            self._check_and_insert_platforms(existing_columns)
-            
-            self.conn.commit()
-            print("Verificacao de estrutura concluida.")
-            
-            # Verificar e exibir as tabelas
-            self.cursor.execute("""
-                SELECT TABLE_NAME 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_TYPE = 'BASE TABLE'
-                ORDER BY TABLE_NAME
-            """)
-            
-            tables = self.cursor.fetchall()
-            print(f"Tabelas disponiveis: {[table[0] for table in tables]}")
-            
-        except pyodbc.Error as e:
-            print(f"Erro ao verificar estrutura: {e}")
-            # Nao faz rollback, apenas informa o erro
-            print("Continuando com estrutura existente...")
-        except Exception as e:
-            print(f"Erro inesperado: {e}")
-            print("Continuando com estrutura existente...")
-
-    def _check_and_insert_platforms(self, existing_columns):
-        """
-        Verifica e insere plataformas padrao adaptando-se a estrutura existente.
-        """
-        try:
-            # Verificar se ja existem plataformas
-            self.cursor.execute("SELECT COUNT(*) FROM Plataformas")
-            count = self.cursor.fetchone()[0]
-            
-            if count == 0:
-                print("Inserindo plataformas padrao...")
-                
-                # Verificar qual coluna existe
-                if 'Console' in existing_columns:
-                    # Usar estrutura atual (Console)
-                    platforms = [
-                        (1, 'Playstation 1', 'Sony'),
-                        (2, 'Playstation 2', 'Sony'),
-                        (3, 'Playstation 3', 'Sony'),
-                        (4, 'Playstation 4', 'Sony'),
-                        (5, 'Playstation 5', 'Sony'),
-                        (6, 'Xbox 360', 'Microsoft'),
-                        (7, 'Xbox One', 'Microsoft'),
-                        (8, 'Xbox Series X/S', 'Microsoft'),
-                        (9, 'PC', 'Computador')
-                    ]
-                    
-                    for plataforma_id, nome, console in platforms:
-                        self.cursor.execute("""
-                            INSERT INTO Plataformas (PlataformaID, Nome, Console)
-                            VALUES (?, ?, ?)
-                        """, (plataforma_id, nome, console))
-                    
-                    print(f"  {len(platforms)} plataformas inseridas (estrutura Console)")
-                    
-                elif 'Descricao' in existing_columns:
-                    # Usar estrutura padrao (Descricao)
-                    platforms = [
-                        (1, 'Playstation 1', 'Sony PlayStation 1'),
-                        (2, 'Playstation 2', 'Sony PlayStation 2'),
-                        (3, 'Playstation 3', 'Sony PlayStation 3'),
-                        (4, 'Playstation 4', 'Sony PlayStation 4'),
-                        (5, 'Playstation 5', 'Sony PlayStation 5'),
-                        (6, 'Xbox 360', 'Microsoft Xbox 360'),
-                        (7, 'Xbox One', 'Microsoft Xbox One'),
-                        (8, 'Xbox Series X/S', 'Microsoft Xbox Series X/S'),
-                        (9, 'PC', 'Computador Pessoal')
-                    ]
-                    
-                    for plataforma_id, nome, descricao in platforms:
-                        self.cursor.execute("""
-                            INSERT INTO Plataformas (PlataformaID, Nome, Descricao)
-                            VALUES (?, ?, ?)
-                        """, (plataforma_id, nome, descricao))
-                    
-                    print(f"  {len(platforms)} plataformas inseridas (estrutura Descricao)")
-                else:
-                    print("  Estrutura da tabela Plataformas desconhecida, pulando insercao")
-                    
-            else:
-                print(f"  Plataformas ja existem ({count} registros)")
-                
-        except Exception as e:
-            print(f"  Erro ao verificar/inserir plataformas: {e}")
-            # Continua mesmo com erro
+        ensure_schema(self.pool)
+        self.conn = self.pool.acquire()
+        self.cursor = self.conn.cursor()
     
     def execute_query(self, sql, params=None):
         """
@@ -243,7 +177,7 @@ class DatabaseConnection:
                 self.conn.commit()
                 return self.cursor.rowcount
             
-        except pyodbc.Error as e:
+        except _pyodbc().Error as e:
             print(f"Erro na execucao da query: {e}")
             self.conn.rollback()
             raise
@@ -283,7 +217,7 @@ class DatabaseConnection:
             
             return self.cursor.rowcount
             
-        except pyodbc.Error as e:
+        except _pyodbc().Error as e:
             print(f"Erro ao inserir dados: {e}")
             self.conn.rollback()
             raise
@@ -311,7 +245,7 @@ class DatabaseConnection:
             self.conn.commit()
             return self.cursor.rowcount
             
-        except pyodbc.Error as e:
+        except _pyodbc().Error as e:
             print(f"Erro ao remover dados: {e}")
             self.conn.rollback()
             raise
@@ -340,7 +274,7 @@ class DatabaseConnection:
         try:
             self.cursor.execute(sql, (table_name,))
             return self.cursor.fetchall()
-        except pyodbc.Error as e:
+        except _pyodbc().Error as e:
             print(f"Erro ao obter informacoes da tabela: {e}")
             return []
     
@@ -351,28 +285,26 @@ class DatabaseConnection:
         Returns:
             True se a conexao estiver funcionando, False caso contrario
         """
-        try:
-            self.cursor.execute("SELECT 1")
-            result = self.cursor.fetchone()
-            return result[0] == 1
-        except:
+        if not self.conn:
             return False
+        return self.pool.ping(self.conn)
     
     def close(self):
         """
-        Fecha a conexao com o banco de dados.
+        Devolve a conexao ao pool.
         
-        Fecha o cursor e a conexao se estiverem abertos.
+        Fecha o cursor e devolve a conexao se estiverem abertos.
         """
         if self.cursor:
-            self.cursor.close()
+            try:
+                self.cursor.close()
+            except Exception:
+                pass
             self.cursor = None
         
         if self.conn:
-            self.conn.close()
+            self.pool.release(self.conn)
             self.conn = None
-        
-        print("Conexao com banco de dados fechada.")
     
     def __enter__(self):
         """
@@ -387,7 +319,7 @@ class DatabaseConnection:
         """
         Metodo para uso em context manager (with statement).
         
-        Garante que a conexao seja fechada ao sair do contexto.
+        Garante que a conexao seja devolvida ao pool ao sair do contexto.
         """
         self.close()
     
@@ -395,7 +327,7 @@ class DatabaseConnection:
         """
         Destrutor da classe.
         
-        Garante que a conexao seja fechada quando o objeto for destruido.
+        Garante que a conexao seja devolvida ao pool quando o objeto for destruido.
         """
         self.close()
 
@@ -415,14 +347,15 @@ def test_database_connection():
     """
     Testa a conexao com o banco de dados.
     
+    O health check e feito pelo proprio pool ao emprestar a conexao.
+    
     Returns:
         True se a conexao for bem-sucedida, False caso contrario
     """
     try:
-        db = DatabaseConnection()
-        connected = db.test_connection()
-        db.close()
-        return connected
+        pool = get_pool()
+        with pool.connection() as conn:
+            return pool.ping(conn)
     except Exception as e:
         print(f"Falha ao testar conexao: {e}")
         return False
@@ -436,27 +369,27 @@ def get_database_info():
         Dicionario com informacoes do banco de dados
     """
     try:
-        db = DatabaseConnection()
-        
-        # Obtem nome do banco
-        db.cursor.execute("SELECT DB_NAME()")
-        db_name = db.cursor.fetchone()[0]
-        
-        # Obtem versao do SQL Server
-        db.cursor.execute("SELECT @@VERSION")
-        version = db.cursor.fetchone()[0]
-        
-        # Obtem lista de tabelas
-        db.cursor.execute("""
-            SELECT TABLE_NAME 
-            FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_TYPE = 'BASE TABLE'
-            ORDER BY TABLE_NAME
-        """)
-        
-        tables = [row[0] for row in db.cursor.fetchall()]
-        
-        db.close()
+        with get_pool().connection() as conn:
+            cursor = conn.cursor()
+            
+            # Obtem nome do banco
+            cursor.execute("SELECT DB_NAME()")
+            db_name = cursor.fetchone()[0]
+            
+            # Obtem versao do SQL Server
+            cursor.execute("SELECT @@VERSION")
+            version = cursor.fetchone()[0]
+            
+            # Obtem lista de tabelas
+            cursor.execute("""
+                SELECT TABLE_NAME 
+                FROM INFORMATION_SCHEMA.TABLES 
+                WHERE TABLE_TYPE = 'BASE TABLE'
+                ORDER BY TABLE_NAME
+            """)
+            
+            tables = [row[0] for row in cursor.fetchall()]
+            cursor.close()
         
         return {
             'database_name': db_name,
@@ -470,6 +403,53 @@ def get_database_info():
         return None
 
 
+def get_plan_cache_stats(conn=None):
+    """
+    Mede o reaproveitamento de planos no cache do SQL Server para o banco atual.
+    
+    Cada plano e compilado uma vez; as demais execucoes sao acertos. Muitos
+    planos 'Adhoc' de uso unico indicam SQL com valores embutidos no texto.
+    
+    Args:
+        conn: Conexao a usar (empresta uma do pool se omitida)
+    
+    Returns:
+        Dicionario com planos, execucoes, taxa de acerto e detalhe por tipo,
+        ou None se o usuario nao tiver a permissao VIEW SERVER STATE
+    """
+    def collect(connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SQLScripts.plan_cache_stats())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    try:
+        if conn is not None:
+            rows = collect(conn)
+        else:
+            with get_pool().connection() as pooled:
+                rows = collect(pooled)
+    except Exception as e:
+        print(f"Erro ao consultar o cache de planos: {e}")
+        return None
+    
+    by_type = {
+        row[0].strip(): {'planos': row[1], 'execucoes': row[2], 'planos_uso_unico': row[3]}
+        for row in rows
+    }
+    plans = sum(item['planos'] for item in by_type.values())
+    executions = sum(item['execucoes'] for item in by_type.values())
+    
+    return {
+        'planos': plans,
+        'execucoes': executions,
+        'taxa_acerto': (executions - plans) / executions if executions else 0.0,
+        'por_tipo': by_type,
+    }
+
+
 if __name__ == "__main__":
     # Teste basico da conexao
     print("Testando conexao com o banco de dados...")
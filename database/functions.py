@@ -1,56 +1,327 @@
-
 # Funções para operações no banco de dados.
 
 
-from .connection import DatabaseConnection
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from .connection import get_pool
+from .migrations import ensure_schema
+from .scripts import SQLScripts
+from utils.security import (
+    hash_password, needs_rehash, verify_legacy_password, verify_password,
+)
+
+
+# Hash usado para gastar o mesmo tempo quando o jogador não existe (gerado no primeiro uso)
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    return hash_password("")
 
 # Classe de funções
+# As operações não exibem mensagens de sucesso (quem chama informa o usuário); erros são exibidos.
 class DatabaseFunctions:
-    
+
+    # Linhas por página na paginação por chave e por lote no fetchmany
+    PAGE_SIZE = 50
+    ARRAYSIZE = 500
+
+    # Jogadores com estatísticas em cache (os menos usados saem primeiro)
+    STATS_CACHE_SIZE = 1024
+
     # Construtor
-    def __init__(self, db_connection=None):
-        self.db = db_connection or DatabaseConnection()
-    
+    # Sem db_connection, cada operação empresta uma conexão do pool e a devolve ao final.
+    def __init__(self, db_connection=None, pool=None):
+        self.db = db_connection
+        # Estatísticas por jogador: jogador_id -> (estatísticas, expiração). Descartadas quando os jogos
+        # mudam por este processo (invalidate_stats) ou após DB_STATS_TTL segundos, pois outros
+        # processos (import_games.py, outros servidores) também gravam em Jogos
+        self._stats_cache = OrderedDict()
+        self._stats_lock = threading.Lock()
+        self.stats_ttl = float(os.getenv("DB_STATS_TTL", "60"))
+
+        # Apenas um pool recebido aqui é fechado em close(); o compartilhado (get_pool) fica para close_pool()
+        self._owns_pool = pool is not None and db_connection is None
+
+        if db_connection is not None:
+            self.pool = db_connection.pool
+        else:
+            self.pool = pool or get_pool()
+            # Sem acesso ao banco quando a marca local do esquema está em dia
+            ensure_schema(self.pool)
+
+    # Empresta uma conexão pelo tempo de uma operação
+    # query, insert e delete usam o cursor preparado da conexão (conn.prepared), reaproveitado entre chamadas
+    @contextmanager
+    def _connection(self):
+
+        if self.db is not None:
+            yield self.db.conn
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+
     #  Executa uma consulta SELECT.
     def query(self, sql, params=None):
-        
+
         try:
-            if params:
-                self.db.cursor.execute(sql, params)
-            else:
-                self.db.cursor.execute(sql)
-            return self.db.cursor.fetchall()
+            with self._connection() as conn:
+                cursor = conn.prepared(sql)
+                if params:
+                    cursor.execute(sql, params)
+                else:
+                    cursor.execute(sql)
+                return cursor.fetchall()
+        except Exception as e:
+            print(f" Erro na consulta: {e}")
+            return None
+
+    # Executa uma consulta SELECT e entrega as linhas aos poucos (fetchmany), com memória constante.
+    # A conexão fica emprestada até o gerador terminar ou ser fechado.
+    # Erros do banco são exibidos e relançados durante a iteração (nunca um resultado truncado).
+    def iter_query(self, sql, params=None, arraysize=None):
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = arraysize or self.ARRAYSIZE
+                try:
+                    if params:
+                        cursor.execute(sql, params)
+                    else:
+                        cursor.execute(sql)
+                    while True:
+                        linhas = cursor.fetchmany(cursor.arraysize)
+                        if not linhas:
+                            break
+                        yield from linhas
+                finally:
+                    cursor.close()
         except Exception as e:
             print(f" Erro na consulta: {e}")
+            raise
+
+    # Consulta paginada por chave (keyset): cada página é uma consulta "key > última chave",
+    # sem OFFSET e sem manter a conexão entre as páginas. Gera listas de tuplas sem a coluna da chave.
+    def iter_pages(self, table, columns, key, where=None, params=(), page_size=None):
+
+        page_size = page_size or self.PAGE_SIZE
+        primeira = SQLScripts.select_page(table, columns, key, where, after_key=False)
+        seguintes = SQLScripts.select_page(table, columns, key, where, after_key=True)
+        ultima_chave = None
+
+        while True:
+            if ultima_chave is None:
+                linhas = self.query(primeira, (page_size, *params))
+            else:
+                linhas = self.query(seguintes, (page_size, ultima_chave, *params))
+            if not linhas:
+                return
+
+            ultima_chave = linhas[-1][0]
+            yield [tuple(linha)[1:] for linha in linhas]
+
+            if len(linhas) < page_size:
+                return
+
+    # Estatísticas da biblioteca do jogador calculadas no servidor em uma única consulta:
+    # total de jogos, horas jogadas, taxa de conclusão e contagens por tipo, plataforma e ano.
+    def library_stats(self, jogador_id):
+
+        with self._stats_lock:
+            cached = self._stats_cache.get(jogador_id)
+            if cached is not None:
+                if cached[1] > time.monotonic():
+                    self._stats_cache.move_to_end(jogador_id)
+                    return cached[0]
+                del self._stats_cache[jogador_id]
+
+        linhas = self.query(SQLScripts.library_stats(), (jogador_id,))
+        if linhas is None:
+            return None
+
+        stats = self.parse_library_stats(linhas)
+        with self._stats_lock:
+            self._stats_cache[jogador_id] = (stats, time.monotonic() + self.stats_ttl)
+            self._stats_cache.move_to_end(jogador_id)
+            if len(self._stats_cache) > self.STATS_CACHE_SIZE:
+                self._stats_cache.popitem(last=False)
+        return stats
+
+    # Descarta as estatísticas em cache de um jogador (ou de todos) após mudanças nos jogos
+    def invalidate_stats(self, jogador_id=None):
+
+        with self._stats_lock:
+            if jogador_id is None:
+                self._stats_cache.clear()
+            else:
+                self._stats_cache.pop(jogador_id, None)
+
+    # Converte as linhas do GROUPING SETS em um dicionário de estatísticas
+    @staticmethod
+    def parse_library_stats(linhas):
+
+        stats = {
+            "total_jogos": 0, "horas_jogadas": 0.0, "concluidos": 0, "taxa_conclusao": 0.0,
+            "por_tipo": {}, "por_plataforma": {}, "por_ano": {},
+        }
+
+        for g_tipo, g_plataforma, g_ano, tipo, plataforma, ano, jogos, minutos, concluidos in linhas:
+            if g_tipo and g_plataforma and g_ano:
+                stats["total_jogos"] = jogos
+                stats["horas_jogadas"] = round((minutos or 0) / 60, 1)
+                stats["concluidos"] = concluidos or 0
+                stats["taxa_conclusao"] = (concluidos or 0) / jogos if jogos else 0.0
+            elif not g_tipo:
+                stats["por_tipo"][tipo] = jogos
+            elif not g_plataforma:
+                stats["por_plataforma"][plataforma] = jogos
+            else:
+                stats["por_ano"][ano] = jogos
+
+        stats["por_tipo"] = dict(sorted(stats["por_tipo"].items(), key=lambda item: -item[1]))
+        stats["por_plataforma"] = dict(sorted(stats["por_plataforma"].items(), key=lambda item: -item[1]))
+        stats["por_ano"] = dict(sorted(stats["por_ano"].items(), key=lambda item: (item[0] is None, item[0] or 0)))
+        return stats
+
+    # Token de sincronização atual (inteiro; MIN_ACTIVE_ROWVERSION do banco).
+    # None se o banco falhar ou se a migração 4 (coluna Versao) ainda não foi aplicada.
+    def sync_token(self):
+
+        linhas = self.query(SQLScripts.sync_token())
+        if not linhas or linhas[0][0] is None:
+            return None
+        return int.from_bytes(linhas[0][0], "big")
+
+    # Mudanças em Jogos desde um token (0 = desde o início), pela coluna Versao (rowversion)
+    # e pela tabela JogosRemovidos: (linhas inseridas/alteradas nas colunas pedidas,
+    # JogoIDs removidos, novo token, completo). Com jogador_id, apenas os jogos desse jogador.
+    # completo=True quando o token é 0 ou anterior à última limpeza de JogosRemovidos: as linhas
+    # são todos os jogos e quem sincroniza deve descartar o que tem (não há lista de removidos).
+    # Retorna None se o banco falhar ou se as migrações 4 e 5 ainda não foram aplicadas.
+    def changes_since(self, token, columns, jogador_id=None):
+
+        limite = self.sync_token()
+        if limite is None:
+            return None
+        minimo = self.query(SQLScripts.select_sync_minimum())
+        if not minimo:
+            return None
+
+        completo = token <= int.from_bytes(minimo[0][0], "big")
+        por_jogador = jogador_id is not None
+        params = ((0 if completo else token).to_bytes(8, "big"), limite.to_bytes(8, "big"))
+        if por_jogador:
+            params += (jogador_id,)
+
+        alterados = self.query(SQLScripts.select_changed_games(columns, por_jogador), params)
+        if alterados is None:
+            return None
+        if completo:
+            return alterados, [], limite, True
+
+        removidos = self.query(SQLScripts.select_removed_games(por_jogador), params)
+        if removidos is None:
             return None
-    
+        return alterados, [linha[0] for linha in removidos], limite, False
+
+    # Apaga de JogosRemovidos as remoções com mais de `dias` dias (retenção da sincronização).
+    # Tokens anteriores passam a receber uma sincronização completa.
+    def purge_removed_games(self, dias):
+
+        return self.delete(SQLScripts.purge_removed_games(), (dias,))
+
     # Insere dados no banco de dados
     def insert(self, sql, values):
-        
+
         try:
-            self.db.cursor.execute(sql, values)
-            self.db.cursor.commit()
-            print(" Dados inseridos com sucesso.")
+            with self._connection() as conn:
+                cursor = conn.prepared(sql)
+                cursor.execute(sql, values)
+                conn.commit()
             return True
         except Exception as e:
             print(f" Erro ao inserir dados: {e}")
             return False
-    
-    # Remove dados do banco de dados
+
+    # Insere um registro e retorna a chave gerada (SQL de SQLScripts.insert_returning)
+    def insert_returning(self, sql, values):
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.prepared(sql)
+                cursor.execute(sql, values)
+                # Esvazia o resultado antes do commit: o cursor preparado é reaproveitado
+                # e um resultado pendente deixaria a conexão ocupada
+                chave = cursor.fetchall()[0][0]
+                while cursor.nextset():
+                    pass
+                conn.commit()
+            return chave
+        except Exception as e:
+            print(f" Erro ao inserir dados: {e}")
+            return None
+
+    # Autentica o jogador pela chave primária e confere o hash da palavra-chave.
+    # Registros ainda em texto puro são convertidos para hash no primeiro login.
+    # Retorna {"JogadorID", "Nome"} ou None.
+    def authenticate(self, jogador_id, senha):
+
+        linhas = self.query(SQLScripts.select_player_credentials(), (jogador_id,))
+        if not linhas:
+            verify_password(senha, _dummy_hash())
+            return None
+
+        _, nome, legado, hash_armazenado = linhas[0]
+
+        if hash_armazenado:
+            if not verify_password(senha, hash_armazenado):
+                return None
+            atualizar = needs_rehash(hash_armazenado)
+        else:
+            if not verify_legacy_password(senha, legado):
+                return None
+            atualizar = True
+
+        if atualizar:
+            self._update(SQLScripts.update_player_password_hash(), (hash_password(senha), jogador_id))
+
+        return {"JogadorID": jogador_id, "Nome": nome}
+
+    # Executa um UPDATE sem mensagens ao usuário
+    def _update(self, sql, params):
+
+        try:
+            with self._connection() as conn:
+                conn.prepared(sql).execute(sql, params)
+                conn.commit()
+        except Exception as e:
+            print(f" Erro ao atualizar dados: {e}")
+
+    # Remove dados do banco de dados; retorna a quantidade de linhas removidas (None se o banco falhar)
     def delete(self, sql, params=None):
-        
+
         try:
-            if params:
-                self.db.cursor.execute(sql, params)
-            else:
-                self.db.cursor.execute(sql)
-            self.db.cursor.commit()
-            print(" Dados removidos com sucesso.")
-            return True
+            with self._connection() as conn:
+                cursor = conn.prepared(sql)
+                if params:
+                    cursor.execute(sql, params)
+                else:
+                    cursor.execute(sql)
+                removidas = cursor.rowcount
+                conn.commit()
+            return removidas
         except Exception as e:
             print(f" Erro na remoção: {e}")
-            return False
-    
-    # Fecha a conexão com o banco de dados
+            return None
+
+    # Devolve a conexão própria (se houver) e fecha o pool recebido no construtor.
+    # O pool compartilhado do processo continua aberto para as demais instâncias.
     def close(self):
-        self.db.close()
\ No newline at end of file
+        if self.db is not None:
+            self.db.close()
+        if self._owns_pool:
+            self.pool.close()
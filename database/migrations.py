@@ -0,0 +1,427 @@
+"""
+Modulo de migracoes versionadas do banco de dados.
+
+A estrutura do banco e criada/atualizada por uma lista ordenada de migracoes.
+A versao aplicada fica registrada na tabela SchemaVersao e em um arquivo de
+marca local, de modo que conexoes normais nao executam DDL nem consultas ao
+catalogo quando o banco ja esta na versao atual.
+"""
+
+import json
+import os
+import threading
+
+
+STAMP_FILE = ".schema_stamp.json"
+
+_checked = set()
+_checked_lock = threading.Lock()
+
+
+def _migration_001(cursor):
+    """
+    Cria as tabelas Jogadores, Jogos e Plataformas e insere as plataformas padrao.
+    Adapta-se a estrutura existente sem causar erros.
+    """
+    # Criar tabela Jogadores se nao existir
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Jogadores' AND xtype='U')
+        CREATE TABLE Jogadores (
+            JogadorID INT IDENTITY(1,1) PRIMARY KEY,
+            Nome NVARCHAR(100) NOT NULL,
+            Idade INT NOT NULL,
+            NickName NVARCHAR(50),
+            Palavra_chave NVARCHAR(50) NOT NULL
+        )
+    """)
+
+    # Criar tabela Jogos se nao existir
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Jogos' AND xtype='U')
+        CREATE TABLE Jogos (
+            JogoID INT IDENTITY(1,1) PRIMARY KEY,
+            Nome NVARCHAR(200) NOT NULL,
+            Data_lancamento DATE NOT NULL,
+            Tempo_jogado NVARCHAR(20),
+            Concluido CHAR(3) NOT NULL,
+            Tipo NVARCHAR(50) NOT NULL,
+            JogadorID INT,
+            PlataformaID INT
+        )
+    """)
+
+    # Verificar se tabela Plataformas existe e sua estrutura
+    cursor.execute("""
+        SELECT COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_NAME = 'Plataformas'
+    """)
+
+    existing_columns = [row[0] for row in cursor.fetchall()]
+
+    if not existing_columns:
+        # Tabela nao existe, criar com estrutura padrao
+        cursor.execute("""
+            CREATE TABLE Plataformas (
+                PlataformaID INT PRIMARY KEY,
+                Nome NVARCHAR(50) NOT NULL,
+                Descricao NVARCHAR(200)
+            )
+        """)
+        existing_columns = ['PlataformaID', 'Nome', 'Descricao']
+        print("  Tabela Plataformas criada com coluna 'Descricao'")
+
+    _insert_default_platforms(cursor, existing_columns)
+
+
+def _insert_default_platforms(cursor, existing_columns):
+    """
+    Insere as plataformas padrao adaptando-se a estrutura existente (Console ou Descricao).
+    """
+    cursor.execute("SELECT COUNT(*) FROM Plataformas")
+    count = cursor.fetchone()[0]
+
+    if count > 0:
+        return
+
+    if 'Console' in existing_columns:
+        column = 'Console'
+        platforms = [
+            (1, 'Playstation 1', 'Sony'),
+            (2, 'Playstation 2', 'Sony'),
+            (3, 'Playstation 3', 'Sony'),
+            (4, 'Playstation 4', 'Sony'),
+            (5, 'Playstation 5', 'Sony'),
+            (6, 'Xbox 360', 'Microsoft'),
+            (7, 'Xbox One', 'Microsoft'),
+            (8, 'Xbox Series X/S', 'Microsoft'),
+            (9, 'PC', 'Computador')
+        ]
+    elif 'Descricao' in existing_columns:
+        column = 'Descricao'
+        platforms = [
+            (1, 'Playstation 1', 'Sony PlayStation 1'),
+            (2, 'Playstation 2', 'Sony PlayStation 2'),
+            (3, 'Playstation 3', 'Sony PlayStation 3'),
+            (4, 'Playstation 4', 'Sony PlayStation 4'),
+            (5, 'Playstation 5', 'Sony PlayStation 5'),
+            (6, 'Xbox 360', 'Microsoft Xbox 360'),
+            (7, 'Xbox One', 'Microsoft Xbox One'),
+            (8, 'Xbox Series X/S', 'Microsoft Xbox Series X/S'),
+            (9, 'PC', 'Computador Pessoal')
+        ]
+    else:
+        print("  Estrutura da tabela Plataformas desconhecida, pulando insercao")
+        return
+
+    cursor.executemany(
+        f"INSERT INTO Plataformas (PlataformaID, Nome, {column}) VALUES (?, ?, ?)",
+        platforms
+    )
+    print(f"  {len(platforms)} plataformas inseridas (estrutura {column})")
+
+
+# Indices nao clusterizados das consultas mais frequentes: (nome, tabela, colunas, colunas incluidas)
+INDEXES = [
+    # Consultas de jogos por jogador (menus de consulta, Gemini, paginacao por JogoID).
+    # A chave clusterizada (JogoID) ja faz parte do indice, entao a paginacao tambem e atendida.
+    ("IX_Jogos_JogadorID", "Jogos", "JogadorID", "Nome, PlataformaID"),
+]
+
+
+def create_index_sql(name, table, columns, include=None):
+    """
+    Monta o comando que cria o indice se ele ainda nao existir.
+    """
+    sql = (
+        f"IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = '{name}' "
+        f"AND object_id = OBJECT_ID('{table}')) "
+        f"CREATE NONCLUSTERED INDEX {name} ON {table} ({columns})"
+    )
+    if include:
+        sql += f" INCLUDE ({include})"
+    return sql
+
+
+def _migration_002(cursor):
+    """
+    Cria o indice das buscas por JogadorID (antes, varreduras completas).
+
+    O indice de Jogadores.Palavra_chave criado aqui ate a versao 5 e
+    removido pela migracao 6.
+    """
+    for name, table, columns, include in INDEXES:
+        cursor.execute(create_index_sql(name, table, columns, include))
+
+
+def _migration_003(cursor):
+    """
+    Adiciona Palavra_chave_hash e converte as palavras-chave em texto puro
+    para hash salgado (PBKDF2), apagando o texto original.
+    """
+    from utils.security import hash_password
+
+    cursor.execute("""
+        IF COL_LENGTH('Jogadores', 'Palavra_chave_hash') IS NULL
+        ALTER TABLE Jogadores ADD Palavra_chave_hash NVARCHAR(200) NULL
+    """)
+
+    cursor.execute("""
+        SELECT JogadorID, Palavra_chave FROM Jogadores
+        WHERE Palavra_chave_hash IS NULL AND Palavra_chave <> ''
+    """)
+    rows = cursor.fetchall()
+
+    if rows:
+        cursor.executemany(
+            "UPDATE Jogadores SET Palavra_chave_hash = ?, Palavra_chave = '' WHERE JogadorID = ?",
+            [(hash_password(password), player_id) for player_id, password in rows]
+        )
+        print(f"  {len(rows)} palavra(s)-chave convertida(s) para hash")
+
+
+def _migration_004(cursor):
+    """
+    Rastreamento de mudancas em Jogos para sincronizacao incremental:
+    coluna Versao (rowversion, muda a cada INSERT/UPDATE), Data_cadastro
+    (que so o setup_database criava) e a tabela JogosRemovidos, preenchida
+    por trigger, com a versao de cada remocao.
+    """
+    cursor.execute("""
+        IF COL_LENGTH('Jogos', 'Data_cadastro') IS NULL
+        ALTER TABLE Jogos ADD Data_cadastro DATETIME NULL DEFAULT GETDATE()
+    """)
+
+    cursor.execute("""
+        IF COL_LENGTH('Jogos', 'Versao') IS NULL
+        ALTER TABLE Jogos ADD Versao ROWVERSION
+    """)
+    cursor.execute(create_index_sql("IX_Jogos_Versao", "Jogos", "Versao", "JogadorID"))
+
+    # Versao tambem e rowversion: remocoes e alteracoes seguem o mesmo contador do banco
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='JogosRemovidos' AND xtype='U')
+        CREATE TABLE JogosRemovidos (
+            JogoID INT NOT NULL,
+            JogadorID INT NULL,
+            Versao ROWVERSION NOT NULL,
+            Data_remocao DATETIME NOT NULL DEFAULT GETDATE()
+        )
+    """)
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_JogosRemovidos_Versao'
+                       AND object_id = OBJECT_ID('JogosRemovidos'))
+        CREATE CLUSTERED INDEX IX_JogosRemovidos_Versao ON JogosRemovidos (Versao)
+    """)
+
+    # CREATE TRIGGER precisa ser o primeiro comando do lote, dai o EXEC
+    cursor.execute("""
+        IF OBJECT_ID('TR_Jogos_Removidos', 'TR') IS NULL
+        EXEC('CREATE TRIGGER TR_Jogos_Removidos ON Jogos AFTER DELETE AS
+              BEGIN
+                  SET NOCOUNT ON;
+                  INSERT INTO JogosRemovidos (JogoID, JogadorID)
+                  SELECT JogoID, JogadorID FROM deleted;
+              END')
+    """)
+
+
+def _migration_005(cursor):
+    """
+    Token minimo de sincronizacao: JogosRemovidos e limpo periodicamente
+    (DatabaseFunctions.purge_removed_games) e tokens anteriores a maior
+    versao apagada exigem uma sincronizacao completa.
+    """
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SincronizacaoJogos' AND xtype='U')
+        CREATE TABLE SincronizacaoJogos (
+            ID INT PRIMARY KEY CHECK (ID = 1),
+            Token_minimo BINARY(8) NOT NULL
+        )
+    """)
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM SincronizacaoJogos)
+        INSERT INTO SincronizacaoJogos (ID, Token_minimo) VALUES (1, 0x0000000000000000)
+    """)
+
+
+def _migration_006(cursor):
+    """
+    Remove IX_Jogadores_Palavra_chave: desde a migracao 3 a coluna fica vazia
+    (o login busca pelo JogadorID e confere Palavra_chave_hash).
+    """
+    # DROP INDEX IF EXISTS so existe a partir do SQL Server 2016
+    cursor.execute("""
+        IF EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Jogadores_Palavra_chave'
+                   AND object_id = OBJECT_ID('Jogadores'))
+        DROP INDEX IX_Jogadores_Palavra_chave ON Jogadores
+    """)
+
+
+# Lista ordenada de migracoes: (versao, descricao, funcao que recebe o cursor)
+MIGRATIONS = [
+    (1, "Estrutura inicial (Jogadores, Jogos, Plataformas)", _migration_001),
+    (2, "Indice de Jogos.JogadorID", _migration_002),
+    (3, "Palavra-chave com hash salgado (Palavra_chave_hash)", _migration_003),
+    (4, "Versao (rowversion) e JogosRemovidos para sincronizacao incremental", _migration_004),
+    (5, "Token minimo de sincronizacao (limpeza de JogosRemovidos)", _migration_005),
+    (6, "Remove o indice de Jogadores.Palavra_chave (coluna vazia apos o hash)", _migration_006),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def apply_migrations(conn):
+    """
+    Aplica as migracoes pendentes e registra cada versao em SchemaVersao.
+
+    Cada migracao roda em sua propria transacao.
+
+    Args:
+        conn: Conexao pyodbc (ou PooledConnection)
+
+    Returns:
+        Versao do esquema apos a execucao
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SchemaVersao' AND xtype='U')
+        CREATE TABLE SchemaVersao (
+            Versao INT PRIMARY KEY,
+            Descricao NVARCHAR(200) NOT NULL,
+            Aplicada_em DATETIME NOT NULL DEFAULT GETDATE()
+        )
+    """)
+    conn.commit()
+
+    cursor.execute("SELECT ISNULL(MAX(Versao), 0) FROM SchemaVersao")
+    current = cursor.fetchone()[0]
+
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+
+        print(f"Aplicando migracao {version}: {description}...")
+        try:
+            migration(cursor)
+            cursor.execute(
+                "INSERT INTO SchemaVersao (Versao, Descricao) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+
+    cursor.close()
+    return current
+
+
+def stamp_key():
+    """
+    Identifica o banco atual (servidor/banco) na marca local.
+    """
+    return f"{os.getenv('DB_SERVER', '')}/{os.getenv('DB_NAME', '')}"
+
+
+def _stamp_path():
+    return os.getenv("DB_SCHEMA_STAMP", STAMP_FILE)
+
+
+def read_stamp(key=None):
+    """
+    Le a versao do esquema registrada localmente para o banco.
+
+    Returns:
+        Versao registrada ou 0 se nao houver marca
+    """
+    try:
+        with open(_stamp_path(), 'r', encoding='utf-8') as f:
+            return int(json.load(f).get(key or stamp_key(), 0))
+    except (IOError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+def write_stamp(version, key=None):
+    """
+    Registra localmente a versao do esquema (escrita atomica).
+    """
+    path = _stamp_path()
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stamps = json.load(f)
+        if not isinstance(stamps, dict):
+            stamps = {}
+    except (IOError, ValueError):
+        stamps = {}
+
+    stamps[key or stamp_key()] = version
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stamps, f, indent=2)
+        os.replace(tmp_path, path)
+    except IOError as e:
+        print(f"Aviso: nao foi possivel gravar a marca do esquema: {e}")
+
+
+def migrate(pool, key=None):
+    """
+    Executa as migracoes explicitamente, ignorando a marca local.
+
+    Args:
+        pool: Pool de conexoes
+        key: Identificador do banco na marca local (opcional)
+
+    Returns:
+        Versao do esquema apos a execucao
+    """
+    key = key or stamp_key()
+
+    with pool.connection() as conn:
+        version = apply_migrations(conn)
+
+    write_stamp(version, key)
+    with _checked_lock:
+        _checked.add(key)
+
+    return version
+
+
+def ensure_schema(pool, key=None):
+    """
+    Garante que o esquema esta na versao atual.
+
+    Quando a marca local ja registra SCHEMA_VERSION nao ha nenhum acesso ao
+    banco; caso contrario as migracoes pendentes sao aplicadas uma vez.
+    Uma falha e informada uma unica vez e nao e tentada de novo a cada
+    conexao do processo; migrate() (setup_database.py --migrate) tenta outra vez.
+
+    Args:
+        pool: Pool de conexoes
+        key: Identificador do banco na marca local (opcional)
+    """
+    key = key or stamp_key()
+
+    with _checked_lock:
+        if key in _checked:
+            return
+
+    if read_stamp(key) >= SCHEMA_VERSION:
+        with _checked_lock:
+            _checked.add(key)
+        return
+
+    try:
+        migrate(pool, key)
+    except Exception as e:
+        with _checked_lock:
+            if key in _checked:
+                return
+            _checked.add(key)
+        print(f"Erro ao aplicar as migracoes do esquema: {e}")
+        print("Continuando com estrutura existente (use setup_database.py --migrate para tentar de novo)...")
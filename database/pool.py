@@ -0,0 +1,370 @@
+"""
+Modulo de pool de conexoes com o banco de dados SQL Server.
+Mantem conexoes pyodbc abertas para reutilizacao entre operacoes,
+evitando o custo do handshake ODBC a cada consulta.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(RuntimeError):
+    """Erro lancado quando nenhuma conexao fica disponivel dentro do tempo limite."""
+
+
+class PoolClosedError(RuntimeError):
+    """Erro lancado ao tentar usar um pool que ja foi fechado."""
+
+
+class PooledConnection:
+    """
+    Conexao pyodbc gerenciada pelo pool.
+
+    Repassa atributos e metodos (cursor, commit, rollback...) para a conexao
+    real e guarda os metadados usados na reciclagem.
+
+    Atributos:
+        raw: Objeto de conexao pyodbc
+        created_at: Instante (monotonic) de criacao da conexao
+        last_used: Instante (monotonic) da ultima devolucao ao pool
+        prepared_hits: Execucoes que reaproveitaram um comando ja preparado
+        prepared_misses: Comandos preparados pela primeira vez nesta conexao
+    """
+
+    # Cursores preparados mantidos por conexao
+    MAX_PREPARED = 32
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.prepared_hits = 0
+        self.prepared_misses = 0
+        self._prepared = OrderedDict()
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def age(self, now=None):
+        """Retorna ha quantos segundos a conexao foi criada."""
+        return (now or time.monotonic()) - self.created_at
+
+    def idle_time(self, now=None):
+        """Retorna ha quantos segundos a conexao esta ociosa."""
+        return (now or time.monotonic()) - self.last_used
+
+    def prepared(self, sql):
+        """
+        Retorna o cursor dedicado a este comando SQL.
+
+        O pyodbc so prepara o comando de novo quando o texto muda no mesmo
+        cursor; com um cursor por comando, execucoes repetidas reaproveitam
+        o handle preparado. Os menos usados sao fechados alem de MAX_PREPARED.
+        """
+        cursor = self._prepared.get(sql)
+        if cursor is not None:
+            self._prepared.move_to_end(sql)
+            self.prepared_hits += 1
+            return cursor
+
+        self.prepared_misses += 1
+        cursor = self.raw.cursor()
+        self._prepared[sql] = cursor
+        if len(self._prepared) > self.MAX_PREPARED:
+            _, oldest = self._prepared.popitem(last=False)
+            _close_quietly(oldest)
+        return cursor
+
+    def close(self):
+        """Fecha os cursores preparados e a conexao real ignorando erros de conexoes ja quebradas."""
+        for cursor in self._prepared.values():
+            _close_quietly(cursor)
+        self._prepared.clear()
+        _close_quietly(self.raw)
+
+
+class ConnectionPool:
+    """
+    Pool de conexoes limitado e seguro para uso entre threads.
+
+    Atributos:
+        max_size: Numero maximo de conexoes abertas ao mesmo tempo
+        timeout: Tempo maximo (s) de espera por uma conexao livre
+        idle_timeout: Conexoes ociosas por mais tempo que isso sao descartadas
+        max_lifetime: Conexoes mais antigas que isso sao recicladas
+        ping_after: Conexoes ociosas por mais tempo que isso sao testadas
+            antes de serem entregues (0 testa em todo checkout)
+    """
+
+    # Intervalo minimo (s) entre as varreduras de ociosas feitas em release()
+    EVICT_INTERVAL = 30.0
+
+    def __init__(self, connect, max_size=5, timeout=30.0, idle_timeout=300.0,
+                 max_lifetime=1800.0, ping_after=5.0):
+        """
+        Inicializa o pool sem abrir conexoes.
+
+        Args:
+            connect: Funcao sem argumentos que abre uma nova conexao pyodbc
+            max_size: Numero maximo de conexoes simultaneas
+            timeout: Tempo maximo de espera em acquire()
+            idle_timeout: Tempo maximo de ociosidade de uma conexao
+            max_lifetime: Tempo maximo de vida de uma conexao
+            ping_after: Ociosidade a partir da qual a conexao e testada
+        """
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior que zero")
+
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+
+        self._idle = deque()
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._next_eviction = 0.0
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "discarded": 0}
+
+    @property
+    def closed(self):
+        """Indica se o pool ja foi fechado."""
+        return self._closed
+
+    @property
+    def size(self):
+        """Numero total de conexoes abertas (ociosas + em uso)."""
+        with self._cond:
+            return len(self._idle) + self._in_use
+
+    def acquire(self, timeout=None):
+        """
+        Retira uma conexao do pool, abrindo uma nova se necessario.
+
+        Args:
+            timeout: Tempo maximo de espera (usa self.timeout se omitido)
+
+        Returns:
+            Instancia de PooledConnection pronta para uso
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            candidate = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Pool de conexoes fechado")
+                    if self._idle:
+                        # LIFO: a conexao usada mais recentemente tem menos chance de ter caido
+                        candidate = self._idle.pop()
+                        break
+                    if self._in_use < self.max_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Nenhuma conexao disponivel apos {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                self._in_use += 1
+
+            if candidate is None:
+                try:
+                    conn = PooledConnection(self._connect())
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self.stats["created"] += 1
+                return conn
+
+            if self._is_usable(candidate):
+                with self._cond:
+                    self.stats["reused"] += 1
+                return candidate
+
+            # Conexao vencida ou quebrada: descarta e tenta novamente
+            candidate.close()
+            self._forget()
+
+    def release(self, conn, discard=False):
+        """
+        Devolve uma conexao ao pool.
+
+        Desfaz qualquer transacao pendente antes de devolver. Conexoes com
+        erro, vencidas ou marcadas com discard=True sao fechadas. A cada
+        EVICT_INTERVAL segundos tambem fecha as ociosas vencidas (evict_idle).
+
+        Args:
+            conn: PooledConnection obtida com acquire()
+            discard: Se True, fecha a conexao em vez de devolve-la
+        """
+        if conn is None:
+            return
+
+        if not discard:
+            try:
+                conn.raw.rollback()
+            except Exception:
+                discard = True
+
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self.evict_idle()
+
+        if not discard and conn.age(now) >= self.max_lifetime:
+            discard = True
+            with self._cond:
+                self.stats["recycled"] += 1
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self.stats["discarded"] += 1
+                close_it = True
+            else:
+                conn.last_used = now
+                self._idle.append(conn)
+                close_it = False
+            self._cond.notify()
+
+        if close_it:
+            conn.close()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager que empresta uma conexao durante o bloco.
+
+        Exemplo:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                ...
+
+        Se o bloco lancar um erro do driver a conexao e descartada.
+        """
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+        except Exception as e:
+            discard = _is_connection_error(e)
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def evict_idle(self):
+        """
+        Fecha as conexoes ociosas que passaram do idle_timeout ou max_lifetime.
+
+        Returns:
+            Numero de conexoes fechadas
+        """
+        now = time.monotonic()
+        expired = []
+
+        with self._cond:
+            self._next_eviction = now + self.EVICT_INTERVAL
+            keep = deque()
+            for conn in self._idle:
+                if conn.idle_time(now) >= self.idle_timeout or conn.age(now) >= self.max_lifetime:
+                    expired.append(conn)
+                else:
+                    keep.append(conn)
+            self._idle = keep
+            self.stats["discarded"] += len(expired)
+            if expired:
+                self._cond.notify(len(expired))
+
+        for conn in expired:
+            conn.close()
+
+        return len(expired)
+
+    def ping(self, conn):
+        """
+        Verifica se a conexao responde com um SELECT 1.
+
+        Returns:
+            True se a conexao estiver funcionando, False caso contrario
+        """
+        try:
+            cursor = conn.raw.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                return cursor.fetchone()[0] == 1
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+
+    def close(self):
+        """
+        Fecha o pool e todas as conexoes ociosas.
+
+        Conexoes em uso sao fechadas quando forem devolvidas.
+        """
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+        for conn in idle:
+            conn.close()
+
+    def _is_usable(self, conn):
+        """Aplica as regras de reciclagem e o health check no checkout."""
+        now = time.monotonic()
+
+        if conn.age(now) >= self.max_lifetime:
+            with self._cond:
+                self.stats["recycled"] += 1
+            return False
+
+        if conn.idle_time(now) >= self.idle_timeout:
+            return False
+
+        if conn.idle_time(now) >= self.ping_after and not self.ping(conn):
+            return False
+
+        return True
+
+    def _forget(self):
+        """Libera a vaga de uma conexao que nao chegou a ser entregue."""
+        with self._cond:
+            self._in_use -= 1
+            self.stats["discarded"] += 1
+            self._cond.notify()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _is_connection_error(error):
+    """
+    Indica se o erro invalida a conexao (falha de comunicacao com o servidor).
+
+    SQLSTATE 08xxx sao erros de conexao; nesses casos a conexao nao volta ao pool.
+    """
+    args = getattr(error, "args", ())
+    return bool(args) and isinstance(args[0], str) and args[0].startswith("08")
+
+
+def _close_quietly(resource):
+    """Fecha um cursor ou conexao ignorando erros."""
+    try:
+        resource.close()
+    except Exception:
+        pass
@@ -4,32 +4,97 @@
 # Scripts SQL para operações no banco de dados.
 
 
+import threading
+
+
+# Registro de comandos: cada formato de SQL (tabela, colunas, condição) é montado uma única vez.
+# Os valores vão sempre como parâmetros (?), então o texto se repete e o SQL Server reaproveita o plano.
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _statement(key, build):
+    sql = _registry.get(key)
+    if sql is None:
+        with _registry_lock:
+            sql = _registry.setdefault(key, build())
+    return sql
+
+
+def _columns_key(columns):
+    return columns if columns == "*" else tuple(columns)
+
+
 # Contém scripts SQL parametrizados
+# As condições (where/conditions) devem usar "?" no lugar dos valores.
 class SQLScripts:
     
+    # Quantidade de formatos de SQL já montados
+    @staticmethod
+    def registered():
+        
+        return len(_registry)
+    
     # Gera script SELECT
     @staticmethod
     def select(table, columns="*", where=None):
         """Gera script SELECT."""
-        columns_str = columns if columns == "*" else ", ".join(columns)
-        sql = f"SELECT {columns_str} FROM {table}"
+        columns = _columns_key(columns)
         
-        if where:
-            sql += f" WHERE {where}"
+        def build():
+            columns_str = columns if columns == "*" else ", ".join(columns)
+            sql = f"SELECT {columns_str} FROM {table}"
+            
+            if where:
+                sql += f" WHERE {where}"
+            
+            return sql
         
-        return sql
+        return _statement(("select", table, columns, where), build)
     
-    # Gera script para consultar jogador por palavra-chave
+    # Gera script SELECT paginado por chave (keyset): TOP (?) linhas com chave maior que a última vista.
+    # A chave vem como primeira coluna; parâmetros: (tamanho da página, [última chave,] *parâmetros do where)
     @staticmethod
-    def select_player_by_password():
+    def select_page(table, columns, key, where=None, after_key=True):
+        
+        columns = _columns_key(columns)
+        
+        def build():
+            columns_str = columns if columns == "*" else ", ".join(columns)
+            sql = f"SELECT TOP (?) {key}, {columns_str} FROM {table}"
+            
+            conditions = []
+            if after_key:
+                conditions.append(f"{key} > ?")
+            if where:
+                conditions.append(f"({where})")
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            
+            return sql + f" ORDER BY {key}"
+        
+        return _statement(("select_page", table, columns, key, where, after_key), build)
     
-        return "SELECT JogadorID, Palavra_chave FROM Jogadores WHERE Palavra_chave = ?"
+    # Gera script com as credenciais de um jogador (busca pela chave primária)
+    @staticmethod
+    def select_player_credentials():
+        
+        return "SELECT JogadorID, Nome, Palavra_chave, Palavra_chave_hash FROM Jogadores WHERE JogadorID = ?"
+    
+    # Gera script para gravar o hash da palavra-chave (apagando o texto puro)
+    @staticmethod
+    def update_player_password_hash():
+        
+        return "UPDATE Jogadores SET Palavra_chave_hash = ?, Palavra_chave = '' WHERE JogadorID = ?"
     
     # Gera script para consultar jogos por jogador
     @staticmethod
     def select_games_by_player():
         
-        return "SELECT * FROM Jogos WHERE JogadorID = ?"
+        return (
+            "SELECT JogoID, Nome, Data_lancamento, Tempo_jogado, Concluido, Tipo, JogadorID, PlataformaID "
+            "FROM Jogos WHERE JogadorID = ?"
+        )
     
     # Gera script INSERT
     @staticmethod
@@ -38,10 +103,30 @@ class SQLScripts:
         if not columns:
             raise ValueError("É necessário informar as colunas para o INSERT")
         
-        columns_str = ", ".join(columns)
-        placeholders = ", ".join(["?"] * len(columns))
+        columns = tuple(columns)
+        
+        def build():
+            columns_str = ", ".join(columns)
+            placeholders = ", ".join(["?"] * len(columns))
+            return f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+        
+        return _statement(("insert", table, columns), build)
+    
+    # Gera script INSERT que retorna a chave gerada (OUTPUT INSERTED)
+    @staticmethod
+    def insert_returning(table, columns, key):
+        
+        if not columns:
+            raise ValueError("É necessário informar as colunas para o INSERT")
+        
+        columns = tuple(columns)
+        
+        def build():
+            columns_str = ", ".join(columns)
+            placeholders = ", ".join(["?"] * len(columns))
+            return f"INSERT INTO {table} ({columns_str}) OUTPUT INSERTED.{key} VALUES ({placeholders})"
         
-        return f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+        return _statement(("insert_returning", table, columns, key), build)
     
     # Gera script DELETE
     @staticmethod
@@ -50,4 +135,108 @@ class SQLScripts:
         if not conditions:
             raise ValueError("É necessário informar as condições para o DELETE")
         
-        return f"DELETE FROM {table} WHERE {conditions}"
\ No newline at end of file
+        return _statement(("delete", table, conditions), lambda: f"DELETE FROM {table} WHERE {conditions}")
+    
+    # Gera script para remover um jogador pelo ID
+    @staticmethod
+    def delete_player():
+        
+        return SQLScripts.delete("Jogadores", "JogadorID = ?")
+    
+    # Gera script para remover um jogo do jogador
+    @staticmethod
+    def delete_game():
+        
+        return SQLScripts.delete("Jogos", "JogoID = ? AND JogadorID = ?")
+    
+    # Gera script com as estatísticas da biblioteca de um jogador em uma única consulta (GROUPING SETS):
+    # total geral, por Tipo, por PlataformaID e por ano de lançamento.
+    # Tempo_jogado ("HH:MM", texto ou TIME) é convertido em minutos no servidor.
+    @staticmethod
+    def library_stats():
+        
+        return """
+            SELECT GROUPING(j.Tipo), GROUPING(j.PlataformaID), GROUPING(a.Ano),
+                   j.Tipo, j.PlataformaID, a.Ano,
+                   COUNT(*),
+                   SUM(m.Minutos),
+                   SUM(CASE WHEN j.Concluido = 'Sim' THEN 1 ELSE 0 END)
+            FROM Jogos AS j
+            CROSS APPLY (SELECT YEAR(j.Data_lancamento) AS Ano) AS a
+            CROSS APPLY (SELECT CAST(j.Tempo_jogado AS NVARCHAR(20)) AS Texto) AS t
+            CROSS APPLY (SELECT CHARINDEX(':', t.Texto) AS Pos) AS p
+            CROSS APPLY (
+                SELECT CASE
+                    WHEN p.Pos > 0 THEN ISNULL(TRY_CAST(LEFT(t.Texto, p.Pos - 1) AS INT), 0) * 60
+                                      + ISNULL(TRY_CAST(SUBSTRING(t.Texto, p.Pos + 1, 2) AS INT), 0)
+                    ELSE ISNULL(TRY_CAST(t.Texto AS INT), 0) * 60
+                END AS Minutos
+            ) AS m
+            WHERE j.JogadorID = ?
+            GROUP BY GROUPING SETS ((), (j.Tipo), (j.PlataformaID), (a.Ano))
+        """
+    
+    # Gera script do token de sincronização: a menor rowversion ainda não confirmada no banco.
+    # Toda linha com Versao abaixo dele já foi confirmada (transações em andamento ficam para a próxima).
+    # NULL quando Jogos ainda não tem a coluna Versao (migração 4 não aplicada).
+    @staticmethod
+    def sync_token():
+
+        return "SELECT CASE WHEN COL_LENGTH('Jogos', 'Versao') IS NULL THEN NULL ELSE MIN_ACTIVE_ROWVERSION() END"
+
+    # Gera script do menor token ainda válido (remoções anteriores já foram apagadas de JogosRemovidos)
+    @staticmethod
+    def select_sync_minimum():
+
+        return "SELECT Token_minimo FROM SincronizacaoJogos WHERE ID = 1"
+
+    # Gera script que apaga as remoções com mais de ? dias e avança o token mínimo até a última apagada
+    @staticmethod
+    def purge_removed_games():
+
+        return """
+            DECLARE @limite BINARY(8) = (
+                SELECT MAX(Versao) FROM JogosRemovidos WHERE Data_remocao < DATEADD(DAY, -?, GETDATE())
+            );
+            IF @limite IS NOT NULL
+            BEGIN
+                DELETE FROM JogosRemovidos WHERE Versao <= @limite;
+                UPDATE SincronizacaoJogos SET Token_minimo = @limite WHERE ID = 1 AND Token_minimo < @limite;
+            END
+        """
+
+    # Gera script com os jogos inseridos/alterados entre dois tokens (Versao >= ? AND Versao < ?)
+    # A chave (JogoID) deve estar em columns; by_player acrescenta "AND JogadorID = ?".
+    @staticmethod
+    def select_changed_games(columns, by_player=False):
+
+        columns = _columns_key(columns)
+
+        def build():
+            sql = f"SELECT {', '.join(columns)} FROM Jogos WHERE Versao >= ? AND Versao < ?"
+            return sql + " AND JogadorID = ?" if by_player else sql
+
+        return _statement(("select_changed_games", columns, by_player), build)
+
+    # Gera script com os JogoIDs removidos entre dois tokens (tabela JogosRemovidos, preenchida por trigger)
+    @staticmethod
+    def select_removed_games(by_player=False):
+
+        sql = "SELECT JogoID FROM JogosRemovidos WHERE Versao >= ? AND Versao < ?"
+        return sql + " AND JogadorID = ?" if by_player else sql
+
+    # Gera script com o uso do cache de planos do banco atual: planos compilados e execuções.
+    # Taxa de acerto = (execuções - planos) / execuções. Requer a permissão VIEW SERVER STATE.
+    @staticmethod
+    def plan_cache_stats():
+        
+        return """
+            SELECT cp.objtype,
+                   COUNT(*) AS planos,
+                   SUM(CAST(cp.usecounts AS BIGINT)) AS execucoes,
+                   SUM(CASE WHEN cp.usecounts = 1 THEN 1 ELSE 0 END) AS planos_uso_unico
+            FROM sys.dm_exec_cached_plans AS cp
+            CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) AS st
+            WHERE st.dbid = DB_ID() AND cp.objtype IN ('Adhoc', 'Prepared')
+            GROUP BY cp.objtype
+        """
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Snapshot colunar da tabela Jogos para relatorios entre todos os jogadores.
+
+As linhas sao lidas em lotes (fetchmany) e guardadas em arrays NumPy:
+JogadorID, PlataformaID, Concluido e Tipo viram categoricos codificados
+por dicionario (codigos inteiros + lista de categorias), Tempo_jogado vira
+minutos inteiros e Data_lancamento vira o ano. Os agrupamentos usam
+np.bincount sobre os codigos, sem objetos Python por linha.
+
+refresh() traz apenas as mudancas desde a ultima leitura (coluna Versao
+e tabela JogosRemovidos, migracao 4), sem reler a tabela inteira.
+"""
+
+from array import array
+from itertools import islice
+
+import numpy as np
+
+from models.records import parse_play_time
+
+from .scripts import SQLScripts
+
+
+# Linhas por lote lido do cursor
+CHUNK_SIZE = 50000
+
+# Valores ausentes nas colunas numericas
+NO_MINUTES = -1
+NO_YEAR = 0
+
+
+class Categorical:
+    """
+    Coluna codificada por dicionario.
+
+    Atributos:
+        codes: Array int32 com o codigo de cada linha
+        categories: Lista com o valor de cada codigo
+    """
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+        self._index = {value: code for code, value in enumerate(categories)}
+
+    def code_of(self, value):
+        """Codigo de um valor, ou None se ele nao aparece na coluna."""
+        return self._index.get(value)
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class _Encoder:
+    """Atribui codigos sequenciais aos valores na ordem em que aparecem."""
+
+    def __init__(self):
+        self.index = {}
+        self.categories = []
+        self.codes = array("i")
+
+    def extend(self, values):
+        # Valores novos do lote recebem codigos; depois cada linha e so uma consulta ao dicionario
+        for value in dict.fromkeys(values):
+            if value not in self.index:
+                self.index[value] = len(self.categories)
+                self.categories.append(value)
+        self.codes.extend(map(self.index.__getitem__, values))
+
+    def build(self):
+        return Categorical(np.frombuffer(self.codes, dtype=np.int32), self.categories)
+
+
+def _to_minutes(value):
+    """Tempo jogado em minutos; NULL ou texto fora do formato viram NO_MINUTES."""
+    if value is None:
+        return NO_MINUTES
+    try:
+        return parse_play_time(value)
+    except ValueError:
+        return NO_MINUTES
+
+
+def _append(column, mask, other):
+    """Linhas de column escolhidas por mask seguidas das de other (codigos de other remapeados)."""
+    categories = list(column.categories)
+    index = dict(column._index)
+    remap = np.empty(len(other.categories), dtype=np.int32)
+    for code, value in enumerate(other.categories):
+        novo = index.get(value)
+        if novo is None:
+            novo = index[value] = len(categories)
+            categories.append(value)
+        remap[code] = novo
+    return Categorical(np.concatenate([column.codes[mask], remap[other.codes]]), categories)
+
+
+class GamesSnapshot:
+    """
+    Copia colunar (somente leitura) da tabela Jogos.
+
+    Atributos:
+        jogo_id: Array int64 com o JogoID de cada linha
+        jogador, plataforma, concluido, tipo: Colunas Categorical
+        minutos: Array int32 com o tempo jogado em minutos (NO_MINUTES se nulo ou invalido)
+        ano: Array int16 com o ano de lancamento (NO_YEAR se nulo)
+        token: Token de sincronizacao da leitura (None se desconhecido)
+    """
+
+    # Ordem das colunas lidas do banco
+    COLUMNS = ("JogoID", "JogadorID", "PlataformaID", "Concluido", "Tipo", "Tempo_jogado", "Data_lancamento")
+
+    def __init__(self, jogo_id, jogador, plataforma, concluido, tipo, minutos, ano, token=None):
+        self.jogo_id = jogo_id
+        self.jogador = jogador
+        self.plataforma = plataforma
+        self.concluido = concluido
+        self.tipo = tipo
+        self.minutos = minutos
+        self.ano = ano
+        self.token = token
+
+    @classmethod
+    def load(cls, db, chunk_size=CHUNK_SIZE):
+        """
+        Le a tabela Jogos inteira em lotes.
+
+        Args:
+            db: DatabaseFunctions (usa iter_query com fetchmany)
+            chunk_size: Linhas por lote
+
+        Returns:
+            GamesSnapshot
+        """
+        # Token lido antes da tabela: o que mudar durante a leitura volta no proximo refresh
+        token = db.sync_token()
+        rows = db.iter_query(SQLScripts.select("Jogos", cls.COLUMNS), arraysize=chunk_size)
+        snapshot = cls.from_rows(rows, chunk_size)
+        snapshot.token = token
+        return snapshot
+
+    def refresh(self, db):
+        """
+        Atualiza o snapshot apenas com as linhas inseridas, alteradas ou
+        removidas desde o token da ultima leitura (DatabaseFunctions.changes_since).
+
+        Sem token (banco sem a migracao 4 quando o snapshot foi lido), tenta
+        ler a tabela inteira de novo. Se o token ficou anterior a limpeza de
+        JogosRemovidos, as linhas recebidas sao a tabela inteira e substituem
+        o snapshot. Se o banco falhar, devolve o proprio snapshot.
+
+        Returns:
+            Novo GamesSnapshot (o atual nao e alterado)
+        """
+        if self.token is None:
+            return self.load(db)
+
+        changes = db.changes_since(self.token, self.COLUMNS)
+        if changes is None:
+            return self
+        rows, removed, token, completo = changes
+        if completo:
+            snapshot = self.from_rows(rows)
+            snapshot.token = token
+            return snapshot
+        return self.apply_changes(rows, removed, token)
+
+    def apply_changes(self, rows, removed_ids, token=None):
+        """
+        Novo snapshot sem as linhas removidas e com as linhas inseridas/alteradas
+        (na ordem de COLUMNS) substituindo as versoes anteriores pelo JogoID.
+        """
+        novos = self.from_rows(rows)
+        descartados = np.concatenate([novos.jogo_id, np.asarray(removed_ids, dtype=np.int64)])
+        mantidos = ~np.isin(self.jogo_id, descartados)
+
+        return GamesSnapshot(
+            np.concatenate([self.jogo_id[mantidos], novos.jogo_id]),
+            _append(self.jogador, mantidos, novos.jogador),
+            _append(self.plataforma, mantidos, novos.plataforma),
+            _append(self.concluido, mantidos, novos.concluido),
+            _append(self.tipo, mantidos, novos.tipo),
+            np.concatenate([self.minutos[mantidos], novos.minutos]),
+            np.concatenate([self.ano[mantidos], novos.ano]),
+            token,
+        )
+
+    @classmethod
+    def from_rows(cls, rows, chunk_size=CHUNK_SIZE):
+        """
+        Monta o snapshot a partir de linhas na ordem de COLUMNS, lote a lote.
+        """
+        jogo_ids = array("q")
+        jogador, plataforma, concluido, tipo = _Encoder(), _Encoder(), _Encoder(), _Encoder()
+
+        # Tempo_jogado e Data_lancamento tem poucos valores distintos: ficam codificados
+        # durante a leitura e cada valor distinto e convertido uma unica vez no final
+        tempo, data = _Encoder(), _Encoder()
+
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            ids, jogadores, plataformas, concluidos, tipos, tempos, datas = zip(*chunk)
+            jogo_ids.extend(ids)
+            jogador.extend(jogadores)
+            plataforma.extend(plataformas)
+            concluido.extend(concluidos)
+            tipo.extend(tipos)
+            tempo.extend(tempos)
+            data.extend(datas)
+
+        minutos = np.array([_to_minutes(valor) for valor in tempo.categories], dtype=np.int32)
+        anos = np.array(
+            [valor.year if valor is not None else NO_YEAR for valor in data.categories],
+            dtype=np.int16,
+        )
+
+        return cls(
+            np.frombuffer(jogo_ids, dtype=np.int64),
+            jogador.build(),
+            plataforma.build(),
+            concluido.build(),
+            tipo.build(),
+            minutos[tempo.build().codes],
+            anos[data.build().codes],
+        )
+
+    def __len__(self):
+        return len(self.jogo_id)
+
+    def player_mask(self, jogador_id):
+        """Mascara booleana das linhas de um jogador."""
+        code = self.jogador.code_of(jogador_id)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.jogador.codes == code
+
+    def group_count(self, column, mask=None):
+        """
+        Quantidade de linhas por categoria.
+
+        Args:
+            column: Coluna Categorical usada no agrupamento
+            mask: Mascara booleana opcional (ex.: player_mask)
+
+        Returns:
+            Dicionario {categoria: quantidade} sem as categorias vazias
+        """
+        codes = column.codes if mask is None else column.codes[mask]
+        counts = np.bincount(codes, minlength=len(column.categories))
+        return {column.categories[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def group_sum(self, column, values, mask=None):
+        """
+        Soma de values por categoria (np.bincount com pesos).
+
+        Returns:
+            Dicionario {categoria: soma} sem as categorias vazias
+        """
+        codes = column.codes
+        if mask is not None:
+            codes, values = codes[mask], values[mask]
+        counts = np.bincount(codes, minlength=len(column.categories))
+        sums = np.bincount(codes, weights=values, minlength=len(column.categories))
+        return {column.categories[code]: float(sums[code]) for code in np.flatnonzero(counts)}
+
+    def hours_per_platform(self, jogador_id=None):
+        """Horas jogadas por PlataformaID (de todos ou de um jogador)."""
+        mask = self.player_mask(jogador_id) if jogador_id is not None else None
+        minutos = np.where(self.minutos == NO_MINUTES, 0, self.minutos)
+        return {
+            plataforma: round(total / 60, 1)
+            for plataforma, total in self.group_sum(self.plataforma, minutos, mask).items()
+        }
+
+    def completion_rate_per_genre(self, jogador_id=None):
+        """Fracao de jogos concluidos (Concluido = 'Sim') por Tipo."""
+        mask = self.player_mask(jogador_id) if jogador_id is not None else None
+        sim = self.concluido.code_of("Sim")
+        concluidos = (self.concluido.codes == sim) if sim is not None else np.zeros(len(self), dtype=bool)
+
+        totais = self.group_count(self.tipo, mask)
+        feitos = self.group_sum(self.tipo, concluidos.astype(np.float64), mask)
+        return {tipo: feitos[tipo] / total for tipo, total in totais.items()}
+
+    def games_per_year(self, jogador_id=None):
+        """Quantidade de jogos por ano de lancamento, em ordem de ano."""
+        anos = self.ano if jogador_id is None else self.ano[self.player_mask(jogador_id)]
+        anos = anos[anos != NO_YEAR]
+        if not len(anos):
+            return {}
+        primeiro = int(anos.min())
+        counts = np.bincount(anos - primeiro)
+        return {primeiro + int(offset): int(counts[offset]) for offset in np.flatnonzero(counts)}
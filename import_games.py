@@ -0,0 +1,61 @@
+"""
+Script de importacao em lote de jogos
+Le um arquivo CSV ou JSON Lines e grava os jogos no banco em lotes
+"""
+
+import argparse
+import sys
+
+from database.bulk_import import BulkGameImporter
+from database.connection import close_pool, driver_errors
+from models.jogo import Jogo
+
+
+# Exibe o progresso após cada lote
+def mostrar_progresso(report):
+
+    print(f"   {report.inserted} inseridas, {report.rejected} rejeitadas "
+          f"({report.rows_per_sec:,.0f} linhas/s)", end="\r")
+
+# Função principal.
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Importa jogos em lote a partir de CSV ou JSON Lines.",
+        epilog=f"Colunas esperadas: {', '.join(Jogo.get_columns())}"
+    )
+    parser.add_argument("arquivo", help="Caminho do arquivo .csv ou .jsonl")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="Formato do arquivo (padrão: pela extensão)")
+    parser.add_argument("--jogador", type=int, help="JogadorID aplicado a todas as linhas")
+    parser.add_argument("--lote", type=int, default=1000, help="Linhas por lote (padrão: 1000)")
+    parser.add_argument("--mostrar-rejeitadas", type=int, default=20, metavar="N",
+                        help="Quantidade de rejeições exibidas ao final (padrão: 20)")
+    args = parser.parse_args()
+
+    print(f"\n Importando '{args.arquivo}' em lotes de {args.lote}...")
+
+    try:
+        importer = BulkGameImporter(batch_size=args.lote, jogador_id=args.jogador)
+        report = importer.import_file(args.arquivo, args.formato, progress=mostrar_progresso)
+    except (IOError, ValueError, *driver_errors()) as e:
+        print(f" Erro na importação: {e}")
+        return False
+    finally:
+        close_pool()
+
+    print("\n" + "=" * 60)
+    print(" RESULTADO DA IMPORTAÇÃO")
+    print("=" * 60)
+    print(report.summary())
+
+    if report.rejections and args.mostrar_rejeitadas > 0:
+        print("\n Linhas rejeitadas:")
+        for line, reason in report.rejections[:args.mostrar_rejeitadas]:
+            print(f"   Linha {line}: {reason}")
+        if report.rejected > args.mostrar_rejeitadas:
+            print(f"   ... e mais {report.rejected - args.mostrar_rejeitadas}")
+
+    return report.inserted > 0 or report.read == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,39 +1,30 @@
 # Sistema de Biblioteca de Jogos - Programa Principal
 
 
-from database.functions import DatabaseFunctions
-from database.scripts import SQLScripts
 from models.jogador import Jogador
 from models.jogo import Jogo
+from services.library_service import LibraryService
 from utils.display import DisplayUtils
-from utils.gemini_utils import GeminiDisplay
-from api.gemini_client import GeminiClient, GeminiCache
+from utils.gemini_utils import GeminiDisplay, GameInfoStreamPrinter
 
 
 # Classe principal do sistema.
 class BibliotecaJogos:
     
+    # O menu apenas coleta dados e exibe resultados; as operacoes ficam no LibraryService.
     def __init__(self):
-        self.db = DatabaseFunctions()
+        self.service = LibraryService()
         self.jogador = Jogador()
         self.jogo = Jogo()
         self.usuario_id = None
-        self.senha = None
-        self.gemini_client = None
-        self.gemini_cache = GeminiCache()
-        self._initialize_gemini()
+        # Sessao autenticada (JogadorID e Nome); a palavra-chave nao fica guardada
+        self.sessao = None
     
-    # Inicializa o cliente Gemini AI.
-    def _initialize_gemini(self):
-        try:
-            self.gemini_client = GeminiClient()
-            if self.gemini_client.test_connection():
-                print("Conexao com Gemini AI estabelecida.")
-            else:
-                print("Gemini AI disponivel em modo limitado.")
-        except Exception as e:
-            print(f"Gemini AI nao disponivel: {e}")
-            self.gemini_client = None
+    # Cliente Gemini AI, criado no primeiro uso (nenhuma requisicao e feita na inicializacao).
+    @property
+    def gemini_client(self):
+        
+        return self.service.gemini_client
     
     # Valida o acesso do usuario ao sistema.
     def _validar_usuario(self):
@@ -58,33 +49,36 @@ class BibliotecaJogos:
         print("\n Vamos criar seu primeiro usuario para acesso ao sistema.")
         
         dados = self.jogador.coletar_dados_insercao()
-        if not dados:
-            return False
         
-        sql = SQLScripts.insert("Jogadores", Jogador.get_columns())
+        try:
+            jogador_id = self.service.register_player(dados)
+        except ValueError as e:
+            print(f" {e}")
+            return False
         
-        if self.db.insert(sql, dados):
-            print(" Usuario criado com sucesso! Faca login para continuar.")
+        if jogador_id:
+            print(f" Usuario criado com sucesso! Seu ID de jogador e {jogador_id}. Faca login para continuar.")
             return self._realizar_login()
         return False
     
     # Realiza o login do usuario.
     def _realizar_login(self):
         
-        self.senha = input("\n Informe sua palavra-chave: ").strip()
+        senha = input("\n Informe sua palavra-chave: ").strip()
         
         try:
-            self.usuario_id = int(input(" Informe seu ID de jogador: "))
+            jogador_id = int(input(" Informe seu ID de jogador: "))
         except ValueError:
             print(" ID deve ser um numero.")
             return False
         
-        # Verificar credenciais
-        sql = SQLScripts.select_player_by_password()
-        resultado = self.db.query(sql, (self.senha,))
+        # Verificar credenciais (busca pelo ID e compara o hash da palavra-chave)
+        sessao = self.service.authenticate(jogador_id, senha)
         
-        if resultado and any(self.usuario_id == row[0] for row in resultado):
-            print(" Login realizado com sucesso!")
+        if sessao:
+            self.sessao = sessao
+            self.usuario_id = sessao["JogadorID"]
+            print(f" Login realizado com sucesso! Bem-vindo(a), {sessao['Nome']}.")
             return True
         else:
             print(" ID ou senha incorretos.")
@@ -101,9 +95,10 @@ class BibliotecaJogos:
         print("2. Jogos")
         print("3. Informacoes detalhadas sobre um jogo (Gemini AI)")
         print("4. Comparar jogos")
+        print("5. Estatisticas da sua biblioteca")
         
         try:
-            opcao_tabela = int(input("\nEscolha o que deseja consultar (1-4): "))
+            opcao_tabela = int(input("\nEscolha o que deseja consultar (1-5): "))
             
             if opcao_tabela == 1:
                 self._consultar_jogadores()
@@ -113,6 +108,8 @@ class BibliotecaJogos:
                 self._consultar_info_gemini()
             elif opcao_tabela == 4:
                 self._comparar_jogos()
+            elif opcao_tabela == 5:
+                self._mostrar_estatisticas()
             else:
                 print(" Opcao invalida.")
                 
@@ -130,16 +127,15 @@ class BibliotecaJogos:
             opcao = int(input("Escolha (1-2): "))
             
             if opcao == 1:
-                sql = SQLScripts.select("Jogadores", "*", "Palavra_chave = ?")
-                dados = self.db.query(sql, (self.senha,))
+                colunas = ["JogadorID", "Nome", "Idade", "NickName"]
             elif opcao == 2:
-                sql = SQLScripts.select("Jogadores", ["Nome"], "Palavra_chave = ?")
-                dados = self.db.query(sql, (self.senha,))
+                colunas = ["Nome"]
             else:
                 print(" Opcao invalida.")
                 return
             
-            DisplayUtils.mostrar_resultado_consulta(dados, "Jogadores")
+            paginas = self.service.iter_player_pages(self.usuario_id, colunas)
+            self._exibir_paginas(paginas, "Jogadores")
             
         except ValueError:
             print(" Digite um numero valido.")
@@ -155,24 +151,45 @@ class BibliotecaJogos:
             opcao = int(input("Escolha (1-2): "))
             
             if opcao == 1:
-                sql = SQLScripts.select("Jogos", "*", "JogadorID = ?")
+                # Colunas explicitas: Versao e Data_cadastro nao fazem parte do relatorio
+                colunas = ["JogoID"] + Jogo.get_columns()
             elif opcao == 2:
-                sql = SQLScripts.select("Jogos", ["Nome"], "JogadorID = ?")
+                colunas = ["Nome"]
             else:
                 print(" Opcao invalida.")
                 return
             
-            dados = self.db.query(sql, (self.usuario_id,))
-            DisplayUtils.mostrar_resultado_consulta(dados, "Jogos")
+            paginas = self.service.iter_game_pages(self.usuario_id, colunas)
+            self._exibir_paginas(paginas, "Jogos")
             
         except ValueError:
             print(" Digite um numero valido.")
     
+    # Exibe os resultados pagina a pagina; a proxima pagina so e consultada se o usuario pedir.
+    def _exibir_paginas(self, paginas, tipo):
+        
+        total = 0
+        for numero, pagina in enumerate(paginas, 1):
+            DisplayUtils.mostrar_pagina(pagina, tipo, numero, total + 1)
+            total += len(pagina)
+            
+            if len(pagina) < self.service.page_size:
+                break
+            if input(" Enter para a proxima pagina ou 's' para parar: ").strip().lower() == "s":
+                paginas.close()
+                return
+        
+        if total == 0:
+            print(" Nenhum dado encontrado.")
+        else:
+            print(f" Total de registros: {total}")
+    
     # Consulta informacoes detalhadas sobre um jogo usando Gemini AI.
     def _consultar_info_gemini(self):
         
         if not self.gemini_client:
-            print(" Servico Gemini AI nao esta disponivel no momento.")
+            motivo = self.service.gemini_error
+            print(" Servico Gemini AI nao esta disponivel no momento." + (f" ({motivo})" if motivo else ""))
             return
         
         print("\n" + "*" * 50)
@@ -207,55 +224,44 @@ class BibliotecaJogos:
         
         print(f"\n Buscando informacoes sobre '{game_name}'...")
         
-        # Verificar cache primeiro
-        cached_info = self.gemini_cache.get(game_name, platform)
-        if cached_info:
-            print(" Usando informacoes em cache...")
-            GeminiDisplay.display_game_info(cached_info)
-            return cached_info
+        # Cache primeiro; sem cache, os campos sao exibidos a medida que chegam (streaming)
+        printer = GameInfoStreamPrinter()
+        game_info, do_cache = self.service.game_info(game_name, platform, on_field=printer)
         
-        # Consultar API
-        if self.gemini_client:
-            print(" Consultando Gemini AI...")
-            game_info = self.gemini_client.get_game_info(game_name, platform)
-            
-            # Salvar no cache
-            self.gemini_cache.set(game_name, platform, game_info)
-            
+        if game_info is None:
+            return None
+        
+        if do_cache:
+            print(" Usando informacoes em cache...")
             GeminiDisplay.display_game_info(game_info)
-            
-            # Mostrar recomendacao
-            recomendacao = GeminiDisplay.get_recommendation_based_on_game(game_info)
-            print(f"\n {recomendacao}")
-            
             return game_info
         
-        return None
+        printer.finish(game_info)
+        
+        # Mostrar recomendacao
+        recomendacao = GeminiDisplay.get_recommendation_based_on_game(game_info)
+        print(f"\n {recomendacao}")
+        
+        return game_info
     
     # Obtem informacoes de todos os jogos do usuario.
     def _get_all_games_info_gemini(self):
         
-        # Primeiro, obter lista de jogos do banco
-        sql = SQLScripts.select("Jogos", ["Nome", "PlataformaID"], "JogadorID = ?")
-        jogos = self.db.query(sql, (self.usuario_id,))
+        # Jogos do usuario com o nome da plataforma
+        consultas = self.service.game_titles(self.usuario_id)
         
-        if not jogos:
+        if not consultas:
             print(" Voce nao tem jogos cadastrados.")
             return
         
-        print(f"\n Voce tem {len(jogos)} jogo(s) cadastrado(s):")
+        print(f"\n Voce tem {len(consultas)} jogo(s) cadastrado(s):")
         
-        all_games_info = []
-        for i, (nome_jogo, plataforma_id) in enumerate(jogos, 1):
-            print(f"\n[{i}/{len(jogos)}] Consultando '{nome_jogo}'...")
-            
-            # Mapear ID da plataforma para nome (se disponivel)
-            plataforma = self._get_platform_name(plataforma_id)
-            
-            # Obter informacoes
-            game_info = self._get_game_info_gemini(nome_jogo, plataforma)
-            if game_info:
-                all_games_info.append(game_info)
+        # Cache primeiro; as faltas sao consultadas em paralelo
+        resultados = self.service.enrich(consultas, progress=self._mostrar_progresso_gemini)
+        
+        all_games_info = [game_info for game_info in resultados if game_info]
+        for game_info in all_games_info:
+            GeminiDisplay.display_game_info(game_info)
         
         # Oferecer comparacao se houver multiplos jogos
         if len(all_games_info) > 1:
@@ -263,6 +269,21 @@ class BibliotecaJogos:
             if comparar == "sim":
                 GeminiDisplay.create_comparison_table(all_games_info)
     
+    # Exibe o progresso da consulta de varios jogos.
+    def _mostrar_progresso_gemini(self, concluidos, total, nome_jogo, game_info, do_cache):
+        
+        origem = "cache" if do_cache else "Gemini AI"
+        print(f"[{concluidos}/{total}] '{nome_jogo}' ({origem})")
+    
+    # Exibe as estatisticas da biblioteca do usuario (calculadas no servidor e mantidas em cache).
+    def _mostrar_estatisticas(self):
+        
+        stats = self.service.stats(self.usuario_id)
+        if stats is None:
+            return
+        
+        DisplayUtils.mostrar_estatisticas(stats, self._get_platform_name)
+    
     # Converte ID da plataforma para nome.
     def _get_platform_name(self, platform_id):
         
@@ -281,15 +302,14 @@ class BibliotecaJogos:
         print("*" * 50)
         
         # Obter jogos do usuario
-        sql = SQLScripts.select("Jogos", ["Nome"], "JogadorID = ?")
-        jogos = self.db.query(sql, (self.usuario_id,))
+        jogos = self.service.game_titles(self.usuario_id)
         
         if not jogos:
             print(" Voce nao tem jogos cadastrados para comparar.")
             return
         
         print("\n Seus jogos cadastrados:")
-        for i, (nome_jogo,) in enumerate(jogos, 1):
+        for i, (nome_jogo, _) in enumerate(jogos, 1):
             print(f"{i}. {nome_jogo}")
         
         print(f"\n a. Comparar todos os jogos")
@@ -313,13 +333,11 @@ class BibliotecaJogos:
             
             print(f"\n Comparando {len(jogos_selecionados)} jogos...")
             
-            games_info = []
-            for nome_jogo in jogos_selecionados:
-                game_info = self._get_game_info_gemini(nome_jogo)
-                if game_info:
-                    games_info.append(game_info)
+            games_info = self.service.compare(
+                self.usuario_id, jogos_selecionados, progress=self._mostrar_progresso_gemini
+            )
             
-            if len(games_info) >= 2:
+            if games_info and len(games_info) >= 2:
                 GeminiDisplay.create_comparison_table(games_info)
             else:
                 print(" Nao ha informacoes suficientes para comparar.")
@@ -330,12 +348,16 @@ class BibliotecaJogos:
     # Cadastra um novo jogo.
     def _cadastrar_jogo(self):
         
-        dados = self.jogo.coletar_dados_insercao(self.usuario_id)
-        if not dados:
+        dados = self.jogo.coletar_dados_insercao()
+        
+        try:
+            jogo_id = self.service.add_game(self.usuario_id, dados)
+        except ValueError as e:
+            print(f" {e}")
             return
         
-        sql = SQLScripts.insert("Jogos", Jogo.get_columns())
-        self.db.insert(sql, dados)
+        if jogo_id:
+            print(f" Jogo cadastrado com sucesso! ID do jogo: {jogo_id}.")
     
     # Menu de remocao de dados.
     def _remover_dados(self):
@@ -374,8 +396,7 @@ class BibliotecaJogos:
             confirmacao = input(f" Tem certeza que deseja remover o jogador ID {jogador_id}? (sim/nao): ").lower()
             
             if confirmacao == "sim":
-                sql = SQLScripts.delete("Jogadores", f"JogadorID = {jogador_id}")
-                if self.db.delete(sql):
+                if self.service.remove_player(jogador_id):
                     print(" Jogador removido. Encerrando sessao...")
                     return True  # Indica que o programa deve encerrar
         else:
@@ -392,15 +413,18 @@ class BibliotecaJogos:
             confirmacao = input(f" Tem certeza que deseja remover o jogo ID {jogo_id}? (sim/nao): ").lower()
             
             if confirmacao == "sim":
-                sql = SQLScripts.delete("Jogos", f"JogoID = {jogo_id} AND JogadorID = {self.usuario_id}")
-                self.db.delete(sql)
+                removidos = self.service.remove_game(self.usuario_id, jogo_id)
+                if removidos:
+                    print(" Jogo removido com sucesso.")
+                elif removidos == 0:
+                    print(" Jogo nao encontrado.")
     
     # Limpa o cache do Gemini AI.
     def _limpar_cache_gemini(self):
         
         confirmacao = input(" Tem certeza que deseja limpar o cache do Gemini AI? (sim/nao): ").lower()
         if confirmacao == "sim":
-            self.gemini_cache.clear()
+            self.service.clear_gemini_cache()
             print(" Cache do Gemini AI limpo.")
     
     # Exibe informacoes sobre a IA.
@@ -416,11 +440,25 @@ class BibliotecaJogos:
         print("   * Buscar dados atualizados sobre lancamentos")
         
         if self.gemini_client:
-            print("\n Status: Gemini AI esta ativo e funcionando.")
+            disponivel = self.gemini_client.is_available()
+            if disponivel is None:
+                print("\n Status: verificando conexao com o Gemini AI...")
+            elif disponivel:
+                print("\n Status: Gemini AI esta ativo e funcionando.")
+            else:
+                print("\n Status: Gemini AI nao respondeu na ultima verificacao.")
+            metricas = self.gemini_client.get_metrics()
+            print(f" Requisicoes: {metricas['requests']} | Repetidas: {metricas['retried']} | "
+                  f"Limitadas: {metricas['throttled']} | Bloqueadas: {metricas['short_circuited']} | "
+                  f"Circuito: {metricas['circuit']}")
         else:
             print("\n Status: Gemini AI esta temporariamente indisponivel.")
             print("   Voce ainda pode usar todas as outras funcionalidades.")
         
+        stats = self.service.gemini_cache.stats()
+        print(f"\n Cache: {stats['entries']} entrada(s) em memoria, "
+              f"{stats['hits']} acerto(s), {stats['misses']} falta(s), {stats['evictions']} despejo(s)")
+        
         print("\n A IA consulta diversas fontes para fornecer:")
         print("   * Genero e classificacao")
         print("   * Desenvolvedores e publicadores")
@@ -450,12 +488,22 @@ class BibliotecaJogos:
         print("BEM-VINDO AO SISTEMA DE BIBLIOTECA DE JOGOS")
         print("=" * 30)
         
-        # Validar usuario
-        if not self._validar_usuario():
-            print(" Nao foi possivel autenticar. Encerrando...")
-            return
+        try:
+            # Validar usuario
+            if not self._validar_usuario():
+                print(" Nao foi possivel autenticar. Encerrando...")
+                return
+            
+            self._loop_principal()
+        finally:
+            # Fechar conexoes com o banco e com a API (tambem apos falha no login)
+            self.service.close()
+            from database.connection import close_pool
+            close_pool()
+    
+    # Loop principal do programa.
+    def _loop_principal(self):
         
-        # Loop principal do programa
         while True:
             self._mostrar_menu_principal()
             
@@ -482,9 +530,6 @@ class BibliotecaJogos:
             except KeyboardInterrupt:
                 print("\n\n Programa interrompido pelo usuario.")
                 break
-        
-        # Fechar conexao com o banco
-        self.db.close()
 
 
 if __name__ == "__main__":
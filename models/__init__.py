@@ -5,6 +5,7 @@
 
 from .jogador import Jogador
 from .jogo import Jogo
+from .records import GameRecord
 
 # Exporta as classes.
-__all__ = ['Jogador', 'Jogo']
\ No newline at end of file
+__all__ = ['Jogador', 'Jogo', 'GameRecord']
\ No newline at end of file
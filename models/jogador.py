@@ -1,7 +1,6 @@
 
 # Modelo para dados do jogador.
 
-
 # Representa um jogador no sistema.
 class Jogador:
     
@@ -9,7 +8,8 @@ class Jogador:
     def __init__(self):
         self.dados = {}
     
-    # Coleta dados do jogador.
+    # Coleta dados do jogador via input do usuário.
+    # A validação e o hash da palavra-chave ficam com LibraryService.register_player.
     def coletar_dados_insercao(self):
        
         print("\n" + "="*50)
@@ -17,17 +17,11 @@ class Jogador:
         print("="*50)
         
         self.dados["Nome"] = input("Nome do jogador: ").strip()
-        
-        try:
-            self.dados["Idade"] = int(input("Idade do jogador: "))
-        except ValueError:
-            print(" Idade deve ser um número inteiro.")
-            return None
-        
+        self.dados["Idade"] = input("Idade do jogador: ").strip()
         self.dados["NickName"] = input("NickName do jogador: ").strip()
         self.dados["Palavra_chave"] = input("Palavra chave: ").strip()
         
-        return tuple(self.dados.values())
+        return dict(self.dados)
     
     # Coleta ID do jogador para remoção.
     def coletar_id_remocao(self):
@@ -42,4 +36,32 @@ class Jogador:
     @staticmethod
     def get_columns():
         
-        return ["Nome", "Idade", "NickName", "Palavra_chave"]
\ No newline at end of file
+        return ["Nome", "Idade", "NickName", "Palavra_chave", "Palavra_chave_hash"]
+
+    # Valida e normaliza os dados de cadastro (prompt, API ou scripts).
+    # Retorna ((Nome, Idade, NickName, palavra-chave), None) ou (None, motivo da rejeição).
+    @staticmethod
+    def validar_dados(dados):
+        
+        nome = str(dados.get("Nome") or "").strip()
+        if not nome:
+            return None, "Nome do jogador não pode ser vazio."
+        if len(nome) > 100:
+            return None, "Nome com mais de 100 caracteres"
+        
+        try:
+            idade = int(dados.get("Idade"))
+        except (TypeError, ValueError):
+            return None, "Idade deve ser um número inteiro."
+        if not 0 < idade < 150:
+            return None, f"Idade inválida: {idade}"
+        
+        nickname = str(dados.get("NickName") or "").strip()
+        if len(nickname) > 50:
+            return None, "NickName com mais de 50 caracteres"
+        
+        senha = str(dados.get("Palavra_chave") or "").strip()
+        if not senha:
+            return None, "Palavra chave não pode ser vazia."
+        
+        return (nome, idade, nickname, senha), None
@@ -2,6 +2,9 @@
 # Modelo para dados do jogo.
 
 
+from .records import GameRecord
+
+
 # Representa um jogo no sistema.
 class Jogo:
     
@@ -29,7 +32,8 @@ class Jogo:
             print(f"   {key}. {value}")
     
     # Coleta dados do jogo via input do usuário.
-    def coletar_dados_insercao(self, jogador_id):
+    # A validação (validar_dados) e a gravação ficam com LibraryService.add_game.
+    def coletar_dados_insercao(self):
         
         print("\n" + "="*50)
         print(" CADASTRO DE JOGO")
@@ -40,21 +44,11 @@ class Jogo:
         self.dados["Tempo_jogado"] = input("Tempo jogado (formato 00:00): ").strip()
         self.dados["Concluido"] = input("Concluído (Sim/Não): ").strip()
         self.dados["Tipo"] = input("Tipo (Ação, RPG, etc.): ").strip()
-        self.dados["JogadorID"] = jogador_id
         
         self.mostrar_plataformas()
+        self.dados["PlataformaID"] = input("\nNúmero da plataforma: ").strip()
         
-        try:
-            plataforma_id = int(input("\nNúmero da plataforma: "))
-            if plataforma_id not in self.PLATAFORMAS:
-                print(" Plataforma inválida.")
-                return None
-            self.dados["PlataformaID"] = plataforma_id
-        except ValueError:
-            print(" Plataforma deve ser um número.")
-            return None
-        
-        return tuple(self.dados.values())
+        return dict(self.dados)
     
     # Coleta ID do jogo para remoção.
     def coletar_id_remocao(self):
@@ -72,4 +66,19 @@ class Jogo:
         return [
             "Nome", "Data_lancamento", "Tempo_jogado", 
             "Concluido", "Tipo", "JogadorID", "PlataformaID"
-        ]
\ No newline at end of file
+        ]
+    
+    # Valida e normaliza um registro de jogo (ex.: linha de importação).
+    # Retorna (tupla na ordem de get_columns(), None) ou (None, motivo da rejeição).
+    @classmethod
+    def validar_dados(cls, dados):
+        
+        try:
+            registro = GameRecord.from_dict(dados)
+        except ValueError as e:
+            return None, str(e)
+        
+        if registro.plataforma_id not in cls.PLATAFORMAS:
+            return None, f"Plataforma inválida: {registro.plataforma_id}"
+        
+        return registro.to_params(), None
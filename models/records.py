@@ -0,0 +1,178 @@
+
+# Registros compactos (__slots__) para linhas de Jogos.
+# Sem __dict__ por instância: usados quando muitas linhas ficam em memória (exportações, análises, sincronização).
+
+
+from datetime import date, datetime, time, timedelta
+
+
+# Converte a data de lançamento (date, datetime ou texto AAAA-MM-DD)
+def parse_release_date(value):
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"Data de lançamento inválida: {value!r}")
+
+
+# Converte o tempo jogado em minutos (texto "HH:MM", TIME do banco, timedelta ou minutos)
+def parse_play_time(value):
+
+    if isinstance(value, bool):
+        raise ValueError(f"Tempo jogado inválido (use 00:00): {value!r}")
+    if isinstance(value, int):
+        if value < 0:
+            raise ValueError(f"Tempo jogado inválido (use 00:00): {value!r}")
+        return value
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    if isinstance(value, timedelta):
+        return int(value.total_seconds()) // 60
+
+    texto = str(value).strip()
+    horas, _, minutos = texto.partition(":")
+    if not (horas.isdigit() and minutos.isdigit() and len(minutos) == 2 and int(minutos) < 60):
+        raise ValueError(f"Tempo jogado inválido (use 00:00): {texto!r}")
+    return int(horas) * 60 + int(minutos)
+
+
+# Minutos no formato "HH:MM" usado na coluna Tempo_jogado
+def format_play_time(minutes):
+
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# Converte Concluido ("Sim"/"Não"/"Nao") em bool
+def parse_completed(value):
+
+    if isinstance(value, bool):
+        return value
+    texto = str(value).strip().capitalize()
+    if texto == "Sim":
+        return True
+    if texto in ("Não", "Nao"):
+        return False
+    raise ValueError(f"Concluído deve ser Sim ou Não: {value!r}")
+
+
+# Linha da tabela Jogos
+class GameRecord:
+
+    # Ordem das colunas em from_row (JogoID seguido das colunas de Jogo.get_columns())
+    COLUMNS = (
+        "JogoID", "Nome", "Data_lancamento", "Tempo_jogado",
+        "Concluido", "Tipo", "JogadorID", "PlataformaID",
+    )
+
+    __slots__ = (
+        "jogo_id", "nome", "data_lancamento", "minutos_jogados",
+        "concluido", "tipo", "jogador_id", "plataforma_id", "tempo_original",
+    )
+
+    def __init__(self, jogo_id, nome, data_lancamento, minutos_jogados, concluido, tipo, jogador_id, plataforma_id):
+        self.jogo_id = jogo_id
+        self.nome = nome
+        self.data_lancamento = data_lancamento
+        self.minutos_jogados = minutos_jogados
+        self.concluido = concluido
+        self.tipo = tipo
+        self.jogador_id = jogador_id
+        self.plataforma_id = plataforma_id
+        # Texto de Tempo_jogado que não pôde ser convertido em minutos (linhas antigas do banco)
+        self.tempo_original = None
+
+    # Cria a partir de uma linha do cursor na ordem de COLUMNS.
+    # Os valores do banco são usados como vieram (sem cópia nem validação); só o tempo vira minutos.
+    # Tempos fora do formato (ex.: '', '10h') não geram erro: minutos_jogados fica None e o texto é mantido.
+    @classmethod
+    def from_row(cls, row):
+
+        record = cls.__new__(cls)
+        (record.jogo_id, record.nome, record.data_lancamento, tempo,
+         concluido, record.tipo, record.jogador_id, record.plataforma_id) = row
+        record.minutos_jogados, record.tempo_original = _lenient_play_time(tempo)
+        record.concluido = concluido == "Sim"
+        return record
+
+    # Converte as linhas do cursor sob demanda
+    @classmethod
+    def from_rows(cls, rows):
+
+        return map(cls.from_row, rows)
+
+    # Valida e normaliza um jogo recebido como dicionário de colunas (prompt, API, importação).
+    # Gera ValueError com o motivo da rejeição.
+    @classmethod
+    def from_dict(cls, dados):
+
+        # Textos sem espaços nas pontas antes de validar (Nome="   " é um campo ausente)
+        dados = {col: valor.strip() if isinstance(valor, str) else valor
+                 for col, valor in ((col, dados.get(col)) for col in cls.COLUMNS)}
+        faltando = [col for col in cls.COLUMNS[1:] if dados[col] in (None, "")]
+        if faltando:
+            raise ValueError(f"Campos obrigatórios ausentes: {', '.join(faltando)}")
+
+        nome = str(dados["Nome"])
+        if len(nome) > 200:
+            raise ValueError("Nome com mais de 200 caracteres")
+
+        lancamento = parse_release_date(dados["Data_lancamento"])
+        minutos = parse_play_time(dados["Tempo_jogado"])
+        concluido = parse_completed(dados["Concluido"])
+
+        try:
+            jogador_id = int(dados["JogadorID"])
+            plataforma_id = int(dados["PlataformaID"])
+        except (TypeError, ValueError):
+            raise ValueError("JogadorID e PlataformaID devem ser números")
+
+        tipo = str(dados["Tipo"])
+        if len(tipo) > 50:
+            raise ValueError("Tipo com mais de 50 caracteres")
+
+        return cls(dados["JogoID"], nome, lancamento, minutos, concluido, tipo, jogador_id, plataforma_id)
+
+    # Valores para INSERT na ordem de Jogo.get_columns()
+    def to_params(self):
+
+        return (
+            self.nome, self.data_lancamento, self.tempo_jogado,
+            "Sim" if self.concluido else "Não", self.tipo, self.jogador_id, self.plataforma_id,
+        )
+
+    # Tempo jogado no formato "HH:MM"
+    @property
+    def tempo_jogado(self):
+
+        if self.minutos_jogados is None:
+            return self.tempo_original
+        return format_play_time(self.minutos_jogados)
+
+    # Dicionário com os nomes das colunas (ex.: respostas JSON)
+    def as_dict(self):
+
+        return dict(zip(self.COLUMNS, (self.jogo_id,) + self.to_params()))
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"GameRecord(jogo_id={self.jogo_id!r}, nome={self.nome!r}, jogador_id={self.jogador_id!r})"
+
+
+# Tempo jogado lido do banco: (minutos, None) ou (None, texto original) quando não convertível
+def _lenient_play_time(value):
+
+    if value is None:
+        return None, None
+    try:
+        return parse_play_time(value), None
+    except ValueError:
+        return None, str(value)
+
@@ -0,0 +1,14 @@
+
+# Camada de serviços (regras de negócio sem interface).
+
+from utils.lazy_exports import lazy_exports
+
+# Classes exportadas e o módulo de cada uma; carregadas no primeiro acesso
+_EXPORTS = {
+    'LibraryService': '.library_service',
+}
+
+# Exportando as classes.
+__all__ = ['LibraryService']
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,282 @@
+
+# Regras de negócio da biblioteca, sem input() nem print(): usadas pelo menu (main.py),
+# pelo servidor HTTP (web/) e por scripts de carga. Dados inválidos geram ValueError;
+# falhas do banco retornam None/False, como em DatabaseFunctions.
+
+
+import os
+import threading
+
+from database.scripts import SQLScripts
+from models.jogador import Jogador
+from models.jogo import Jogo
+from models.records import GameRecord
+from utils.security import hash_password
+
+
+PLAYER_COLUMNS = ["JogadorID", "Nome", "Idade", "NickName"]
+
+
+# Operações da biblioteca sobre um DatabaseFunctions e o cache/cliente do Gemini compartilhados
+class LibraryService:
+
+    MAX_PAGE_SIZE = 500
+
+    # Sem db/gemini_cache, cria os objetos padrão; o cliente Gemini é criado no primeiro uso.
+    # use_gemini=False mantém apenas o cache (sem chamadas à API).
+    def __init__(self, db=None, gemini_cache=None, gemini_client=None, use_gemini=True):
+
+        if db is None:
+            from database.functions import DatabaseFunctions
+            db = DatabaseFunctions()
+        if gemini_cache is None:
+            from api.gemini_client import GeminiCache
+            gemini_cache = GeminiCache()
+
+        self.db = db
+        self.gemini_cache = gemini_cache
+        self._gemini_client = gemini_client
+        self._gemini_indisponivel = not use_gemini
+        # Motivo da falha ao criar o cliente Gemini (exibido por quem chama), ou None
+        self.gemini_error = None
+        self._gemini_lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+
+    # Tamanho das páginas da listagem
+    @property
+    def page_size(self):
+
+        return self.db.PAGE_SIZE
+
+    # Cliente Gemini AI, criado no primeiro uso; None quando indisponível (ex.: sem chave no .env),
+    # com o motivo em gemini_error.
+    # A disponibilidade da API é verificada em segundo plano, sem bloquear.
+    @property
+    def gemini_client(self):
+
+        with self._gemini_lock:
+            if self._gemini_client is None and not self._gemini_indisponivel:
+                try:
+                    from api.gemini_client import GeminiClient
+                    self._gemini_client = GeminiClient()
+                except Exception as e:
+                    self.gemini_error = str(e).strip()
+                    self._gemini_indisponivel = True
+                    return None
+
+        if self._gemini_client is not None:
+            self._gemini_client.check_health_async()
+        return self._gemini_client
+
+    # Disponibilidade do Gemini sem criar o cliente: True, False ou None (ainda não verificada)
+    def gemini_available(self):
+
+        client = self._gemini_client
+        return client.is_available() if client is not None else None
+
+    # Jogadores
+
+    # Cadastra um jogador; retorna o JogadorID gerado (None se o banco falhar)
+    def register_player(self, dados):
+
+        valores, motivo = Jogador.validar_dados(dados)
+        if motivo:
+            raise ValueError(motivo)
+
+        nome, idade, nickname, senha = valores
+        sql = SQLScripts.insert_returning("Jogadores", Jogador.get_columns(), "JogadorID")
+        # Apenas o hash é gravado; a coluna de texto puro fica vazia
+        return self.db.insert_returning(sql, (nome, idade, nickname, "", hash_password(senha)))
+
+    # Autentica pelo JogadorID e palavra-chave; retorna {"JogadorID", "Nome"} ou None
+    def authenticate(self, player_id, senha):
+
+        return self.db.authenticate(player_id, senha)
+
+    # Remove o próprio jogador; retorna a quantidade removida (0 ou 1) ou None se o banco falhar
+    def remove_player(self, player_id):
+
+        removido = self.db.delete(SQLScripts.delete_player(), (player_id,))
+        if removido:
+            self.db.invalidate_stats(player_id)
+        return removido
+
+    # Páginas com os dados do próprio jogador (menus de consulta)
+    def iter_player_pages(self, player_id, columns=PLAYER_COLUMNS):
+
+        return self.db.iter_pages("Jogadores", columns, "JogadorID", "JogadorID = ?", (player_id,))
+
+    # Jogos
+
+    # Valida e cadastra um jogo do jogador; retorna o JogoID gerado (None se o banco falhar)
+    def add_game(self, player_id, game):
+
+        valores, motivo = Jogo.validar_dados(dict(game, JogadorID=player_id))
+        if motivo:
+            raise ValueError(motivo)
+
+        sql = SQLScripts.insert_returning("Jogos", Jogo.get_columns(), "JogoID")
+        jogo_id = self.db.insert_returning(sql, valores)
+        if jogo_id is not None:
+            self.db.invalidate_stats(player_id)
+        return jogo_id
+
+    # Remove um jogo do jogador (jogos de outros jogadores não são afetados).
+    # Retorna a quantidade removida (0 se o jogo não existe ou é de outro jogador) ou None se o banco falhar.
+    def remove_game(self, player_id, game_id):
+
+        removido = self.db.delete(SQLScripts.delete_game(), (game_id, player_id))
+        if removido:
+            self.db.invalidate_stats(player_id)
+        return removido
+
+    # Uma página de jogos por chave: (lista de GameRecord, chave da próxima página ou None).
+    # Retorna None se o banco falhar.
+    def list_games(self, player_id, after=None, limit=None):
+
+        limit = min(limit or self.page_size, self.MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError("O limite deve ser positivo")
+
+        sql = SQLScripts.select_page(
+            "Jogos", GameRecord.COLUMNS[1:], "JogoID", "JogadorID = ?", after_key=after is not None
+        )
+        params = (limit, player_id) if after is None else (limit, after, player_id)
+
+        linhas = self.db.query(sql, params)
+        if linhas is None:
+            return None
+
+        jogos = list(GameRecord.from_rows(linhas))
+        proximo = jogos[-1].jogo_id if len(jogos) == limit else None
+        return jogos, proximo
+
+    # Todos os jogos (ou os de um jogador) como GameRecord, lidos em lotes (exportações, análises).
+    # Se o banco falhar no meio da leitura, o erro é relançado ao iterar.
+    def export_games(self, player_id=None):
+
+        if player_id is None:
+            linhas = self.db.iter_query(SQLScripts.select("Jogos", GameRecord.COLUMNS))
+        else:
+            linhas = self.db.iter_query(SQLScripts.select("Jogos", GameRecord.COLUMNS, "JogadorID = ?"), (player_id,))
+        return GameRecord.from_rows(linhas)
+
+    # Páginas de jogos do jogador (menus de consulta), sem a coluna da chave
+    def iter_game_pages(self, player_id, columns=GameRecord.COLUMNS):
+
+        return self.db.iter_pages("Jogos", columns, "JogoID", "JogadorID = ?", (player_id,))
+
+    # (Nome, nome da plataforma) de cada jogo do jogador; None se o banco falhar
+    def game_titles(self, player_id):
+
+        sql = SQLScripts.select("Jogos", ["Nome", "PlataformaID"], "JogadorID = ?")
+        linhas = self.db.query(sql, (player_id,))
+        if linhas is None:
+            return None
+        return [(nome, Jogo.PLATAFORMAS.get(plataforma)) for nome, plataforma in linhas]
+
+    # Estatísticas da biblioteca (em cache até os jogos do jogador mudarem ou por DB_STATS_TTL segundos)
+    def stats(self, player_id):
+
+        return self.db.library_stats(player_id)
+
+    # Snapshot colunar de todos os jogos (relatórios entre jogadores), lido no primeiro uso.
+    # É uma cópia do momento da leitura: refresh=True aplica só as mudanças desde então.
+    # Retorna None se o banco falhar na primeira leitura.
+    def analytics_snapshot(self, refresh=False):
+
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                from database.snapshot import GamesSnapshot
+                try:
+                    self._snapshot = GamesSnapshot.load(self.db)
+                except Exception:
+                    # O erro já foi exibido por iter_query
+                    return None
+            elif refresh:
+                try:
+                    self._snapshot = self._snapshot.refresh(self.db)
+                except Exception:
+                    # Falha no meio da releitura: mantém o snapshot anterior
+                    pass
+            return self._snapshot
+
+    # Sincronização incremental para caches locais: jogos inseridos/alterados (GameRecord) e
+    # JogoIDs removidos desde o token (0 = tudo), o token da próxima chamada e se a resposta é completa
+    # (token 0 ou expirado: o cache local deve ser substituído pelos jogos recebidos).
+    # Retorna (jogos, removidos, token, completo) ou None se o banco falhar.
+    def game_changes(self, token=0, player_id=None):
+
+        # Tokens são rowversions do SQL Server (8 bytes)
+        if not 0 <= token < 2 ** 64:
+            raise ValueError("Token de sincronização inválido")
+
+        mudancas = self.db.changes_since(token, GameRecord.COLUMNS, player_id)
+        if mudancas is None:
+            return None
+        linhas, removidos, proximo, completo = mudancas
+        return list(GameRecord.from_rows(linhas)), removidos, proximo, completo
+
+    # Apaga o histórico de remoções mais antigo que SYNC_RETENTION_DAYS (padrão 30) dias.
+    # Caches com token anterior recebem uma sincronização completa.
+    def purge_sync_history(self, days=None):
+
+        days = days if days is not None else int(os.getenv("SYNC_RETENTION_DAYS", "30"))
+        return self.db.purge_removed_games(days)
+
+    # Gemini AI
+
+    # Informações de um jogo: cache primeiro, depois a API (on_field recebe os campos em streaming).
+    # Retorna (informações, veio do cache) ou (None, False) sem cache e sem API.
+    def game_info(self, name, platform=None, on_field=None):
+
+        cached_info = self.gemini_cache.get(name, platform)
+        if cached_info:
+            return cached_info, True
+
+        client = self.gemini_client
+        if client is None:
+            return None, False
+
+        if on_field is not None:
+            game_info = client.stream_game_info(name, platform, on_field=on_field)
+        else:
+            game_info = client.get_game_info(name, platform)
+        self.gemini_cache.set(name, platform, game_info)
+        return game_info, False
+
+    # Informações de vários jogos (nomes ou pares (nome, plataforma)), na ordem recebida.
+    # Acertos vêm do cache; as faltas são consultadas em paralelo/lotes. Sem API, faltas ficam None.
+    def enrich(self, games, progress=None):
+
+        consultas = [(game, None) if isinstance(game, str) else tuple(game) for game in games]
+
+        client = self.gemini_client
+        if client is not None:
+            return client.get_games_info_many(consultas, cache=self.gemini_cache, progress=progress)
+        return [self.gemini_cache.get(name, platform) for name, platform in consultas]
+
+    # Informações para comparar jogos: os nomes informados ou, sem nomes, todos os jogos do jogador
+    def compare(self, player_id, names=None, progress=None):
+
+        consultas = self.game_titles(player_id) if names is None else list(names)
+        if consultas is None:
+            return None
+        if len(consultas) < 2:
+            raise ValueError("Selecione pelo menos 2 jogos para comparar.")
+
+        return [game_info for game_info in self.enrich(consultas, progress) if game_info]
+
+    # Limpa o cache do Gemini AI
+    def clear_gemini_cache(self):
+
+        self.gemini_cache.clear()
+
+    # Fecha o cliente Gemini, o cache e as conexões
+    def close(self):
+
+        if self._gemini_client is not None:
+            self._gemini_client.close()
+        self.gemini_cache.close()
+        self.db.close()
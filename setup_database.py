@@ -9,6 +9,9 @@ import sys
 import pyodbc
 from dotenv import load_dotenv
 
+from database.connection import get_plan_cache_stats
+from database.migrations import INDEXES, apply_migrations, create_index_sql, write_stamp, SCHEMA_VERSION
+
 # Estabelece conexão com o SQL Server
 def get_database_connection(server=None, database=None, username=None, password=None):
    
@@ -81,6 +84,7 @@ def create_tables(conn, db_name):
                 Idade INT NOT NULL,
                 NickName NVARCHAR(50) NOT NULL,
                 Palavra_chave NVARCHAR(50) NOT NULL,
+                Palavra_chave_hash NVARCHAR(200) NULL,
                 Data_cadastro DATETIME DEFAULT GETDATE()
             )
             """,
@@ -131,6 +135,9 @@ def create_tables(conn, db_name):
             """
         ]
         
+        # Índices das consultas por jogador
+        sql_commands += [create_index_sql(*index) for index in INDEXES]
+        
         cursor = conn.cursor()
         print("Criando tabelas...")
         
@@ -140,11 +147,18 @@ def create_tables(conn, db_name):
                 if i <= 3:  # Apenas para as criações de tabela
                     table_names = ['Jogadores', 'Jogos', 'Plataformas']
                     print(f"   Tabela '{table_names[i-1]}' verificada/criada")
+                elif i > 4:  # Índices
+                    print(f"   Índice '{INDEXES[i-5][0]}' verificado/criado")
             except Exception as e:
                 print(f"    Erro no comando {i}: {e}")
         
         conn.commit()
         
+        # Registrar a versao do esquema para que o sistema nao repita a verificacao
+        version = apply_migrations(conn)
+        write_stamp(version)
+        print(f"   Esquema na versao {version}")
+        
         # Verificar tabelas criadas
         cursor.execute("""
             SELECT TABLE_NAME 
@@ -455,6 +469,15 @@ def check_current_structure():
                 count = cursor.fetchone()[0]
                 print(f"  {table[0]}: {count} registro(s)")
         
+        # Reaproveitamento de planos (SQL parametrizado gera um plano por formato)
+        plan_cache = get_plan_cache_stats(conn)
+        if plan_cache:
+            print(f"\n CACHE DE PLANOS: {plan_cache['planos']} plano(s), "
+                  f"{plan_cache['execucoes']} execução(ões), "
+                  f"taxa de acerto {plan_cache['taxa_acerto']:.1%}")
+            for objtype, item in plan_cache['por_tipo'].items():
+                print(f"  {objtype}: {item['planos']} plano(s), {item['planos_uso_unico']} de uso único")
+        
         conn.close()
         return True
         
@@ -462,6 +485,29 @@ def check_current_structure():
         print(f" Erro ao verificar estrutura: {e}")
         return False
 
+# Aplica as migrações pendentes do esquema.
+def run_migrations():
+    
+    load_dotenv()
+    
+    db_name = os.getenv("DB_NAME", "Biblioteca_jogos")
+    conn = get_database_connection(None, db_name, None, None)
+    
+    if not conn:
+        print(" Não foi possível conectar ao banco de dados.")
+        return False
+    
+    try:
+        version = apply_migrations(conn)
+        write_stamp(version)
+        print(f" Esquema na versão {version} (atual: {SCHEMA_VERSION})")
+        return True
+    except Exception as e:
+        print(f" Erro ao aplicar migrações: {e}")
+        return False
+    finally:
+        conn.close()
+
 # Função principal.
 def main():
     
@@ -473,11 +519,14 @@ def main():
             return automatic_setup()
         elif sys.argv[1] == "--check":
             return check_current_structure()
+        elif sys.argv[1] == "--migrate":
+            return run_migrations()
         elif sys.argv[1] == "--help":
             print("\nUso: python setup_database.py [opção]")
             print("\nOpções:")
             print("  --auto     Configuração automática (usa .env)")
             print("  --check    Verifica estrutura atual")
+            print("  --migrate  Aplica as migracoes pendentes do esquema")
             print("  --help     Mostra esta ajuda")
             print("\nSem argumentos: Modo interativo")
             return True
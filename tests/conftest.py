@@ -0,0 +1,187 @@
+"""
+Fakes compartilhados pelos testes (driver, banco, pool e cache), sem SQL Server nem Gemini
+
+Cada teste ajusta o comportamento especifico com pequenos overrides: um `responder`
+para os comandos que o cursor falso recebe, ou metodos trocados na instancia do banco falso.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.pool import PooledConnection
+
+
+class FakeCursor:
+    """Cursor do driver: registra os comandos e devolve as linhas preenchidas pelo responder"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.arraysize = 1
+        self.rowcount = 1
+        self.rows = []
+        # Resultados seguintes, entregues por nextset()
+        self.sets = []
+        self.closed = False
+
+    def execute(self, sql, params=()):
+        if self.conn.broken:
+            raise RuntimeError("08S01", "conexao perdida")
+        self.conn.executed.append((sql, tuple(params)))
+        self.rows, self.sets = [], []
+        self.conn.responder(self, sql, tuple(params))
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        self.conn.fetches += 1
+        if self.conn.falhar_em is not None and self.conn.fetches > self.conn.falhar_em:
+            raise RuntimeError("08S01", "conexao perdida")
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def nextset(self):
+        if not self.sets:
+            return None
+        self.rows = self.sets.pop(0)
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Conexao do driver; responder(cursor, sql, params) preenche cursor.rows a cada execute"""
+
+    def __init__(self, responder=None, **estado):
+        self.responder = responder or (lambda cursor, sql, params: None)
+        self.executed = []
+        self.cursors = 0
+        self.fetches = 0
+        # Lote a partir do qual fetchmany falha (None = nunca)
+        self.falhar_em = None
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+        self.__dict__.update(estado)
+
+    def cursor(self):
+        self.cursors += 1
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDbConnection:
+    """DatabaseConnection com uma unica conexao falsa e sem pool"""
+
+    def __init__(self, raw):
+        self.conn = PooledConnection(raw)
+        self.pool = None
+
+
+class FakePool:
+    stats = {"created": 1, "reused": 0, "recycled": 0, "discarded": 0}
+    size = 1
+    max_size = 5
+
+
+class FakeDatabase:
+    """DatabaseFunctions falso para a camada de servicos: registra o que recebe"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, linhas=(), token=None):
+        self.pool = FakePool()
+        self.linhas = list(linhas)
+        self.token = token
+        self.mudancas = ([], [], token, False)
+        self.inseridos = []
+        self.invalidados = []
+        self.consultas = []
+
+    def authenticate(self, jogador_id, senha):
+        return None
+
+    def query(self, sql, params=()):
+        return []
+
+    def insert_returning(self, sql, values):
+        self.inseridos.append((sql, values))
+        return len(self.inseridos)
+
+    def delete(self, sql, params):
+        return 0
+
+    def invalidate_stats(self, jogador_id=None):
+        self.invalidados.append(jogador_id)
+
+    def sync_token(self):
+        return self.token
+
+    def iter_query(self, sql, params=None, arraysize=None):
+        self.consultas.append((sql, arraysize))
+        return iter(self.linhas)
+
+    def changes_since(self, token, columns, jogador_id=None):
+        self.consultas.append(("changes_since", token))
+        return self.mudancas
+
+    def close(self):
+        pass
+
+
+class FakeCache:
+    """GeminiCache falso: so devolve as entradas informadas"""
+
+    def __init__(self, dados=None):
+        self.dados = dict(dados or {})
+
+    def get(self, game_name, platform=None):
+        return self.dados.get(game_name)
+
+    def set(self, game_name, platform, game_info):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_connection():
+    """Fabrica de conexoes falsas do driver: fake_connection(responder, **estado)"""
+    return FakeConnection
+
+
+@pytest.fixture
+def fake_db_connection():
+    """Fabrica de DatabaseConnection falsas sobre uma conexao do driver"""
+    return FakeDbConnection
+
+
+@pytest.fixture
+def fake_database():
+    """Fabrica de bancos falsos para a camada de servicos: fake_database(linhas, token)"""
+    return FakeDatabase
+
+
+@pytest.fixture
+def fake_cache():
+    """Fabrica de caches do Gemini falsos: fake_cache({nome: info})"""
+    return FakeCache
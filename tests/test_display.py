@@ -0,0 +1,52 @@
+"""
+Testes da exibicao de resultados de consulta (sem pandas)
+"""
+
+import sys
+import os
+from datetime import date
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.display import DisplayUtils
+
+
+JOGOS = [
+    (1, "Hades", date(2020, 9, 17), "25:30", "Sim", "Roguelike", 1, "PC"),
+    (12, "The Witcher 3", date(2015, 5, 19), "120:00", "Não", "RPG", 1, None),
+]
+
+
+def test_tabela_alinhada():
+    """Numeros alinhados a direita, texto a esquerda, larguras pelo maior valor"""
+    linhas = DisplayUtils.formatar_tabela([(1, "Ana"), (120, "Bernardo")], ["ID", "Nome"]).splitlines()
+
+    assert linhas == [
+        " ID  Nome",
+        "  1  Ana",
+        "120  Bernardo",
+    ]
+
+
+def test_pagina_em_uma_escrita(monkeypatch, capsys):
+    """A pagina inteira e escrita de uma vez, com a numeracao continuando entre paginas"""
+    escritas = []
+    original = sys.stdout.write
+    monkeypatch.setattr(sys.stdout, "write", lambda texto: escritas.append(texto) or original(texto))
+
+    DisplayUtils.mostrar_pagina(JOGOS, "Jogos", pagina=2, inicio=51)
+    saida = capsys.readouterr().out
+
+    assert len(escritas) == 1
+    assert "Hades" in saida and "Witcher" in saida
+    assert "PÁGINA 2" in saida and "Registros 51 a 52" in saida
+
+
+def test_lista_simples_para_colunas_desconhecidas(capsys):
+    """Consultas com outras colunas viram uma lista numerada"""
+    DisplayUtils.mostrar_pagina([("Hades",), ("Celeste",)], "Jogos", pagina=1)
+    saida = capsys.readouterr().out
+
+    assert "  1. Hades" in saida
+    assert "  2. Celeste" in saida
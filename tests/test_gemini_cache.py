@@ -0,0 +1,144 @@
+"""
+Testes do cache do Gemini (backends persistentes)
+"""
+
+import sys
+import os
+import json
+import time
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from api.cache_backends import AppendLogCacheBackend, CacheBackend, SQLiteCacheBackend
+from api.gemini_client import FONTE_INDISPONIVEL, GeminiCache
+from api.memory_cache import LRUCache
+
+
+INFO = {"nome": "The Witcher 3", "genero": "RPG", "fonte": "Google Gemini AI"}
+
+
+@pytest.mark.parametrize("filename", ["cache.db", "cache.jsonl"])
+def test_persiste_entre_instancias(tmp_path, filename):
+    """Entradas gravadas continuam disponiveis ao reabrir o cache"""
+    path = str(tmp_path / filename)
+
+    cache = GeminiCache(path)
+    cache.set("The Witcher 3", "PC", INFO)
+    cache.close()
+
+    cache = GeminiCache(path)
+    assert cache.get("the witcher 3", "pc") == INFO
+    cache.clear()
+    assert cache.get("The Witcher 3", "PC") is None
+    cache.close()
+
+
+def test_sqlite_importa_json_legado(tmp_path):
+    """Um banco novo importa o antigo gemini_cache.json"""
+    legacy = tmp_path / "gemini_cache.json"
+    legacy.write_text(json.dumps({"god of war_any": {"nome": "God of War"}}), encoding="utf-8")
+
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), legacy_json=str(legacy))
+    assert backend.get("god of war_any") == {"nome": "God of War"}
+    assert backend.find_by_title("god of war") == {"nome": "God of War"}
+    assert len(backend) == 1
+    backend.close()
+
+
+def test_log_ignora_linha_incompleta_e_compacta(tmp_path):
+    """O log tolera uma escrita interrompida e e compactado ao crescer"""
+    path = tmp_path / "cache.jsonl"
+    path.write_text('{"k": "a", "v": {"nome": "A"}}\n{"k": "b", "v": {"no', encoding="utf-8")
+
+    backend = AppendLogCacheBackend(str(path), compact_min_lines=10)
+    assert backend.get("a") == {"nome": "A"}
+    assert backend.get("b") is None
+
+    backend.set("c", {"nome": "C"})
+    assert AppendLogCacheBackend(str(path)).get("c") == {"nome": "C"}
+
+    for i in range(20):
+        backend.set("a", {"nome": f"A{i}"})
+    backend.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) < 10
+    assert AppendLogCacheBackend(str(path)).get("a") == {"nome": "A19"}
+
+
+def test_lru_despeja_e_expira():
+    """O LRU respeita o limite de entradas e o TTL de cada entrada"""
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.evictions == 1
+
+    lru.set("d", 4, ttl=0)
+    lru.set("e", 5, ttl=0.0001)
+    time.sleep(0.01)
+    assert lru.get("d") == 4
+    assert lru.get("e") is None
+    assert lru.expirations == 1
+
+
+def test_resposta_padrao_nao_e_persistida(tmp_path):
+    """Respostas de API indisponivel ficam so na memoria, com TTL curto"""
+    path = str(tmp_path / "cache.db")
+    negativa = {"nome": "Hades", "fonte": FONTE_INDISPONIVEL}
+
+    cache = GeminiCache(path, negative_ttl=60)
+    cache.set("Hades", None, negativa)
+    assert cache.get("Hades") == negativa
+    assert len(cache.backend) == 0
+
+    cache.backend.set(GeminiCache.make_key("Doom"), {"nome": "Doom", "fonte": FONTE_INDISPONIVEL})
+    assert cache.get("Doom") is None
+    assert cache.stats()["backend_misses"] == 1
+    cache.close()
+
+
+@pytest.mark.parametrize("filename", ["cache.db", "cache.jsonl"])
+def test_chaves_normalizadas_sem_fallback_de_subtitulo(tmp_path, filename):
+    """Variacoes do mesmo titulo reutilizam a mesma entrada; com/sem subtitulo sao jogos diferentes"""
+    cache = GeminiCache(str(tmp_path / filename))
+    cache.set("The Witcher 3: Wild Hunt", "PC", INFO)
+    cache.memory.clear()
+
+    assert cache.get("the  witcher 3: wild hunt ", "pc") == INFO
+    assert cache.get("The Witcher 3: Wild Hunt") == INFO
+    assert cache.get("The Witcher 3: Wild Hunt", "Playstation 4") == INFO
+    assert cache.get("The Witcher 3") is None
+    cache.close()
+
+    cache = GeminiCache(str(tmp_path / ("outro_" + filename)))
+    cache.set("Pokémon: Red", None, {"nome": "Pokémon Red"})
+    assert cache.get("POKEMON  red") == {"nome": "Pokémon Red"}
+    cache.set("God of War Ragnarök", None, {"nome": "God of War Ragnarök"})
+    cache.set("Batman: Arkham Asylum", None, {"nome": "Batman: Arkham Asylum"})
+    assert cache.get("God of War") is None
+    assert cache.get("Batman") is None
+    assert cache.get("Batman: Arkham City") is None
+    cache.close()
+
+
+def test_backend_precisa_implementar_a_interface():
+    """CacheBackend e abstrato: backends incompletos nao podem ser criados"""
+    class Incompleto(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        CacheBackend()
+    with pytest.raises(TypeError):
+        Incompleto()
@@ -0,0 +1,371 @@
+"""
+Testes do cliente Gemini (sem acesso a rede)
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from api.gemini_client import FONTE_INDISPONIVEL, GeminiClient, extract_json
+from api.resilience import CircuitBreaker, HealthCheck, RetryPolicy, TokenBucket, parse_retry_after
+from api.stream_parser import IncrementalJSONObjectParser
+
+
+def make_client(fetch):
+    client = GeminiClient(api_key="teste")
+    client._fetch_game_info = fetch
+    return client
+
+
+def test_consultas_simultaneas_compartilham_requisicao():
+    """Chamadas concorrentes para o mesmo jogo geram uma unica requisicao"""
+    calls = []
+
+    def fetch(game_name, platform=None):
+        calls.append(game_name)
+        time.sleep(0.1)
+        return {"nome": game_name}
+
+    client = make_client(fetch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda n=name: results.append(client.get_game_info(n)))
+        for name in ["Hades", "hades ", "HADES", "Doom"]
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(calls) == ["Doom", "Hades"]
+    assert len(results) == 4
+    assert client._flight.shared == 2
+    assert client._flight.in_flight() == 0
+
+
+def test_lote_e_streaming_compartilham_consultas_em_andamento():
+    """Lotes e streaming esperam a consulta em andamento do mesmo jogo em vez de repeti-la"""
+    calls = []
+    liberar = threading.Event()
+
+    def fetch(game_name, platform=None):
+        calls.append(game_name)
+        if game_name == "Hades":
+            liberar.wait()
+        return {"nome": game_name}
+
+    client = make_client(fetch)
+    client._stream_game_info = lambda game_name, platform=None, on_field=None: fetch(game_name)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda: results.setdefault("unico", client.get_game_info("Hades"))),
+        threading.Thread(target=lambda: results.setdefault("lote", client._fetch_batch([("hades", None), ("Doom", None)]))),
+        threading.Thread(target=lambda: results.setdefault("stream", client.stream_game_info("HADES"))),
+    ]
+    threads[0].start()
+    while client._flight.in_flight() == 0:
+        time.sleep(0.01)
+    for t in threads[1:]:
+        t.start()
+    while client._flight.shared < 2:
+        time.sleep(0.01)
+    liberar.set()
+    for t in threads:
+        t.join()
+
+    assert sorted(calls) == ["Doom", "Hades"]
+    assert results["lote"] == [{"nome": "Hades"}, {"nome": "Doom"}]
+    assert results["stream"] is results["unico"]
+    assert client._flight.in_flight() == 0
+
+
+def test_erro_e_repassado_a_todos_os_chamadores():
+    """Um erro na requisicao compartilhada chega a todos que esperavam"""
+    started = threading.Event()
+
+    def fetch(game_name, platform=None):
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("falha")
+
+    client = make_client(fetch)
+    errors = []
+
+    def call():
+        try:
+            client.get_game_info("Hades")
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.reason = "Fake"
+        self.headers = headers or {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+    def json(self):
+        return self._payload
+
+    def iter_lines(self, decode_unicode=False):
+        for event in self._payload:
+            yield "data: " + json.dumps(event)
+            yield ""
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def get(self, *args, **kwargs):
+        return self.post(*args, **kwargs)
+
+    def close(self):
+        pass
+
+
+OK_PAYLOAD = {"candidates": [{"content": {"parts": [{"text": '{"nome": "Hades"}'}]}}]}
+
+
+def make_resilient_client(responses, max_attempts=3):
+    client = GeminiClient(api_key="teste")
+    client._session = FakeSession(responses)
+    client.retry_policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.001, max_delay=0.01)
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    return client
+
+
+def test_repete_apos_429_respeitando_retry_after():
+    """Erros 429/5xx sao repetidos; Retry-After define a espera"""
+    client = make_resilient_client([
+        FakeResponse(429, headers={"Retry-After": "0"}),
+        FakeResponse(503),
+        FakeResponse(200, OK_PAYLOAD),
+    ])
+
+    info = client.get_game_info("Hades")
+
+    assert info["nome"] == "Hades"
+    assert client.get_metrics()["retried"] == 2
+    assert client.get_metrics()["circuit"] == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_falha_rapido():
+    """Com a API fora do ar o circuito abre e as chamadas seguintes nem sao enviadas"""
+    client = make_resilient_client([FakeResponse(503), FakeResponse(503)], max_attempts=2)
+
+    assert client.get_game_info("Hades")["fonte"] == FONTE_INDISPONIVEL
+    assert client.get_game_info("Doom")["fonte"] == FONTE_INDISPONIVEL
+
+    metrics = client.get_metrics()
+    assert client._session.calls == 2
+    assert metrics["short_circuited"] == 1
+    assert metrics["circuit"] == CircuitBreaker.OPEN
+
+
+def test_excecao_inesperada_no_teste_reabre_o_circuito(monkeypatch):
+    """Qualquer excecao na chamada de teste conta como falha; meio-aberto sem resultado expira"""
+    client = make_resilient_client([], max_attempts=1)
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+
+    def post(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("corpo truncado")
+
+    monkeypatch.setattr(client._session, "post", post)
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client._post_with_retries("http://teste", b"{}", {})
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert client.get_metrics()["failures"] == 1
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+def test_pool_http_comporta_servidor_e_consultas_paralelas(monkeypatch):
+    """O pool da sessao cobre as threads do servidor HTTP e do fan-out, ou GEMINI_POOL_MAXSIZE"""
+    monkeypatch.setenv("GEMINI_MAX_CONCURRENCY", "4")
+    monkeypatch.setenv("WEB_WORKERS", "16")
+    client = GeminiClient(api_key="teste")
+    assert client._get_session().get_adapter("https://teste")._pool_maxsize == 20
+
+    monkeypatch.setenv("GEMINI_POOL_MAXSIZE", "8")
+    assert GeminiClient(api_key="teste").pool_maxsize == 8
+
+
+def test_chave_recusada_marca_api_indisponivel():
+    """403 nao abre o circuito, mas a saude passa a indicar a API indisponivel"""
+    client = make_resilient_client([FakeResponse(403), FakeResponse(400)])
+
+    with pytest.raises(requests.HTTPError):
+        client._post_with_retries("http://teste", b"{}", {})
+    assert client.health.status is False and client.breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(requests.HTTPError):
+        client._post_with_retries("http://teste", b"{}", {})
+    assert client.health.status is False
+
+    corpo = json.loads(client._build_request("prompt", 1024, None)[0])
+    assert corpo["generationConfig"]["thinkingConfig"] == {"thinkingBudget": 0}
+
+
+def test_token_bucket_e_retry_after():
+    """O token bucket segura rajadas acima da capacidade"""
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("invalido") is None
+
+
+def test_lote_em_uma_requisicao_com_fallback_individual():
+    """Varios jogos vao em um unico prompt; os ausentes sao consultados sozinhos"""
+    lote = [{"indice": 1, "nome": "Doom"}, {"nome": "hades"}]
+    client = make_resilient_client([
+        FakeResponse(200, {"candidates": [{"content": {"parts": [{"text": json.dumps(lote)}]}}]}),
+        FakeResponse(200, OK_PAYLOAD),
+    ])
+
+    results = client.get_games_info_many(["Hades", "Doom", "Celeste"], batch_size=3)
+
+    assert [r["consulta"] for r in results] == ["Hades", "Doom", "Celeste"]
+    assert client._session.calls == 2
+    assert client.get_metrics()["batch_fallbacks"] == 1
+
+
+def test_json_com_chaves_soltas_no_texto():
+    """O JSON e encontrado mesmo com chaves fora dele; resposta sem JSON usa o padrao"""
+    texto = 'Segue {o resultado}: {"nome": "Hades", "descricao": "Use {x}"} Fim }'
+    assert extract_json(texto, dict) == {"nome": "Hades", "descricao": "Use {x}"}
+
+    client = GeminiClient(api_key="teste")
+    sem_json = {"candidates": [{"content": {"parts": [{"text": "sem json"}]}}]}
+    assert client._parse_response(sem_json, "Hades")["fonte"] == FONTE_INDISPONIVEL
+    assert client._parse_response({}, "Hades")["fonte"] == FONTE_INDISPONIVEL
+
+
+def test_parser_incremental_em_pedacos():
+    """Os campos saem assim que completos, qualquer que seja a divisao do texto"""
+    info = {"nome": "Hades {II}", "ano_lancamento": 2020, "metacritic_score": None,
+            "plataformas": ["PC", "Switch"], "tempo_medio_conclusao": 22.5}
+    texto = json.dumps(info, ensure_ascii=False)
+
+    for tamanho in (1, 3, 7, len(texto)):
+        parser = IncrementalJSONObjectParser()
+        campos = []
+        for i in range(0, len(texto), tamanho):
+            campos.extend(parser.feed(texto[i:i + tamanho]))
+        assert campos == list(info.items())
+        assert parser.done
+
+    # Numero so e aceito depois de um delimitador ("20" ainda pode ser "2020")
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"ano_lancamento": 20') == []
+    assert parser.feed('20,') == [("ano_lancamento", 2020)]
+
+
+def test_stream_game_info_entrega_campos_na_ordem():
+    """A resposta em streaming chama o callback por campo e normaliza null para N/A"""
+    completo = {"nome": "Hades", "desenvolvedor": "Supergiant", "publicador": "Supergiant",
+                "ano_lancamento": 2020, "genero": "Roguelike", "metacritic_score": None,
+                "tempo_medio_conclusao": 22.5, "plataformas": ["PC"], "descricao": "Fuga do submundo",
+                "curiosidade": "N/A"}
+    texto = json.dumps(completo)
+    eventos = [
+        {"candidates": [{"content": {"parts": [{"text": texto[i:i + 10]}]}}]}
+        for i in range(0, len(texto), 10)
+    ]
+    client = make_resilient_client([FakeResponse(200, eventos)])
+    recebidos = []
+
+    info = client.stream_game_info("hades", on_field=lambda k, v: recebidos.append((k, v)))
+
+    assert recebidos[0] == ("nome", "Hades") and len(recebidos) == len(completo)
+    assert ("metacritic_score", "N/A") in recebidos and ("plataformas", ["PC"]) in recebidos
+    assert info["consulta"] == "hades"
+    assert info["fonte"] == "Google Gemini AI"
+
+
+def test_stream_cortado_retorna_resposta_padrao():
+    """Um stream interrompido no meio de um campo nao e finalizado como resposta valida"""
+    texto = '{"nome": "Halo", "desenvolvedor": "Bungie", "descricao": "Um jogo de tiro'
+    eventos = [{"candidates": [{"content": {"parts": [{"text": texto}]}}]}]
+    client = make_resilient_client([FakeResponse(200, eventos)])
+    recebidos = []
+
+    info = client.stream_game_info("halo", on_field=lambda k, v: recebidos.append(k))
+
+    assert recebidos == ["nome", "desenvolvedor"]
+    assert info["fonte"] == FONTE_INDISPONIVEL
+
+
+def test_verificacao_de_saude_nao_bloqueia():
+    """A verificacao roda em segundo plano e o estado expira depois do TTL"""
+    liberar = threading.Event()
+
+    def probe():
+        liberar.wait()
+        return True
+
+    health = HealthCheck(probe, ttl=0.05)
+    inicio = time.monotonic()
+    assert health.refresh_async() is True
+    assert health.refresh_async() is False
+    assert time.monotonic() - inicio < 0.05
+    assert health.status is None
+
+    liberar.set()
+    health.wait()
+    assert health.status is True
+    time.sleep(0.06)
+    assert health.status is None
+
+
+def test_saude_atualizada_pelas_consultas():
+    """test_connection usa so os metadados do modelo; consultas reais atualizam o estado"""
+    client = make_resilient_client([FakeResponse(200), FakeResponse(503)], max_attempts=1)
+
+    assert client.test_connection() is True
+    assert client.is_available() is None
+    client.get_game_info("Hades")
+    assert client.is_available() is False
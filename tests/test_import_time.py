@@ -0,0 +1,57 @@
+"""
+Tempo de importacao do programa principal (python -X importtime)
+"""
+
+import sys
+import os
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Dependencias que so devem ser carregadas no primeiro uso
+HEAVY_MODULES = {"pandas", "numpy", "requests", "pyodbc", "dotenv"}
+
+
+def importtime(statement):
+    """Executa o comando em um novo interpretador e retorna {modulo: tempo acumulado em us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    tempos = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        tempos[name.strip()] = int(cumulative)
+    return tempos
+
+
+def test_import_main_nao_carrega_dependencias_pesadas():
+    """Importar main.py nao carrega pandas, requests, pyodbc nem dotenv"""
+    tempos = importtime("import main")
+
+    carregados = {name.split(".")[0] for name in tempos} & HEAVY_MODULES
+    assert not carregados, f"Dependencias carregadas na inicializacao: {sorted(carregados)}"
+
+
+def test_pacotes_carregam_classes_sob_demanda():
+    """Os pacotes exportam as mesmas classes, importando o modulo so no acesso"""
+    importtime(
+        "import sys, api, database, utils\n"
+        "assert 'api.gemini_client' not in sys.modules\n"
+        "from database import ConnectionPool, SQLScripts\n"
+        "from utils import GeminiDisplay\n"
+        "assert 'database.pool' in sys.modules\n"
+        "assert 'database.connection' not in sys.modules\n"
+        "assert ConnectionPool.__module__ == 'database.pool'\n"
+        "assert 'GeminiClient' in dir(api) and 'gemini_client' not in dir(api)\n"
+        "try:\n"
+        "    api.Inexistente\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('atributo inexistente nao levantou AttributeError')\n"
+    )
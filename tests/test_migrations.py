@@ -0,0 +1,49 @@
+"""
+Testes das migracoes do esquema (conexoes falsas, sem SQL Server)
+"""
+
+import sys
+import os
+from contextlib import contextmanager
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import migrations
+
+
+class PoolIndisponivel:
+    """Pool cujo banco recusa as conexoes"""
+
+    def __init__(self):
+        self.tentativas = 0
+
+    @contextmanager
+    def connection(self):
+        self.tentativas += 1
+        raise RuntimeError("08001", "servidor indisponivel")
+        yield
+
+
+def test_falha_nas_migracoes_informada_uma_vez(tmp_path, monkeypatch, capsys):
+    """Uma falha ao migrar nao e repetida a cada nova conexao do processo"""
+    monkeypatch.setenv("DB_SCHEMA_STAMP", str(tmp_path / "stamp.json"))
+    monkeypatch.setattr(migrations, "_checked", set())
+    pool = PoolIndisponivel()
+
+    for _ in range(3):
+        migrations.ensure_schema(pool, key="servidor/banco")
+
+    assert pool.tentativas == 1
+    assert capsys.readouterr().out.count("servidor indisponivel") == 1
+
+
+def test_remocao_do_indice_sem_drop_if_exists(fake_connection):
+    """A migracao 6 confere sys.indexes (DROP INDEX IF EXISTS exige SQL Server 2016)"""
+    conn = fake_connection()
+
+    migrations._migration_006(conn.cursor())
+
+    (sql, _), = conn.executed
+    assert "DROP INDEX IF EXISTS" not in sql
+    assert "sys.indexes" in sql and "DROP INDEX IX_Jogadores_Palavra_chave ON Jogadores" in sql
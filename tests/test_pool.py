@@ -0,0 +1,140 @@
+"""
+Testes do pool de conexoes (usa conexoes falsas, sem SQL Server)
+"""
+
+import sys
+import os
+import threading
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.pool import ConnectionPool, PoolTimeoutError, PoolClosedError
+
+
+# Responde ao health check (SELECT 1) das conexoes falsas
+def responder_ping(cursor, sql, params):
+    cursor.rows = [(1,)]
+
+
+@pytest.fixture
+def make_pool(fake_connection):
+    def make(**kwargs):
+        created = []
+
+        def connect():
+            conn = fake_connection(responder_ping)
+            created.append(conn)
+            return conn
+
+        return ConnectionPool(connect, **kwargs), created
+
+    return make
+
+
+def test_reutiliza_conexao(make_pool):
+    """Uma conexao devolvida e reutilizada no proximo checkout"""
+    pool, created = make_pool()
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert len(created) == 1
+    assert first.raw is second.raw
+    assert pool.stats["reused"] == 1
+    assert created[0].rollbacks == 2
+
+
+def test_limite_de_conexoes(make_pool):
+    """O pool nao abre mais que max_size conexoes"""
+    pool, created = make_pool(max_size=2, timeout=0.05)
+
+    a = pool.acquire()
+    b = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    pool.release(a)
+    c = pool.acquire()
+    assert c.raw is a.raw
+    assert len(created) == 2
+    pool.release(b)
+    pool.release(c)
+
+
+def test_espera_por_conexao_liberada(make_pool):
+    """Uma thread bloqueada recebe a conexao assim que ela e devolvida"""
+    pool, created = make_pool(max_size=1, timeout=2)
+    held = pool.acquire()
+    result = []
+
+    def worker():
+        with pool.connection() as conn:
+            result.append(conn.raw)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    pool.release(held)
+    t.join(2)
+
+    assert result == [held.raw]
+    assert len(created) == 1
+
+
+def test_health_check_descarta_conexao_quebrada(make_pool):
+    """Conexoes que falham no SELECT 1 sao trocadas no checkout"""
+    pool, created = make_pool(ping_after=0)
+
+    with pool.connection():
+        pass
+    created[0].broken = True
+
+    with pool.connection() as conn:
+        assert conn.raw is created[1]
+
+    assert created[0].closed
+
+
+def test_reciclagem_e_ociosidade(make_pool):
+    """Conexoes vencidas sao recicladas e ociosas sao despejadas"""
+    pool, created = make_pool(max_lifetime=0)
+    with pool.connection():
+        pass
+    assert created[0].closed
+    assert pool.stats["recycled"] == 1
+
+    pool, created = make_pool(idle_timeout=0)
+    with pool.connection():
+        pass
+    assert pool.evict_idle() == 1
+    assert created[0].closed
+    assert pool.size == 0
+
+
+def test_release_despeja_ociosas_vencidas(make_pool):
+    """release fecha as ociosas vencidas, no maximo uma vez por EVICT_INTERVAL"""
+    pool, created = make_pool(idle_timeout=0)
+    primeira, segunda = pool.acquire(), pool.acquire()
+    pool.release(primeira)
+    assert not created[0].closed
+
+    pool._next_eviction = 0.0
+    pool.release(segunda)
+    assert created[0].closed and not created[1].closed
+    assert pool.size == 1
+
+
+def test_pool_fechado(make_pool):
+    """Um pool fechado nao entrega conexoes"""
+    pool, created = make_pool()
+    with pool.connection():
+        pass
+    pool.close()
+
+    assert created[0].closed
+    with pytest.raises(PoolClosedError):
+        pool.acquire()
@@ -0,0 +1,234 @@
+"""
+Testes das consultas em streaming e paginadas (conexoes falsas, sem SQL Server)
+"""
+
+import sys
+import os
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import functions
+from database.functions import DatabaseFunctions
+from database.pool import ConnectionPool, PooledConnection
+from database.scripts import SQLScripts
+
+
+# (JogoID, Nome, JogadorID)
+JOGOS = [(i, f"Jogo {i}", 1 if i % 3 else 2) for i in range(1, 26)]
+
+# Linhas do GROUPING SETS: GROUPING(Tipo, PlataformaID, Ano), Tipo, PlataformaID, Ano, jogos, minutos, concluidos
+ESTATISTICAS = [
+    (1, 1, 1, None, None, None, 4, 750, 3),
+    (0, 1, 1, "Acao", None, None, 3, 600, 2),
+    (0, 1, 1, "RPG", None, None, 1, 150, 1),
+    (1, 0, 1, None, 9, None, 1, 150, 1),
+    (1, 0, 1, None, 5, None, 3, 600, 2),
+    (1, 1, 0, None, None, 2020, 2, 300, 1),
+    (1, 1, 0, None, None, 2015, 2, 450, 2),
+]
+
+# Token de sincronizacao (MIN_ACTIVE_ROWVERSION) devolvido pelo banco falso
+TOKEN = 0x7D1
+# Token minimo ainda valido (ultima limpeza de JogosRemovidos)
+MINIMO = 0x8
+
+
+# Emula o SQL Server para os comandos que DatabaseFunctions envia
+def responder(cursor, sql, params):
+    if sql.startswith("SELECT TOP (?)"):
+        # Emula a consulta por chave: TOP (?), [JogoID > ?,] JogadorID = ?
+        params = list(params)
+        top = params.pop(0)
+        after = params.pop(0) if "JogoID > ?" in sql else 0
+        jogador = params.pop(0)
+        linhas = [(j[0], j[1]) for j in JOGOS if j[0] > after and j[2] == jogador]
+        cursor.rows = linhas[:top]
+    elif "GROUPING SETS" in sql:
+        cursor.rows = list(ESTATISTICAS)
+    elif "MIN_ACTIVE_ROWVERSION" in sql:
+        cursor.rows = [(TOKEN.to_bytes(8, "big"),)]
+    elif "FROM SincronizacaoJogos" in sql:
+        cursor.rows = [(MINIMO.to_bytes(8, "big"),)]
+    elif "FROM JogosRemovidos" in sql:
+        cursor.rows = [(26,)]
+    elif "Versao >= ?" in sql:
+        cursor.rows = JOGOS[-2:]
+    elif "OUTPUT INSERTED" in sql:
+        # Chave gerada seguida de um resultado so com contagem (sem SET NOCOUNT ON)
+        cursor.rows, cursor.sets = [(42,)], [[]]
+    else:
+        cursor.rows = list(JOGOS)
+
+
+@pytest.fixture
+def db(fake_connection, fake_db_connection):
+    return DatabaseFunctions(db_connection=fake_db_connection(fake_connection(responder)))
+
+
+def test_iter_query_busca_em_lotes(db):
+    """iter_query entrega todas as linhas buscando arraysize por vez"""
+    linhas = list(db.iter_query("SELECT * FROM Jogos", arraysize=10))
+
+    assert linhas == JOGOS
+    # 3 lotes com dados + 1 vazio que encerra
+    assert db.db.conn.fetches == 4
+
+    # Falha no meio da leitura: o erro chega a quem itera, sem resultado truncado
+    db.db.conn.raw.falhar_em = 5
+    linhas = db.iter_query("SELECT * FROM Jogos", arraysize=10)
+    with pytest.raises(RuntimeError):
+        list(linhas)
+
+
+def test_paginacao_por_chave(db):
+    """Cada pagina continua a partir da ultima chave, sem repetir nem pular linhas"""
+    paginas = list(db.iter_pages("Jogos", ["Nome"], "JogoID", "JogadorID = ?", (1,), page_size=4))
+
+    nomes = [linha[0] for pagina in paginas for linha in pagina]
+    assert nomes == [j[1] for j in JOGOS if j[2] == 1]
+    assert [len(p) for p in paginas] == [4, 4, 4, 4, 1]
+
+    executados = db.db.conn.executed
+    assert executados[0] == (SQLScripts.select_page("Jogos", ["Nome"], "JogoID", "JogadorID = ?", after_key=False), (4, 1))
+    assert executados[1][1] == (4, 5, 1)
+
+
+def test_select_page():
+    """O SQL paginado ordena pela chave e a usa como primeira coluna"""
+    assert SQLScripts.select_page("Jogos", "*", "JogoID", "JogadorID = ?") == (
+        "SELECT TOP (?) JogoID, * FROM Jogos WHERE JogoID > ? AND (JogadorID = ?) ORDER BY JogoID"
+    )
+
+
+def test_registro_monta_cada_formato_uma_vez():
+    """O mesmo formato devolve o mesmo texto, montado uma unica vez"""
+    antes = SQLScripts.registered()
+    primeiro = SQLScripts.select("Jogos", ["Nome", "PlataformaID"], "JogadorID = ?")
+    segundo = SQLScripts.select("Jogos", ("Nome", "PlataformaID"), "JogadorID = ?")
+
+    assert primeiro is segundo
+    assert SQLScripts.registered() == antes + 1
+    assert SQLScripts.delete_game() == "DELETE FROM Jogos WHERE JogoID = ? AND JogadorID = ?"
+
+
+def test_cursor_preparado_reaproveitado_por_conexao(db):
+    """Comandos repetidos usam o mesmo cursor; valores vao so como parametros"""
+    conn = db.db.conn
+
+    for jogo_id in (1, 2, 3):
+        db.delete(SQLScripts.delete_game(), (jogo_id, 1))
+
+    assert conn.cursors == 1
+    assert conn.prepared_hits == 2 and conn.prepared_misses == 1
+    assert {sql for sql, _ in conn.executed} == {SQLScripts.delete_game()}
+
+
+def test_insert_returning_esvazia_o_cursor(db):
+    """A chave gerada e lida e o cursor preparado fica sem resultados pendentes"""
+    sql = SQLScripts.insert_returning("Jogos", ["Nome"], "JogoID")
+
+    assert db.insert_returning(sql, ("Hades",)) == 42
+
+    cursor = db.db.conn.prepared(sql)
+    assert cursor.rows == [] and cursor.sets == []
+
+
+def test_cursores_preparados_limitados(monkeypatch, fake_connection):
+    """Alem do limite, o cursor menos usado e fechado"""
+    monkeypatch.setattr(PooledConnection, "MAX_PREPARED", 2)
+    conn = PooledConnection(fake_connection())
+
+    primeiro = conn.prepared("SELECT 1")
+    conn.prepared("SELECT 2")
+    conn.prepared("SELECT 3")
+
+    assert primeiro.closed
+    assert conn.prepared("SELECT 3") is not primeiro
+    conn.close()
+
+
+def test_estatisticas_da_biblioteca():
+    """As linhas do GROUPING SETS viram totais e contagens por tipo, plataforma e ano"""
+    stats = DatabaseFunctions.parse_library_stats(ESTATISTICAS)
+
+    assert stats["total_jogos"] == 4
+    assert stats["horas_jogadas"] == 12.5
+    assert stats["taxa_conclusao"] == 0.75
+    assert stats["por_tipo"] == {"Acao": 3, "RPG": 1}
+    assert list(stats["por_plataforma"]) == [5, 9]
+    assert list(stats["por_ano"]) == [2015, 2020]
+
+
+def test_estatisticas_em_cache_ate_invalidar(db):
+    """Uma consulta por jogador ate os jogos dele mudarem"""
+    conn = db.db.conn
+
+    primeira = db.library_stats(1)
+    assert db.library_stats(1) is primeira
+    assert len(conn.executed) == 1
+    assert conn.executed[0] == (SQLScripts.library_stats(), (1,))
+
+    db.invalidate_stats(2)
+    db.library_stats(1)
+    assert len(conn.executed) == 1
+
+    db.invalidate_stats(1)
+    db.library_stats(1)
+    assert len(conn.executed) == 2
+
+    # Gravacoes de outros processos: a entrada expira depois de stats_ttl
+    db.stats_ttl = 0
+    db.invalidate_stats()
+    db.library_stats(1)
+    db.library_stats(1)
+    assert len(conn.executed) == 4
+
+
+def test_estatisticas_em_cache_limitadas(monkeypatch, db):
+    """Alem de STATS_CACHE_SIZE jogadores, o menos usado sai do cache"""
+    monkeypatch.setattr(DatabaseFunctions, "STATS_CACHE_SIZE", 2)
+
+    for jogador_id in (1, 2, 1, 3):
+        db.library_stats(jogador_id)
+
+    assert list(db._stats_cache) == [1, 3]
+
+
+def test_mudancas_desde_o_token(db):
+    """changes_since consulta entre o token recebido e o atual e devolve o novo token"""
+    conn = db.db.conn
+
+    alterados, removidos, token, completo = db.changes_since(0x10, ["JogoID", "Nome", "JogadorID"], jogador_id=2)
+
+    assert alterados == JOGOS[-2:] and removidos == [26] and token == TOKEN and not completo
+    intervalo = ((0x10).to_bytes(8, "big"), TOKEN.to_bytes(8, "big"), 2)
+    assert conn.executed[2:] == [
+        (SQLScripts.select_changed_games(["JogoID", "Nome", "JogadorID"], by_player=True), intervalo),
+        (SQLScripts.select_removed_games(by_player=True), intervalo),
+    ]
+
+    # Token anterior a limpeza de JogosRemovidos: todos os jogos, sem lista de removidos
+    conn.executed.clear()
+    alterados, removidos, token, completo = db.changes_since(MINIMO, ["JogoID", "Nome"])
+    assert completo and removidos == [] and token == TOKEN
+    assert conn.executed[-1] == (
+        SQLScripts.select_changed_games(["JogoID", "Nome"]), (bytes(8), TOKEN.to_bytes(8, "big"))
+    )
+    assert SQLScripts.select_changed_games(["JogoID", "Nome"]) == (
+        "SELECT JogoID, Nome FROM Jogos WHERE Versao >= ? AND Versao < ?"
+    )
+
+
+def test_close_fecha_apenas_o_pool_proprio(monkeypatch, fake_connection):
+    """close() nao fecha o pool compartilhado do processo, so o recebido no construtor"""
+    compartilhado, proprio = ConnectionPool(fake_connection), ConnectionPool(fake_connection)
+    monkeypatch.setattr(functions, "get_pool", lambda: compartilhado)
+    monkeypatch.setattr(functions, "ensure_schema", lambda pool: None)
+
+    DatabaseFunctions().close()
+    DatabaseFunctions(pool=proprio).close()
+
+    assert not compartilhado.closed and proprio.closed
@@ -0,0 +1,75 @@
+"""
+Testes dos registros compactos (GameRecord)
+"""
+
+import sys
+import os
+import tracemalloc
+from datetime import date, time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from models.jogo import Jogo
+from models.records import GameRecord, parse_play_time
+
+
+LINHA = (1, "Celeste", date(2018, 1, 25), "10:30", "Sim", "Plataforma", 7, 9)
+
+
+def test_linha_do_cursor_e_dicionario_de_colunas():
+    """from_row usa os valores da linha; as_dict volta aos nomes das colunas"""
+    jogo = GameRecord.from_row(LINHA)
+
+    assert not hasattr(jogo, "__dict__")
+    assert jogo.minutos_jogados == 630 and jogo.concluido is True
+    assert jogo.as_dict() == dict(zip(GameRecord.COLUMNS, LINHA))
+    assert GameRecord.from_row(LINHA[:3] + (time(2, 5), "Nao") + LINHA[5:]).tempo_jogado == "02:05"
+
+
+def test_tempo_antigo_do_banco_nao_gera_erro():
+    """Tempos fora do formato vindos do banco ficam sem minutos, mantendo o texto original"""
+    for tempo in ("", "10", "1:5", "01:30:00", "10h"):
+        jogo = GameRecord.from_row(LINHA[:3] + (tempo,) + LINHA[4:])
+        assert jogo.minutos_jogados is None
+        assert jogo.tempo_jogado == tempo and jogo.as_dict()["Tempo_jogado"] == tempo
+
+    assert GameRecord.from_row(LINHA[:3] + (None,) + LINHA[4:]).tempo_jogado is None
+
+
+def test_validacao_de_data_e_tempo():
+    """Data e tempo jogado invalidos sao rejeitados com o motivo"""
+    dados = dict(zip(GameRecord.COLUMNS[1:], LINHA[1:]), Data_lancamento="2018-01-25", Concluido="nao")
+
+    assert GameRecord.from_dict(dados).to_params() == (
+        "Celeste", date(2018, 1, 25), "10:30", "Não", "Plataforma", 7, 9
+    )
+    assert GameRecord.from_dict(dict(dados, Nome="  Celeste ")).nome == "Celeste"
+    with pytest.raises(ValueError, match="Campos obrigatórios ausentes: Nome"):
+        GameRecord.from_dict(dict(dados, Nome="   "))
+    with pytest.raises(ValueError, match="Data de lançamento"):
+        GameRecord.from_dict(dict(dados, Data_lancamento="2018-02-30"))
+    with pytest.raises(ValueError, match="Tempo jogado"):
+        parse_play_time("10:75")
+
+    assert Jogo.validar_dados(dict(dados, PlataformaID=42)) == (None, "Plataforma inválida: 42")
+
+
+def test_registros_ocupam_menos_memoria_que_dicionarios():
+    """Uma lista de GameRecord ocupa bem menos que a mesma lista em dicionarios"""
+    linhas = [(i, f"Jogo {i}") + LINHA[2:] for i in range(20000)]
+
+    def memoria(construir):
+        tracemalloc.start()
+        dados = construir()
+        atual, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(dados) == len(linhas)
+        return atual
+
+    dicionarios = memoria(lambda: [dict(zip(GameRecord.COLUMNS, linha)) for linha in linhas])
+    registros = memoria(lambda: list(GameRecord.from_rows(linhas)))
+
+    assert registros < dicionarios * 0.6
@@ -0,0 +1,61 @@
+"""
+Testes do hash das palavras-chave e da autenticacao por ID
+"""
+
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.functions import DatabaseFunctions
+from utils.security import hash_password, needs_rehash, verify_legacy_password, verify_password
+
+
+def test_hash_salgado_e_verificacao():
+    """O mesmo texto gera hashes diferentes, e so a palavra-chave certa confere"""
+    primeiro = hash_password("segredo", iterations=1000)
+    segundo = hash_password("segredo", iterations=1000)
+
+    assert primeiro != segundo
+    assert "segredo" not in primeiro
+    assert verify_password("segredo", primeiro)
+    assert not verify_password("Segredo", primeiro)
+    assert not verify_password("segredo", "invalido")
+    assert not verify_password("segredo", None)
+    assert needs_rehash(primeiro)
+    assert not needs_rehash(hash_password("segredo"))
+    assert not verify_legacy_password("", "")
+
+
+# Emula a tabela Jogadores: (JogadorID, Nome, Palavra_chave, Palavra_chave_hash)
+def responder(cursor, sql, params):
+    conn = cursor.conn
+    if sql.startswith("SELECT"):
+        cursor.rows = [row for row in conn.jogadores if row[0] == params[0]]
+    elif sql.startswith("UPDATE"):
+        novo_hash, jogador_id = params
+        conn.jogadores = [
+            (r[0], r[1], "", novo_hash) if r[0] == jogador_id else r for r in conn.jogadores
+        ]
+
+
+def test_login_por_id_converte_senha_legada(fake_connection, fake_db_connection):
+    """O login busca pelo ID; senha em texto puro vira hash no primeiro acesso"""
+    fake = fake_db_connection(fake_connection(responder, jogadores=[
+        (1, "Ana", "", hash_password("abc")),
+        (2, "Bruno", "legada", None),
+    ]))
+    db = DatabaseFunctions(db_connection=fake)
+
+    assert db.authenticate(1, "abc") == {"JogadorID": 1, "Nome": "Ana"}
+    assert db.authenticate(1, "errada") is None
+    assert db.authenticate(3, "abc") is None
+
+    assert db.authenticate(2, "legada") == {"JogadorID": 2, "Nome": "Bruno"}
+    _, _, legado, novo_hash = fake.conn.jogadores[1]
+    assert legado == "" and verify_password("legada", novo_hash)
+    assert db.authenticate(2, "legada") is not None
+
+    # Nenhuma consulta filtra pela palavra-chave
+    assert all("Palavra_chave = ?" not in sql for sql, _ in fake.conn.executed)
@@ -0,0 +1,133 @@
+"""
+Testes da camada de servicos (sem input(), banco e Gemini falsos)
+"""
+
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from services.library_service import LibraryService
+from utils.security import verify_password
+
+
+def falhar_leitura(sql, params=None, arraysize=None):
+    raise RuntimeError("08S01", "conexao perdida")
+    yield
+
+
+def mudancas_do_jogador(token, columns, jogador_id=None):
+    linha = (4, "Celeste", None, "10:30", "Sim", "Plataforma", jogador_id, 9)
+    return [linha], [2], token + 10, token == 0
+
+
+@pytest.fixture
+def db(fake_database):
+    db = fake_database()
+    # (Nome, PlataformaID) dos jogos do jogador; a leitura em lotes falha no meio
+    db.query = lambda sql, params=(): [("Celeste", 9), ("Hades", 9), ("Halo", 6)]
+    db.iter_query = falhar_leitura
+    db.changes_since = mudancas_do_jogador
+    return db
+
+
+@pytest.fixture
+def cache(fake_cache):
+    return fake_cache({"Celeste": {"nome": "Celeste"}})
+
+
+@pytest.fixture
+def service(db, cache):
+    return LibraryService(db=db, gemini_cache=cache, use_gemini=False)
+
+
+def test_cadastro_de_jogo_valida_e_invalida_estatisticas(service):
+    """add_game normaliza os dados, grava para o jogador e descarta as estatisticas dele"""
+
+    jogo_id = service.add_game(3, {
+        "Nome": " Hades ", "Data_lancamento": "2020-09-17", "Tempo_jogado": "25:30",
+        "Concluido": "nao", "Tipo": "Roguelike", "PlataformaID": "9",
+    })
+
+    _, valores = service.db.inseridos[0]
+    assert jogo_id == 1
+    assert valores[0] == "Hades" and valores[3] == "Não" and valores[5:] == (3, 9)
+    assert service.db.invalidados == [3]
+
+    with pytest.raises(ValueError):
+        service.add_game(3, {"Nome": "Sem data"})
+    assert len(service.db.inseridos) == 1
+
+
+def test_cadastro_de_jogador_grava_apenas_o_hash(service):
+    """A palavra-chave nunca e gravada em texto puro"""
+
+    service.register_player({"Nome": "Ana", "Idade": "30", "NickName": "ana", "Palavra_chave": "segredo"})
+
+    _, (nome, idade, nickname, texto, hash_senha) = service.db.inseridos[0]
+    assert (nome, idade, nickname, texto) == ("Ana", 30, "ana", "")
+    assert verify_password("segredo", hash_senha)
+
+    with pytest.raises(ValueError):
+        service.register_player({"Nome": "Ana", "Idade": "trinta", "Palavra_chave": "x"})
+
+
+def test_enriquecimento_sem_api_usa_o_cache(service):
+    """Sem cliente Gemini, enrich devolve o cache e None para as faltas, na ordem pedida"""
+
+    assert service.enrich(["Hades", "Celeste"]) == [None, {"nome": "Celeste"}]
+    assert service.game_info("Celeste") == ({"nome": "Celeste"}, True)
+    assert service.game_info("Hades") == (None, False)
+    assert service.compare(3) == [{"nome": "Celeste"}]
+
+    with pytest.raises(ValueError):
+        service.compare(3, ["Celeste"])
+
+
+def test_sincronizacao_incremental(service):
+    """game_changes converte as linhas alteradas em GameRecord e devolve o proximo token"""
+
+    jogos, removidos, token, completo = service.game_changes(5, player_id=3)
+
+    assert [(jogo.jogo_id, jogo.jogador_id, jogo.minutos_jogados) for jogo in jogos] == [(4, 3, 630)]
+    assert removidos == [2] and token == 15 and not completo
+    assert service.game_changes(0)[3]
+
+    # Tokens sao rowversions de 8 bytes
+    for token in (-1, 2 ** 64):
+        with pytest.raises(ValueError):
+            service.game_changes(token)
+
+
+def test_falha_do_banco_na_leitura_em_lotes(service):
+    """Erros no meio da leitura nao viram resultados truncados"""
+
+    assert service.analytics_snapshot() is None
+    with pytest.raises(RuntimeError):
+        list(service.export_games())
+
+
+def test_falha_ao_atualizar_o_snapshot_mantem_o_anterior(fake_database, cache):
+    """Se a releitura falhar no meio, analytics_snapshot continua com o snapshot anterior"""
+    pytest.importorskip("numpy")
+    db = fake_database([(1, 7, 9, "Sim", "RPG", "10:30", None)])
+    service = LibraryService(db=db, gemini_cache=cache, use_gemini=False)
+    anterior = service.analytics_snapshot()
+
+    db.iter_query = falhar_leitura
+    assert service.analytics_snapshot(refresh=True) is anterior
+    assert len(anterior) == 1
+
+
+def test_falha_ao_criar_cliente_gemini_fica_registrada(monkeypatch, db, cache):
+    """Sem chave da API, o servico nao exibe nada: o motivo fica em gemini_error"""
+    pytest.importorskip("dotenv")
+    monkeypatch.setattr("dotenv.load_dotenv", lambda *args, **kwargs: False)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    service = LibraryService(db=db, gemini_cache=cache)
+
+    assert service.gemini_client is None
+    assert "GEMINI_API_KEY" in service.gemini_error
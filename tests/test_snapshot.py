@@ -0,0 +1,98 @@
+"""
+Testes do snapshot colunar da tabela Jogos
+"""
+
+import sys
+import os
+from collections import Counter
+from datetime import date
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.snapshot import NO_MINUTES, GamesSnapshot
+
+
+LINHAS = [
+    (1, 7, 9, "Sim", "Plataforma", "10:30", date(2018, 1, 25)),
+    (2, 7, 6, "Não", "RPG", "40:00", date(2017, 3, 3)),
+    (3, 8, 9, "Sim", "RPG", "05:15", date(2018, 9, 17)),
+    (4, 8, 9, "Não", "Plataforma", None, None),
+    (5, 9, 1, "Sim", "RPG", "00:45", date(2020, 9, 17)),
+]
+
+
+def test_colunas_codificadas():
+    """Categoricos guardam codigos inteiros; tempo vira minutos e data vira ano"""
+    snapshot = GamesSnapshot.from_rows(LINHAS, chunk_size=2)
+
+    assert len(snapshot) == 5
+    assert snapshot.jogo_id.tolist() == [1, 2, 3, 4, 5]
+    assert snapshot.plataforma.categories == [9, 6, 1]
+    assert snapshot.plataforma.codes.tolist() == [0, 1, 0, 0, 2]
+    assert snapshot.concluido.code_of("Talvez") is None
+    assert snapshot.minutos.tolist() == [630, 2400, 315, NO_MINUTES, 45]
+    assert snapshot.ano.tolist() == [2018, 2017, 2018, 0, 2020]
+
+    # Tempos antigos fora do formato nao impedem a leitura
+    legado = GamesSnapshot.from_rows([LINHAS[0][:5] + ("10h",) + LINHAS[0][6:], LINHAS[1]])
+    assert legado.minutos.tolist() == [NO_MINUTES, 2400]
+
+
+def test_agrupamentos_iguais_aos_calculados_em_python():
+    """Os agrupamentos vetorizados conferem com o calculo linha a linha"""
+    snapshot = GamesSnapshot.from_rows(LINHAS, chunk_size=2)
+
+    assert snapshot.hours_per_platform() == {9: 15.8, 6: 40.0, 1: 0.8}
+    assert snapshot.hours_per_platform(7) == {9: 10.5, 6: 40.0}
+    assert snapshot.completion_rate_per_genre() == {"Plataforma": 0.5, "RPG": 2 / 3}
+    assert snapshot.completion_rate_per_genre(8) == {"RPG": 1.0, "Plataforma": 0.0}
+
+    anos = Counter(linha[6].year for linha in LINHAS if linha[6] is not None)
+    assert snapshot.games_per_year() == dict(sorted(anos.items()))
+    assert snapshot.games_per_year(42) == {}
+
+
+def test_tabela_vazia_e_leitura_do_banco(fake_database):
+    """Sem linhas, os agrupamentos ficam vazios; load le em lotes do tamanho pedido"""
+    vazio = GamesSnapshot.from_rows([])
+    assert len(vazio) == 0
+    assert vazio.hours_per_platform() == {} and vazio.completion_rate_per_genre() == {}
+
+    db = fake_database(LINHAS)
+    snapshot = GamesSnapshot.load(db, chunk_size=1000)
+
+    sql, arraysize = db.consultas[0]
+    assert arraysize == 1000 and "FROM Jogos" in sql
+    assert len(snapshot) == len(LINHAS)
+
+
+def test_refresh_aplica_apenas_as_mudancas(fake_database):
+    """refresh troca as linhas alteradas, acrescenta as novas e tira as removidas, sem reler a tabela"""
+    db = fake_database(LINHAS, token=100)
+    snapshot = GamesSnapshot.load(db)
+    assert snapshot.token == 100
+
+    db.mudancas = (
+        [(3, 8, 9, "Não", "RPG", "05:15", date(2018, 9, 17)), (6, 10, 12, "Sim", "Corrida", "02:00", None)],
+        [1, 99],
+        250,
+        False,
+    )
+    novo = snapshot.refresh(db)
+
+    assert db.consultas[-1] == ("changes_since", 100)
+    assert novo.token == 250 and len(snapshot) == 5
+    assert sorted(novo.jogo_id.tolist()) == [2, 3, 4, 5, 6]
+    assert novo.hours_per_platform() == {9: 5.2, 6: 40.0, 1: 0.8, 12: 2.0}
+    assert novo.completion_rate_per_genre(8) == {"RPG": 0.0, "Plataforma": 0.0}
+    assert novo.games_per_year() == {2017: 1, 2018: 1, 2020: 1}
+
+    # Sem token (banco sem a migracao 4), refresh le a tabela inteira de novo
+    sem_token = GamesSnapshot.load(fake_database(LINHAS))
+    assert sem_token.refresh(db).token == 100 and len(db.consultas) == 3
+
+    # Token anterior a limpeza de JogosRemovidos: as linhas recebidas substituem o snapshot
+    db.mudancas = ([(7, 11, 9, "Sim", "RPG", "01:00", None)], [], 300, True)
+    completo = novo.refresh(db)
+    assert completo.jogo_id.tolist() == [7] and completo.token == 300
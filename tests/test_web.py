@@ -0,0 +1,179 @@
+"""
+Testes do servico HTTP (banco e Gemini falsos, servidor real em porta local)
+"""
+
+import asyncio
+import json
+import sys
+import os
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.library_service import LibraryService
+from web.app import LibraryApp, SessionStore
+
+
+@pytest.fixture
+def db(fake_database):
+    """Banco falso com os jogos em memoria: JogoID -> colunas de Jogo (JogadorID na posicao 5)"""
+    db = fake_database()
+    db.jogos = {1: ("Celeste", "2018-01-25", "10:00", "Sim", "Plataforma", 7, 9)}
+
+    def authenticate(jogador_id, senha):
+        return {"JogadorID": 7, "Nome": "Ana"} if (jogador_id, senha) == (7, "segredo") else None
+
+    def query(sql, params=()):
+        jogador = params[-1]
+        depois = params[1] if "JogoID > ?" in sql else 0
+        linhas = [(jogo_id,) + dados for jogo_id, dados in sorted(db.jogos.items())
+                  if dados[5] == jogador and jogo_id > depois]
+        return linhas[:params[0]]
+
+    def insert_returning(sql, values):
+        jogo_id = max(db.jogos) + 1
+        db.jogos[jogo_id] = values
+        return jogo_id
+
+    def delete(sql, params):
+        jogo_id, jogador = params
+        if jogo_id >= 2 ** 31:
+            # O driver recusa valores fora de INT: DatabaseFunctions.delete devolve None (503)
+            return None
+        if db.jogos.get(jogo_id, (None,) * 6)[5] != jogador:
+            return 0
+        del db.jogos[jogo_id]
+        return 1
+
+    db.authenticate, db.query, db.insert_returning, db.delete = authenticate, query, insert_returning, delete
+    return db
+
+
+async def chamar(porta, metodo, caminho, corpo=None, token=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    dados = json.dumps(corpo).encode() if corpo is not None else b""
+    cabecalhos = [f"{metodo} {caminho} HTTP/1.1", "Host: teste", f"Content-Length: {len(dados)}", "Connection: close"]
+    if token:
+        cabecalhos.append(f"Authorization: Bearer {token}")
+    writer.write(("\r\n".join(cabecalhos) + "\r\n\r\n").encode() + dados)
+
+    resposta = await reader.read()
+    writer.close()
+    cabecalho, _, corpo = resposta.partition(b"\r\n\r\n")
+    status = int(cabecalho.split()[1])
+    return status, json.loads(corpo) if corpo else None
+
+
+@pytest.fixture
+def executar(db, fake_cache):
+    """Sobe o servidor em uma porta livre e executa o cenario contra ele"""
+    cache = fake_cache({"Celeste": {"nome": "Celeste", "fonte": "cache"}})
+
+    def executar(cenario):
+        service = LibraryService(db=db, gemini_cache=cache, use_gemini=False)
+        app = LibraryApp(service, workers=2, session_ttl=60)
+
+        async def principal():
+            server = await asyncio.start_server(app.handle_connection, "127.0.0.1", 0)
+            porta = server.sockets[0].getsockname()[1]
+            async with server:
+                return await cenario(app, porta)
+
+        try:
+            return asyncio.run(principal())
+        finally:
+            app.close()
+
+    return executar
+
+
+def test_login_e_crud_de_jogos(executar):
+    """Login gera token; listar, cadastrar e remover agem apenas nos jogos do jogador"""
+    async def cenario(app, porta):
+        status, _ = await chamar(porta, "GET", "/jogos")
+        assert status == 401
+
+        status, _ = await chamar(porta, "POST", "/login", {"jogador_id": 7, "palavra_chave": "errada"})
+        assert status == 401
+
+        status, corpo = await chamar(porta, "POST", "/login", {"jogador_id": 7, "palavra_chave": "segredo"})
+        assert status == 200 and corpo["nome"] == "Ana"
+        token = corpo["token"]
+
+        novo = {"Nome": "Hades", "Data_lancamento": "2020-09-17", "Tempo_jogado": "25:30",
+                "Concluido": "Sim", "Tipo": "Roguelike", "PlataformaID": 9}
+        status, corpo = await chamar(porta, "POST", "/jogos", novo, token)
+        assert status == 201 and corpo == {"JogoID": 2}
+        assert app.service.db.invalidados == [7]
+
+        status, corpo = await chamar(porta, "POST", "/jogos", dict(novo, Tempo_jogado="muito"), token)
+        assert status == 400
+
+        status, corpo = await chamar(porta, "GET", "/jogos?limite=1", token=token)
+        assert status == 200 and corpo["proximo"] == 1
+        assert corpo["jogos"][0]["Nome"] == "Celeste"
+        assert corpo["jogos"][0]["Tempo_jogado"] == "10:00" and corpo["jogos"][0]["Concluido"] == "Sim"
+
+        status, corpo = await chamar(porta, "GET", "/jogos?limite=1&depois=1", token=token)
+        assert [jogo["JogoID"] for jogo in corpo["jogos"]] == [2]
+
+        status, _ = await chamar(porta, "DELETE", "/jogos/2", token=token)
+        assert status == 204 and 2 not in app.service.db.jogos
+        status, _ = await chamar(porta, "DELETE", "/jogos/2", token=token)
+        assert status == 404
+        status, _ = await chamar(porta, "DELETE", f"/jogos/{2 ** 31}", token=token)
+        assert status == 404
+
+        status, _ = await chamar(porta, "POST", "/logout", token=token)
+        assert status == 204
+        status, _ = await chamar(porta, "GET", "/jogos", token=token)
+        assert status == 401
+
+    executar(cenario)
+
+
+def test_gemini_usa_cache_sem_cliente(executar):
+    """Sem cliente Gemini, respostas do cache continuam disponiveis e as faltas retornam 503"""
+    async def cenario(app, porta):
+        _, corpo = await chamar(porta, "POST", "/login", {"jogador_id": 7, "palavra_chave": "segredo"})
+        token = corpo["token"]
+
+        status, corpo = await chamar(porta, "GET", "/gemini/jogo?nome=Celeste", token=token)
+        assert status == 200 and corpo["cache"] is True
+
+        status, _ = await chamar(porta, "GET", "/gemini/jogo?nome=Hades", token=token)
+        assert status == 503
+
+        status, _ = await chamar(porta, "PUT", "/jogos", token=token)
+        assert status == 405
+
+    executar(cenario)
+
+
+def test_requisicoes_simultaneas(executar):
+    """Varias conexoes sao atendidas ao mesmo tempo pelo mesmo processo"""
+    async def cenario(app, porta):
+        respostas = await asyncio.gather(*(chamar(porta, "GET", "/saude") for _ in range(20)))
+        assert all(status == 200 for status, _ in respostas)
+        assert respostas[0][1]["pool"]["max"] == 5
+
+    executar(cenario)
+
+
+def test_sessoes_expiradas_e_linhas_longas(executar):
+    """create() descarta sessoes expiradas; linhas acima do limite do leitor recebem 431"""
+    sessoes = SessionStore(ttl=0)
+    sessoes.create(7, "Ana")
+    sessoes.create(8, "Bia")
+    assert len(sessoes) == 1
+
+    async def cenario(app, porta):
+        reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+        writer.write(b"GET /" + b"a" * 100_000 + b" HTTP/1.1\r\n\r\n")
+        resposta = await reader.read()
+        writer.close()
+        assert int(resposta.split()[1]) == 431
+
+    executar(cenario)
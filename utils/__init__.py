@@ -1,9 +1,16 @@
 
-
 #Pacote de utilitários.
 
-from .gemini_utils import GeminiDisplay
-from .display import DisplayUtils
+from .lazy_exports import lazy_exports
+
+# Classes exportadas e o módulo de cada uma; carregadas no primeiro acesso
+_EXPORTS = {
+    'DisplayUtils': '.display',
+    'GeminiDisplay': '.gemini_utils',
+    'GameInfoStreamPrinter': '.gemini_utils',
+}
 
 # Exporta as classes
-__all__ = ['DisplayUtils', 'GeminiDisplay']
\ No newline at end of file
+__all__ = ['DisplayUtils', 'GeminiDisplay', 'GameInfoStreamPrinter']
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -2,74 +2,113 @@
 # Utilitários para exibição de dados.
 
 
-import pandas as pd
+import sys
+
 
 # Utilitários para formatação e exibição de dados.
 class DisplayUtils:
-    
-    # Exibe dados de consulta em formato tabular.
-    @staticmethod
-    def mostrar_resultado_consulta(dados, tipo):
-        
-        if not dados:
-            print(" Nenhum dado encontrado.")
-            return
-        
-        try:
-            df = pd.DataFrame.from_records(dados)
-            
-            if tipo == "Jogadores":
-                DisplayUtils._mostrar_jogadores(df)
-            elif tipo == "Jogos":
-                DisplayUtils._mostrar_jogos(df)
-            else:
-                DisplayUtils._mostrar_generico(df, tipo)
-                
-        except Exception as e:
-            print(f" Erro ao processar dados: {e}")
-    
-    # Exibe dados de jogadores.
-    @staticmethod
-    def _mostrar_jogadores(df):
-       
-        if len(df.columns) == 5:
-            df.columns = ["ID", "Nome", "Idade", "NickName", "Palavra_chave"]
-            DisplayUtils._imprimir_tabela(df, " RELATÓRIO DE JOGADORES")
-        else:
-            DisplayUtils._imprimir_lista_simples(df, "Jogadores")
-    
-    # Exibe dados de jogos.
+
+    # Colunas e título dos relatórios conhecidos
+    RELATORIOS = {
+        "Jogadores": (
+            ["ID", "Nome", "Idade", "NickName"],
+            " RELATÓRIO DE JOGADORES",
+        ),
+        "Jogos": (
+            ["ID", "Nome", "Lançamento", "Tempo jogado", "Concluído", "Tipo", "JogadorID", "Plataforma"],
+            " RELATÓRIO DE JOGOS",
+        ),
+    }
+
+    # Exibe uma página de resultados (paginação por chave); a numeração continua entre as páginas.
     @staticmethod
-    def _mostrar_jogos(df):
-        
-        if len(df.columns) == 8:
-            df.columns = [
-                "ID", "Nome", "Lançamento", "Tempo jogado", 
-                "Concluído", "Tipo", "JogadorID", "Plataforma"
+    def mostrar_pagina(dados, tipo, pagina, inicio=1):
+
+        colunas, titulo = DisplayUtils.RELATORIOS.get(tipo, (None, None))
+
+        if colunas and len(dados[0]) == len(colunas):
+            partes = [
+                "\n" + "═" * 100,
+                f"{titulo} - PÁGINA {pagina}".center(100),
+                "═" * 100,
+                DisplayUtils.formatar_tabela(dados, colunas),
+                "═" * 100,
+                f"Registros {inicio} a {inicio + len(dados) - 1}",
             ]
-            DisplayUtils._imprimir_tabela(df, " RELATÓRIO DE JOGOS")
         else:
-            DisplayUtils._imprimir_lista_simples(df, "Jogos")
-    
-    # Imprime DataFrame como tabela formatada.
+            partes = [f"\n RESULTADO DA CONSULTA - {tipo.upper()} (PÁGINA {pagina})", "─" * 50]
+            partes.extend(
+                f"{i:3}. {DisplayUtils._formatar_valor(linha[0])}" for i, linha in enumerate(dados, inicio)
+            )
+            partes.append("─" * 50)
+
+        DisplayUtils._escrever(partes)
+
+    # Exibe as estatísticas da biblioteca (DatabaseFunctions.library_stats).
+    # nome_plataforma converte o PlataformaID em texto.
     @staticmethod
-    def _imprimir_tabela(df, titulo):
-       
-        print("\n" + "═" * 100)
-        print(titulo.center(100))
-        print("═" * 100)
-        print(df.to_string(index=False))
-        print("═" * 100)
-        print(f"Total de registros: {len(df)}")
-        print("═" * 100)
-    
-    # Imprime lista simples de resultados.
+    def mostrar_estatisticas(stats, nome_plataforma=str):
+
+        if not stats["total_jogos"]:
+            print(" Nenhum jogo cadastrado.")
+            return
+
+        def grupo(titulo, contagens, rotulo=DisplayUtils._formatar_valor):
+            linhas = [(rotulo(chave), total) for chave, total in contagens.items()]
+            return ["", f" {titulo}", DisplayUtils.formatar_tabela(linhas, ["", "Jogos"])]
+
+        partes = [
+            "\n" + "═" * 50,
+            " ESTATÍSTICAS DA BIBLIOTECA".center(50),
+            "═" * 50,
+            f" Jogos cadastrados: {stats['total_jogos']}",
+            f" Horas jogadas:     {stats['horas_jogadas']:g}",
+            f" Concluídos:        {stats['concluidos']} ({stats['taxa_conclusao']:.0%})",
+        ]
+        partes += grupo("Por tipo", stats["por_tipo"])
+        partes += grupo("Por plataforma", stats["por_plataforma"], nome_plataforma)
+        partes += grupo("Por ano de lançamento", stats["por_ano"])
+        partes.append("═" * 50)
+
+        DisplayUtils._escrever(partes)
+
+    # Formata as linhas em colunas alinhadas (números à direita, texto à esquerda).
     @staticmethod
-    def _imprimir_lista_simples(df, tipo):
-     
-        print(f"\n RESULTADO DA CONSULTA - {tipo.upper()}")
-        print("─" * 50)
-        for i, row in df.iterrows():
-            print(f"{i+1:3}. {row[0]}")
-        print("─" * 50)
-        print(f"Total: {len(df)} itens")
\ No newline at end of file
+    def formatar_tabela(linhas, colunas):
+
+        linhas = list(linhas)
+        textos = [[DisplayUtils._formatar_valor(valor) for valor in linha] for linha in linhas]
+
+        larguras = [len(coluna) for coluna in colunas]
+        numericas = [True] * len(colunas)
+        for linha, texto in zip(linhas, textos):
+            for i, valor in enumerate(linha):
+                if len(texto[i]) > larguras[i]:
+                    larguras[i] = len(texto[i])
+                if valor is not None and not isinstance(valor, (int, float)):
+                    numericas[i] = False
+
+        def alinhar(valores):
+            return "  ".join(
+                valor.rjust(larguras[i]) if numericas[i] else valor.ljust(larguras[i])
+                for i, valor in enumerate(valores)
+            ).rstrip()
+
+        return "\n".join([alinhar(colunas)] + [alinhar(texto) for texto in textos])
+
+    # Texto exibido para um valor
+    @staticmethod
+    def _formatar_valor(valor):
+
+        if valor is None:
+            return "-"
+        if isinstance(valor, float):
+            return f"{valor:g}"
+        return str(valor)
+
+    # Escreve as linhas no stdout de uma vez
+    @staticmethod
+    def _escrever(partes):
+
+        sys.stdout.write("\n".join(partes) + "\n")
+        sys.stdout.flush()
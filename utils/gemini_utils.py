@@ -2,11 +2,17 @@
 # Utilitários para formatação e exibição de informações do Gemini.
 
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Utilitários para formatação e exibição de informações do Gemini
 class GeminiDisplay:
    
+    # Ordem de exibição dos campos (a mesma em que a API gera a resposta estruturada)
+    FIELD_ORDER = (
+        "nome", "desenvolvedor", "publicador", "ano_lancamento", "genero",
+        "metacritic_score", "tempo_medio_conclusao", "plataformas", "descricao", "curiosidade", "fonte",
+    )
+    
     # Exibe informações do jogo
     @staticmethod
     def display_game_info(game_info: Dict[str, Any]):
@@ -15,51 +21,64 @@ class GeminiDisplay:
             print(" Nenhuma informação disponível.")
             return
         
-        print("\n" + "=" * 50)
-        print(f" INFORMAÇÕES SOBRE: {game_info.get('nome', 'Desconhecido').upper()}")
-        print("=" * 50)
+        for key in GeminiDisplay.FIELD_ORDER:
+            for line in GeminiDisplay.format_field(key, game_info.get(key)):
+                print(line)
+        
+        print("─" * 50)
+    
+    # Linhas exibidas para um campo (lista vazia quando o campo não tem informação)
+    @staticmethod
+    def format_field(key: str, value: Any) -> List[str]:
+        
+        # Cabeçalho
+        if key == "nome":
+            return [
+                "\n" + "=" * 50,
+                f" INFORMAÇÕES SOBRE: {(value or 'Desconhecido').upper()}",
+                "=" * 50,
+                f"\n DADOS DO JOGO:",
+            ]
         
         # Informações básicas
-        print(f"\n DADOS DO JOGO:")
-        print(f"    Desenvolvedor: {game_info.get('desenvolvedor', 'N/A')}")
-        print(f"    Publicador: {game_info.get('publicador', 'N/A')}")
-        print(f"    Ano de lançamento: {game_info.get('ano_lancamento', 'N/A')}")
-        print(f"    Gênero: {game_info.get('genero', 'N/A')}")
+        labels = {
+            "desenvolvedor": "Desenvolvedor",
+            "publicador": "Publicador",
+            "ano_lancamento": "Ano de lançamento",
+            "genero": "Gênero",
+        }
+        if key in labels:
+            return [f"    {labels[key]}: {value if value is not None else 'N/A'}"]
+        
+        if value is None or value == "N/A" or value == "":
+            return []
         
         # Pontuação Metacritic (se disponível)
-        metacritic = game_info.get('metacritic_score')
-        if metacritic != "N/A" and metacritic is not None:
-            score = int(metacritic) if str(metacritic).isdigit() else metacritic
-            print(f"    Metacritic: {score}/100")
+        if key == "metacritic_score":
+            score = int(value) if str(value).isdigit() else value
+            return [f"    Metacritic: {score}/100"]
         
         # Tempo de conclusão
-        tempo = game_info.get('tempo_medio_conclusao')
-        if tempo != "N/A" and tempo is not None:
-            print(f"   Tempo médio: {tempo} horas")
+        if key == "tempo_medio_conclusao":
+            return [f"   Tempo médio: {value} horas"]
         
         # Plataformas
-        plataformas = game_info.get('plataformas', [])
-        if plataformas and plataformas[0] != "N/A":
-            print(f"    Plataformas: {', '.join(plataformas)}")
-        
-        # Descrição
-        descricao = game_info.get('descricao', '')
-        if descricao and descricao != "N/A":
-            print(f"\n DESCRIÇÃO:")
-            print(f"   {descricao}")
-        
-        # Curiosidade
-        curiosidade = game_info.get('curiosidade', '')
-        if curiosidade and curiosidade != "N/A":
-            print(f"\n CURIOSIDADE:")
-            print(f"   {curiosidade}")
+        if key == "plataformas":
+            if not value or value[0] == "N/A":
+                return []
+            return [f"    Plataformas: {', '.join(value)}"]
+        
+        # Descrição e curiosidade
+        if key == "descricao":
+            return [f"\n DESCRIÇÃO:", f"   {value}"]
+        if key == "curiosidade":
+            return [f"\n CURIOSIDADE:", f"   {value}"]
         
         # Fonte
-        fonte = game_info.get('fonte', '')
-        if fonte:
-            print(f"\n Fonte: {fonte}")
+        if key == "fonte":
+            return [f"\n Fonte: {value}"]
         
-        print("─" * 50)
+        return []
     
     # Cria uma tabela comparativa entre jogos
     @staticmethod
@@ -128,4 +147,37 @@ class GeminiDisplay:
             except:
                 pass
         
-        return " Continue explorando novos jogos!"
\ No newline at end of file
+        return " Continue explorando novos jogos!"
+
+
+# Exibe as informações de um jogo à medida que os campos chegam da API (streaming).
+# Campos fora de ordem ficam guardados até os anteriores chegarem, então a saída final
+# é igual à de GeminiDisplay.display_game_info.
+class GameInfoStreamPrinter:
+    
+    def __init__(self):
+        self._pending: Dict[str, Any] = {}
+        self._next = 0
+    
+    # Callback de campo recebido: (chave, valor)
+    def __call__(self, key: str, value: Any):
+        
+        self._pending[key] = value
+        self._flush()
+    
+    # Exibe os campos que faltaram usando a resposta completa e fecha o quadro
+    def finish(self, game_info: Dict[str, Any]):
+        
+        for key in GeminiDisplay.FIELD_ORDER[self._next:]:
+            self._pending.setdefault(key, game_info.get(key))
+        self._flush()
+        print("─" * 50, flush=True)
+    
+    def _flush(self):
+        
+        order = GeminiDisplay.FIELD_ORDER
+        while self._next < len(order) and order[self._next] in self._pending:
+            key = order[self._next]
+            for line in GeminiDisplay.format_field(key, self._pending.pop(key)):
+                print(line, flush=True)
+            self._next += 1
@@ -0,0 +1,23 @@
+# Exportação sob demanda dos pacotes (PEP 562): o módulo só é importado no primeiro acesso.
+
+
+import importlib
+
+
+# Monta o __getattr__ e o __dir__ de um pacote a partir do mapa {nome: módulo relativo}.
+# O valor carregado fica nos globals do pacote, então o __getattr__ só roda uma vez por nome.
+def lazy_exports(namespace, exports):
+
+    package = namespace['__name__']
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(namespace.get('__all__', ())))
+
+    return __getattr__, __dir__
@@ -0,0 +1,60 @@
+
+# Hash e verificação de palavras-chave dos jogadores.
+
+
+import base64
+import hashlib
+import hmac
+import os
+
+
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = 260000
+SALT_BYTES = 16
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+# Gera o hash salgado da palavra-chave: "pbkdf2_sha256$iterações$sal$hash"
+def hash_password(password, salt=None, iterations=ITERATIONS):
+
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+# Confere a palavra-chave com o hash armazenado (comparação em tempo constante)
+def verify_password(password, stored):
+
+    try:
+        algorithm, iterations, salt, digest = stored.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        expected = base64.b64decode(digest)
+        computed = hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), base64.b64decode(salt), int(iterations)
+        )
+    except (AttributeError, ValueError):
+        return False
+
+    return hmac.compare_digest(computed, expected)
+
+
+# Indica se o hash deve ser refeito (formato antigo ou menos iterações que o atual)
+def needs_rehash(stored, iterations=ITERATIONS):
+
+    try:
+        algorithm, stored_iterations, _, _ = stored.split("$")
+        return algorithm != ALGORITHM or int(stored_iterations) < iterations
+    except (AttributeError, ValueError):
+        return True
+
+
+# Compara uma palavra-chave ainda em texto puro (registros anteriores ao hash) em tempo constante
+def verify_legacy_password(password, stored):
+
+    if not stored:
+        return False
+    return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
@@ -0,0 +1,17 @@
+
+# Serviço HTTP (asyncio) da biblioteca de jogos.
+
+from utils.lazy_exports import lazy_exports
+
+# Classes exportadas e o módulo de cada uma; carregadas no primeiro acesso
+_EXPORTS = {
+    'LibraryApp': '.app',
+    'SessionStore': '.app',
+    'serve': '.app',
+    'HTTPError': '.protocol',
+}
+
+# Exportando as classes.
+__all__ = ['LibraryApp', 'SessionStore', 'serve', 'HTTPError']
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
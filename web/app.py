@@ -0,0 +1,339 @@
+
+# Serviço HTTP da biblioteca: as operações do menu (login, jogos, Gemini, comparação) como API REST.
+# Um único processo atende vários jogadores; o pool de conexões, o cache de estatísticas
+# e o cache/cliente do Gemini são compartilhados entre as requisições.
+
+
+import asyncio
+import os
+import re
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from services.library_service import LibraryService
+from .protocol import HTTPError, build_response, read_request
+
+
+# Maior valor de uma coluna INT do SQL Server (JogoID)
+MAX_ID = 2 ** 31 - 1
+
+
+# Sessões autenticadas: token aleatório -> (JogadorID, Nome, expiração)
+# Usada apenas na thread do event loop, por isso sem lock.
+class SessionStore:
+
+    # Intervalo máximo (s) entre as limpezas de sessões expiradas feitas em create()
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._sessions = {}
+        self._proxima_limpeza = time.monotonic() + min(ttl, self.SWEEP_INTERVAL)
+
+    # Cria uma sessão e devolve o token (descartando de tempos em tempos as sessões expiradas)
+    def create(self, jogador_id, nome):
+
+        agora = time.monotonic()
+        if agora >= self._proxima_limpeza:
+            self.sweep(agora)
+
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = (jogador_id, nome, time.monotonic() + self.ttl)
+        return token
+
+    # Sessão válida do token, renovando a expiração; None se não existir ou tiver expirado
+    def get(self, token):
+
+        sessao = self._sessions.get(token)
+        if sessao is None:
+            return None
+
+        jogador_id, nome, expira = sessao
+        if expira < time.monotonic():
+            del self._sessions[token]
+            return None
+
+        self._sessions[token] = (jogador_id, nome, time.monotonic() + self.ttl)
+        return {"JogadorID": jogador_id, "Nome": nome}
+
+    # Remove as sessões expiradas; retorna quantas foram removidas
+    def sweep(self, agora=None):
+
+        agora = agora or time.monotonic()
+        self._proxima_limpeza = agora + min(self.ttl, self.SWEEP_INTERVAL)
+        expiradas = [token for token, (_, _, expira) in self._sessions.items() if expira < agora]
+        for token in expiradas:
+            del self._sessions[token]
+        return len(expiradas)
+
+    # Encerra a sessão
+    def remove(self, token):
+
+        self._sessions.pop(token, None)
+
+    # Quantidade de sessões ativas
+    def __len__(self):
+
+        return len(self._sessions)
+
+
+# Aplicação: rotas e sessões; as operações do LibraryService (bloqueantes: pyodbc, requests) rodam em threads
+class LibraryApp:
+
+    # Sem service, cria o mesmo LibraryService usado pelo main.py
+    def __init__(self, service=None, workers=None, session_ttl=None):
+
+        self.service = service or LibraryService()
+        self.sessions = SessionStore(session_ttl or float(os.getenv("WEB_SESSION_TTL", "3600")))
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("WEB_WORKERS", "16")), thread_name_prefix="web"
+        )
+
+        self.routes = [
+            ("POST", re.compile(r"/login"), self.login, False),
+            ("POST", re.compile(r"/logout"), self.logout, True),
+            ("POST", re.compile(r"/jogadores"), self.create_player, False),
+            ("GET", re.compile(r"/jogos"), self.list_games, True),
+            ("POST", re.compile(r"/jogos"), self.add_game, True),
+            ("DELETE", re.compile(r"/jogos/(\d+)"), self.remove_game, True),
+            ("GET", re.compile(r"/jogos/mudancas"), self.game_changes, True),
+            ("GET", re.compile(r"/estatisticas"), self.stats, True),
+            ("GET", re.compile(r"/gemini/jogo"), self.game_info, True),
+            ("POST", re.compile(r"/gemini/comparar"), self.compare, True),
+            ("GET", re.compile(r"/saude"), self.health, False),
+        ]
+
+    # Executa uma função bloqueante no pool de threads do serviço
+    async def run(self, func, *args, **kwargs):
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    # Como run, convertendo dados inválidos (ValueError) em 400 e falha do banco (None) em 503
+    async def call(self, func, *args, **kwargs):
+
+        try:
+            resultado = await self.run(func, *args, **kwargs)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if resultado is None:
+            raise HTTPError(503, "Banco de dados indisponível")
+        return resultado
+
+    # Atende uma conexão (keep-alive: várias requisições na mesma conexão)
+    async def handle_connection(self, reader, writer):
+
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(build_response(e.status, {"erro": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Linha maior que o limite do StreamReader (readline)
+                    writer.write(build_response(431, {"erro": "Cabeçalho muito longo"}, keep_alive=False))
+                    await writer.drain()
+                    break
+
+                if request is None:
+                    break
+
+                status, payload = await self.dispatch(request)
+                writer.write(build_response(status, payload, request.keep_alive))
+                await writer.drain()
+
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Encontra a rota, confere a sessão e executa o handler; devolve (status, corpo)
+    async def dispatch(self, request):
+
+        try:
+            metodos = []
+            for method, pattern, handler, autenticado in self.routes:
+                match = pattern.fullmatch(request.path)
+                if not match:
+                    continue
+                if method != request.method:
+                    metodos.append(method)
+                    continue
+
+                sessao = self._sessao(request) if autenticado else None
+                return await handler(request, sessao, *match.groups())
+
+            if metodos:
+                raise HTTPError(405)
+            raise HTTPError(404)
+
+        except HTTPError as e:
+            return e.status, {"erro": str(e)}
+        except Exception as e:
+            print(f" Erro ao processar {request.method} {request.path}: {e}")
+            return 500, {"erro": "Erro interno"}
+
+    # Sessão do token "Authorization: Bearer <token>"
+    def _sessao(self, request):
+
+        esquema, _, token = request.headers.get("authorization", "").partition(" ")
+        sessao = self.sessions.get(token) if esquema.lower() == "bearer" else None
+        if sessao is None:
+            raise HTTPError(401, "Sessão inválida ou expirada")
+        sessao["token"] = token
+        return sessao
+
+    # POST /login {"jogador_id", "palavra_chave"} -> {"token", "jogador_id", "nome"}
+    async def login(self, request, sessao):
+
+        dados = request.json()
+        try:
+            jogador_id = int(dados["jogador_id"])
+            senha = str(dados["palavra_chave"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPError(400, "Informe jogador_id (número) e palavra_chave")
+
+        usuario = await self.run(self.service.authenticate, jogador_id, senha)
+        if not usuario:
+            raise HTTPError(401, "ID ou senha incorretos")
+
+        token = self.sessions.create(usuario["JogadorID"], usuario["Nome"])
+        return 200, {"token": token, "jogador_id": usuario["JogadorID"], "nome": usuario["Nome"]}
+
+    # POST /logout
+    async def logout(self, request, sessao):
+
+        self.sessions.remove(sessao["token"])
+        return 204, None
+
+    # POST /jogadores {Nome, Idade, NickName, Palavra_chave} -> {"jogador_id"}
+    async def create_player(self, request, sessao):
+
+        jogador_id = await self.call(self.service.register_player, request.json())
+        return 201, {"jogador_id": jogador_id}
+
+    # GET /jogos?depois=<JogoID>&limite=N -> página por chave do jogador logado
+    async def list_games(self, request, sessao):
+
+        try:
+            limite = int(request.query.get("limite", "50"))
+            depois = request.query.get("depois")
+            depois = int(depois) if depois is not None else None
+        except ValueError:
+            raise HTTPError(400, "depois e limite devem ser números")
+
+        jogos, proximo = await self.call(self.service.list_games, sessao["JogadorID"], depois, limite)
+        return 200, {"jogos": [jogo.as_dict() for jogo in jogos], "proximo": proximo}
+
+    # POST /jogos {Nome, Data_lancamento, Tempo_jogado, Concluido, Tipo, PlataformaID} -> {"JogoID"}
+    async def add_game(self, request, sessao):
+
+        jogo_id = await self.call(self.service.add_game, sessao["JogadorID"], request.json())
+        return 201, {"JogoID": jogo_id}
+
+    # DELETE /jogos/<JogoID> (apenas jogos do próprio jogador)
+    async def remove_game(self, request, sessao, jogo_id):
+
+        jogo_id = int(jogo_id)
+        # Fora do intervalo de INT o banco recusaria o parâmetro: o jogo não existe
+        if not 0 < jogo_id <= MAX_ID:
+            raise HTTPError(404, "Jogo não encontrado")
+
+        removidos = await self.call(self.service.remove_game, sessao["JogadorID"], jogo_id)
+        if not removidos:
+            raise HTTPError(404, "Jogo não encontrado")
+        return 204, None
+
+    # GET /jogos/mudancas?token=N -> jogos do jogador alterados/removidos desde o token (0 = todos)
+    async def game_changes(self, request, sessao):
+
+        try:
+            token = int(request.query.get("token", "0"))
+        except ValueError:
+            raise HTTPError(400, "token deve ser um número")
+
+        jogos, removidos, proximo, completo = await self.call(self.service.game_changes, token, sessao["JogadorID"])
+        return 200, {
+            "jogos": [jogo.as_dict() for jogo in jogos], "removidos": removidos,
+            "token": proximo, "completo": completo,
+        }
+
+    # GET /estatisticas
+    async def stats(self, request, sessao):
+
+        return 200, await self.call(self.service.stats, sessao["JogadorID"])
+
+    # GET /gemini/jogo?nome=<jogo>&plataforma=<plataforma>: cache primeiro, depois a API
+    async def game_info(self, request, sessao):
+
+        nome = request.query.get("nome", "").strip()
+        if not nome:
+            raise HTTPError(400, "Informe o nome do jogo")
+
+        game_info, do_cache = await self.run(self.service.game_info, nome, request.query.get("plataforma") or None)
+        if game_info is None:
+            raise HTTPError(503, "Serviço Gemini AI indisponível")
+        return 200, {"jogo": game_info, "cache": do_cache}
+
+    # POST /gemini/comparar {"jogos": [nomes]}; sem lista, compara todos os jogos do jogador
+    async def compare(self, request, sessao):
+
+        nomes = request.json().get("jogos")
+        if nomes is not None:
+            if not isinstance(nomes, list) or not all(isinstance(nome, str) and nome.strip() for nome in nomes):
+                raise HTTPError(400, "jogos deve ser uma lista de nomes")
+            nomes = [nome.strip() for nome in nomes]
+
+        jogos = await self.call(self.service.compare, sessao["JogadorID"], nomes)
+        return 200, {"jogos": jogos}
+
+    # GET /saude: pool de conexões, sessões ativas e disponibilidade do Gemini
+    async def health(self, request, sessao):
+
+        pool = self.service.db.pool
+        return 200, {
+            "pool": dict(pool.stats, abertas=pool.size, max=pool.max_size) if pool is not None else None,
+            "sessoes": len(self.sessions),
+            "gemini": self.service.gemini_available(),
+        }
+
+    # Manutenção periódica (a cada `interval` segundos): limpa o histórico de remoções da sincronização
+    async def maintenance(self, interval):
+
+        while True:
+            try:
+                await self.run(self.service.purge_sync_history)
+            except Exception as e:
+                print(f" Erro na manutenção: {e}")
+            await asyncio.sleep(interval)
+
+    # Libera o pool de threads, o cache e as conexões
+    def close(self):
+
+        self.executor.shutdown(wait=True)
+        self.service.close()
+
+
+# Inicia o servidor HTTP e atende até ser interrompido
+async def serve(app, host="127.0.0.1", port=8080, ready=None):
+
+    server = await asyncio.start_server(app.handle_connection, host, port)
+    endereco = server.sockets[0].getsockname()
+    print(f" Servidor da biblioteca em http://{endereco[0]}:{endereco[1]}")
+    if ready is not None:
+        ready(server)
+
+    manutencao = asyncio.create_task(app.maintenance(float(os.getenv("WEB_MAINTENANCE_INTERVAL", "3600"))))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        manutencao.cancel()
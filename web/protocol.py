@@ -0,0 +1,109 @@
+
+# HTTP/1.1 mínimo sobre asyncio (apenas biblioteca padrão): leitura de requisições e escrita de respostas JSON.
+
+
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+
+MAX_HEADERS = 100
+MAX_BODY = 1024 * 1024
+
+
+# Erro que vira uma resposta HTTP com {"erro": mensagem}
+class HTTPError(Exception):
+
+    def __init__(self, status, message=None):
+        self.status = HTTPStatus(status)
+        super().__init__(message or self.status.phrase)
+
+
+# Requisição recebida
+class Request:
+
+    def __init__(self, method, target, version, headers, body=b""):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+        url = urlsplit(target)
+        self.path = unquote(url.path)
+        self.query = dict(parse_qsl(url.query))
+
+    # Corpo da requisição decodificado como objeto JSON
+    def json(self):
+
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "Corpo JSON inválido")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "O corpo deve ser um objeto JSON")
+        return data
+
+    # Indica se a conexão deve continuar aberta após a resposta
+    @property
+    def keep_alive(self):
+
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+# Lê uma requisição da conexão; None quando o cliente fechou a conexão
+async def read_request(reader):
+
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Linha de requisição inválida")
+    if not version.startswith("HTTP/1."):
+        raise HTTPError(505)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(431)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "Content-Length inválido")
+    if length > MAX_BODY:
+        raise HTTPError(413)
+
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target, version, headers, body)
+
+
+# Monta a resposta HTTP com corpo JSON (datas e outros tipos viram texto)
+def build_response(status, payload=None, keep_alive=True, headers=None):
+
+    status = HTTPStatus(status)
+    body = b""
+    if payload is not None and status != HTTPStatus.NO_CONTENT:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    if body:
+        lines.append("Content-Type: application/json; charset=utf-8")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
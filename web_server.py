@@ -0,0 +1,37 @@
+"""
+Servidor HTTP da biblioteca de jogos
+Expoe login, jogos, estatisticas e consultas ao Gemini como API REST (JSON)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from web.app import LibraryApp, serve
+
+
+# Função principal.
+def main():
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Servidor HTTP da biblioteca de jogos.")
+    parser.add_argument("--host", default=os.getenv("WEB_HOST", "127.0.0.1"), help="Endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=int(os.getenv("WEB_PORT", "8080")), help="Porta (padrão: 8080)")
+    parser.add_argument("--workers", type=int, help="Threads para banco e Gemini (padrão: WEB_WORKERS ou 16)")
+    args = parser.parse_args()
+
+    app = LibraryApp(workers=args.workers)
+    try:
+        asyncio.run(serve(app, args.host, args.porta))
+    except KeyboardInterrupt:
+        print("\n Servidor encerrado.")
+    finally:
+        app.close()
+
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)